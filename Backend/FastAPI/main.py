@@ -1,27 +1,51 @@
 import os
 import re
+import mimetypes
+import io
+import csv
+import asyncio
 import json
 import time
+import random
 import hmac
 import base64
 import hashlib
+import tempfile
+import heapq
+import argparse
+import threading
+import multiprocessing
+import unicodedata
 import urllib.parse
-import urllib.error
-import urllib.request
-from contextlib import contextmanager
-from datetime import date
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from email.utils import formatdate
+from decimal import Decimal
+from itertools import islice
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Literal, Optional
 from uuid import uuid4
 
-from fastapi import Depends, FastAPI, File, Header, HTTPException, Query, UploadFile, status
+import anyio
+import httpx
+import openpyxl
+import orjson
+import psycopg
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import Depends, FastAPI, File, Header, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
-from pydantic import BaseModel, Field
-from sqlalchemy import Column, Date, Integer, MetaData, Numeric, String, create_engine, delete, func, or_, select, text
-from sqlalchemy.exc import IntegrityError, OperationalError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import Column, Date, Integer, MetaData, Numeric, String, and_, create_engine, delete, event, false, func, literal_column, null, or_, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy.schema import ForeignKeyConstraint
 from sqlalchemy.sql import quoted_name
 
@@ -56,6 +80,10 @@ def _connect_args(url: str) -> dict[str, Any]:
     return {"options": f'-csearch_path="{schema}"'}
 
 
+def _async_database_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+
+
 DATABASE_URL = _database_url()
 engine = create_engine(
     DATABASE_URL,
@@ -63,6 +91,13 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+async_engine = create_async_engine(
+    _async_database_url(DATABASE_URL),
+    connect_args=_connect_args(DATABASE_URL),
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+_DEFAULT_DATABASE_NAME = str(make_url(DATABASE_URL).database or "").strip() or "postgres"
 SCHEMA_NAME = os.getenv("DB_SCHEMA") or "EXECUTIVE"
 SCHEMA_TABLE_ARGS = {"schema": SCHEMA_NAME}
 TENANTS_TABLE_NAME = quoted_name("Tenants", True)
@@ -225,44 +260,6 @@ class UsuariosModel(Base):
     Ativo = Column("Ativo", Integer, nullable=False, default=1)
 
 
-def _drop_legacy_tenant_table() -> None:
-    try:
-        with engine.connect() as conn:
-            for schema in (SCHEMA_NAME, "public"):
-                conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{schema}"."tenant" CASCADE')
-            conn.commit()
-    except Exception:
-        return
-
-
-_drop_legacy_tenant_table()
-
-def _ensure_postgres_tenants_table_name() -> None:
-    if not DATABASE_URL.startswith("postgresql"):
-        return
-    try:
-        with engine.connect() as conn:
-            names = conn.execute(
-                text("select table_name from information_schema.tables where table_schema=:s"),
-                {"s": SCHEMA_NAME},
-            ).fetchall()
-            existing = {str(r[0]) for r in names}
-
-            if "tenant" in existing:
-                conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{SCHEMA_NAME}"."tenant" CASCADE')
-
-            if "tenants" in existing and "Tenants" not in existing:
-                conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}".tenants RENAME TO "Tenants"')
-
-            conn.commit()
-    except Exception:
-        return
-
-
-_ensure_postgres_tenants_table_name()
-
-Base.metadata.create_all(bind=engine)
-
 def _seed_reset_postgres_sequence(*, table: str, column: str) -> None:
     if not DATABASE_URL.startswith("postgresql"):
         return
@@ -341,12 +338,51 @@ def _ensure_default_tenant_executive() -> None:
         return
 
 
+PASSWORD_HASH_ITERATIONS = 120_000
+
+
 def _pbkdf2_hash_password(password: str, salt_hex: str) -> str:
     salt = bytes.fromhex(salt_hex)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 120_000)
+    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PASSWORD_HASH_ITERATIONS)
     return dk.hex()
 
 
+_PASSWORD_HASH_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_PASSWORD_HASH_SLOTS: Optional[threading.BoundedSemaphore] = None
+_PASSWORD_HASH_LOCK = threading.Lock()
+
+
+def _password_hash_pool() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _PASSWORD_HASH_EXECUTOR, _PASSWORD_HASH_SLOTS
+    with _PASSWORD_HASH_LOCK:
+        if _PASSWORD_HASH_EXECUTOR is None or _PASSWORD_HASH_SLOTS is None:
+            workers = max(1, _env_int("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+            queue = max(0, _env_int("PASSWORD_HASH_QUEUE", 16))
+            _PASSWORD_HASH_EXECUTOR = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _PASSWORD_HASH_SLOTS = threading.BoundedSemaphore(workers + queue)
+        return _PASSWORD_HASH_EXECUTOR, _PASSWORD_HASH_SLOTS
+
+
+async def _hash_password(password: str, salt_hex: str) -> str:
+    executor, slots = _password_hash_pool()
+    if not slots.acquire(blocking=False):
+        retry_after = max(1, _env_int("PASSWORD_HASH_RETRY_AFTER_SECONDS", 1))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Servidor ocupado, tente novamente em instantes",
+            headers={"Retry-After": str(retry_after)},
+        )
+    try:
+        fut = executor.submit(
+            hashlib.pbkdf2_hmac, "sha256", password.encode("utf-8"), bytes.fromhex(salt_hex), PASSWORD_HASH_ITERATIONS
+        )
+    except BaseException:
+        slots.release()
+        raise
+    fut.add_done_callback(lambda _fut: slots.release())
+    return (await asyncio.wrap_future(fut)).hex()
+
+
 def _ensure_default_admin_user() -> None:
     try:
         with SessionLocal() as db:
@@ -387,524 +423,779 @@ def _ensure_default_admin_user() -> None:
         return
 
 
-def _ensure_ativos_empresa_column() -> None:
-    try:
-        with engine.connect() as conn:
-            exists = conn.execute(
-                text(
-                    "select 1 from information_schema.columns where table_schema=:s and table_name=:t and column_name=:c"
-                ),
-                {"s": SCHEMA_NAME, "t": "Ativos", "c": "Empresa"},
-            ).first()
-            if not exists:
-                conn.execute(text(f'ALTER TABLE "{SCHEMA_NAME}"."Ativos" ADD COLUMN "Empresa" VARCHAR(255)'))
-                conn.commit()
-    except Exception:
-        return
+MIGRATIONS_COMPONENT = "Migrations"
+TABLE_VERSION_COMPONENT_PREFIX = "Tabela:"
+_MIGRATIONS_LOCK_KEY = "executive-migrations"
+_SCHEMA_READY: dict[tuple[str, str], int] = {}
+_SCHEMA_READY_LOCK = threading.Lock()
 
 
-def _ensure_executivos_tenant_columns_executive_db() -> None:
-    if not DATABASE_URL.startswith("postgresql"):
-        return
-    try:
-        with engine.connect() as conn:
-            cols_rows = conn.execute(
-                text("select column_name from information_schema.columns where table_schema=:s and table_name=:t"),
-                {"s": SCHEMA_NAME, "t": "Executivos"},
-            ).fetchall()
-            existing = {str(r[0]) for r in cols_rows}
-
-            statements: list[str] = []
-            if "TenantId" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Executivos" ADD COLUMN "TenantId" INTEGER')
-            if "Tenant" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Executivos" ADD COLUMN "Tenant" VARCHAR(255)')
-            for stmt in statements:
-                conn.exec_driver_sql(stmt)
-            if statements:
-                conn.commit()
+def _error_message(e: Exception) -> str:
+    msg = str(getattr(e, "orig", None) or e or "").strip()
+    msg = re.sub(r"\s+", " ", msg).strip()
+    if not msg:
+        msg = str(e.__class__.__name__)
+    if len(msg) > 240:
+        msg = msg[:240].rstrip() + "..."
+    return msg
 
-            conn.execute(
-                text(
-                    f"""
-                    update "{SCHEMA_NAME}"."Executivos" e
-                    set "TenantId" = t."IdTenant",
-                        "Tenant" = t."Tenant"
-                    from "{SCHEMA_NAME}"."Tenants" t
-                    where lower(e."Empresa") = lower(t."Tenant")
-                      and (
-                        e."TenantId" is null
-                        or e."TenantId" = 0
-                        or e."Tenant" is null
-                        or btrim(e."Tenant") = ''
-                      )
-                    """
-                )
-            )
-            conn.commit()
 
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Executivos_TenantId" ON "{SCHEMA_NAME}"."Executivos" ("TenantId")')
-            conn.commit()
-    except Exception:
-        return
+def _schema_version_in_conn(conn: Any, *, component: str) -> int:
+    table = conn.execute(text("select to_regclass(:t)"), {"t": f'"{SCHEMA_NAME}"."SchemaVersions"'}).scalar()
+    if not table:
+        return 0
+    version = conn.execute(
+        text(f'select "Versao" from "{SCHEMA_NAME}"."SchemaVersions" where "Componente" = :c'),
+        {"c": component},
+    ).scalar()
+    return int(version or 0)
 
 
-def _ensure_executivos_tenant_columns_tenant_db(*, db_name: str, tenant_id: int, tenant_name: str) -> None:
+def _schema_version_in_engine(*, engine_to_use: Engine, component: str) -> int:
     if not DATABASE_URL.startswith("postgresql"):
-        return
+        return 0
     try:
-        tenant_engine = _tenant_engine(db_name=_sanitize_db_name(db_name))
-        with tenant_engine.connect() as conn:
-            cols_rows = conn.execute(
-                text("select column_name from information_schema.columns where table_schema=:s and table_name=:t"),
-                {"s": SCHEMA_NAME, "t": "Executivos"},
-            ).fetchall()
-            existing = {str(r[0]) for r in cols_rows}
-
-            statements: list[str] = []
-            if "TenantId" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Executivos" ADD COLUMN "TenantId" INTEGER')
-            if "Tenant" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Executivos" ADD COLUMN "Tenant" VARCHAR(255)')
-            for stmt in statements:
-                conn.exec_driver_sql(stmt)
-            if statements:
-                conn.commit()
-
-            conn.execute(
-                text(
-                    f"""
-                    update "{SCHEMA_NAME}"."Executivos"
-                    set "TenantId" = :tenant_id,
-                        "Tenant" = :tenant_name
-                    where "TenantId" is null
-                       or "TenantId" = 0
-                       or "Tenant" is null
-                       or btrim("Tenant") = ''
-                    """
-                ),
-                {"tenant_id": int(tenant_id), "tenant_name": str(tenant_name or "").strip()},
-            )
-            conn.commit()
-
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Executivos_TenantId" ON "{SCHEMA_NAME}"."Executivos" ("TenantId")')
-            conn.commit()
+        with engine_to_use.connect() as conn:
+            return _schema_version_in_conn(conn, component=component)
     except Exception:
-        return
+        return 0
 
 
-def _ensure_executivos_tenant_columns_all_databases() -> None:
-    try:
-        _ensure_executivos_tenant_columns_executive_db()
-        with SessionLocal() as db:
-            tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-        for t in tenants:
-            if str(t.Slug or "").strip().lower() == "executive":
-                continue
-            db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))
-            _ensure_executivos_tenant_columns_tenant_db(db_name=db_name, tenant_id=int(t.IdTenant), tenant_name=str(t.Tenant or "").strip())
-    except Exception:
-        return
+def _ensure_schema_versions_table(conn: Any) -> None:
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."SchemaVersions" (
+            "Componente" VARCHAR(100) PRIMARY KEY,
+            "Versao" INTEGER NOT NULL,
+            "DataAtualizacao" TIMESTAMP NOT NULL DEFAULT now()
+        )
+        """
+    )
 
 
-def _ensure_usuarios_columns() -> None:
-    if not DATABASE_URL.startswith("postgresql"):
-        return
-    try:
-        with engine.connect() as conn:
-            existing_rows = conn.execute(
-                text("select column_name from information_schema.columns where table_schema=:s and table_name=:t"),
-                {"s": SCHEMA_NAME, "t": "Usuarios"},
-            ).fetchall()
-            existing = {str(r[0]) for r in existing_rows}
-
-            statements: list[str] = []
-            if "Usuario" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Usuario" VARCHAR(255)')
-            if "TenantId" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "TenantId" INTEGER')
-            if "Role" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Role" VARCHAR(50)')
-            if "Nome" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Nome" VARCHAR(255)')
-            if "Funcao" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Funcao" VARCHAR(255)')
-            if "Perfil" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Perfil" VARCHAR(255)')
-            if "Permissao" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Permissao" VARCHAR(255)')
-            if "Celular" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Celular" VARCHAR(30)')
-            if "Email" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Email" VARCHAR(255)')
-            if "SenhaSalt" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "SenhaSalt" VARCHAR(64)')
-            if "SenhaHash" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "SenhaHash" VARCHAR(128)')
-            if "Ativo" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "Ativo" INTEGER NOT NULL DEFAULT 1')
-
-            for stmt in statements:
-                conn.exec_driver_sql(stmt)
-            if statements:
-                conn.commit()
-    except Exception:
-        return
+def _record_schema_version(conn: Any, *, component: str, version: int) -> None:
+    _ensure_schema_versions_table(conn)
+    conn.execute(
+        text(
+            f"""
+            insert into "{SCHEMA_NAME}"."SchemaVersions" ("Componente", "Versao", "DataAtualizacao")
+            values (:c, :v, now())
+            on conflict ("Componente") do update
+            set "Versao" = excluded."Versao", "DataAtualizacao" = excluded."DataAtualizacao"
+            """
+        ),
+        {"c": component, "v": int(version)},
+    )
 
 
-def _ensure_table_tenant_columns_executive_db(*, table: str, tenant_name_column: str = "Empresa") -> None:
-    if not DATABASE_URL.startswith("postgresql"):
-        return
-    try:
-        with engine.connect() as conn:
-            cols_rows = conn.execute(
-                text("select column_name from information_schema.columns where table_schema=:s and table_name=:t"),
-                {"s": SCHEMA_NAME, "t": table},
-            ).fetchall()
-            existing = {str(r[0]) for r in cols_rows}
-
-            statements: list[str] = []
-            if "TenantId" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."{table}" ADD COLUMN "TenantId" INTEGER')
-            if "Tenant" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."{table}" ADD COLUMN "Tenant" VARCHAR(255)')
-            for stmt in statements:
-                conn.exec_driver_sql(stmt)
-            if statements:
-                conn.commit()
+def _schema_ready(db_name: str, component: str, version: int) -> bool:
+    with _SCHEMA_READY_LOCK:
+        return _SCHEMA_READY.get((_sanitize_db_name(db_name), component), 0) >= int(version)
 
-            conn.execute(
-                text(
-                    f"""
-                    update "{SCHEMA_NAME}"."{table}" r
-                    set "TenantId" = t."IdTenant",
-                        "Tenant" = t."Tenant"
-                    from "{SCHEMA_NAME}"."Tenants" t
-                    where lower(r."{tenant_name_column}") = lower(t."Tenant")
-                      and (
-                        r."TenantId" is null
-                        or r."TenantId" = 0
-                        or r."Tenant" is null
-                        or btrim(r."Tenant") = ''
-                      )
-                    """
-                )
-            )
-            conn.commit()
 
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_{table}_TenantId" ON "{SCHEMA_NAME}"."{table}" ("TenantId")')
-            conn.commit()
-    except Exception:
-        return
+def _mark_schema_ready(db_name: str, component: str, version: int) -> None:
+    with _SCHEMA_READY_LOCK:
+        _SCHEMA_READY[(_sanitize_db_name(db_name), component)] = int(version)
 
 
-def _ensure_table_tenant_columns_tenant_db(*, db_name: str, table: str, tenant_id: int, tenant_name: str) -> None:
-    if not DATABASE_URL.startswith("postgresql"):
+def _forget_schema_ready(db_name: str) -> None:
+    safe_db = _sanitize_db_name(db_name)
+    with _SCHEMA_READY_LOCK:
+        for key in [k for k in _SCHEMA_READY if k[0] == safe_db]:
+            _SCHEMA_READY.pop(key, None)
+
+
+def _table_columns(conn: Any, table: str) -> set[str]:
+    rows = conn.execute(
+        text("select column_name from information_schema.columns where table_schema=:s and table_name=:t"),
+        {"s": SCHEMA_NAME, "t": table},
+    ).fetchall()
+    return {str(r[0]) for r in rows}
+
+
+def _migration_tenants_table_name(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    for schema in (SCHEMA_NAME, "public"):
+        conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{schema}"."tenant" CASCADE')
+
+    names = conn.execute(
+        text("select table_name from information_schema.tables where table_schema=:s"),
+        {"s": SCHEMA_NAME},
+    ).fetchall()
+    existing = {str(r[0]) for r in names}
+    if "tenants" in existing and "Tenants" not in existing:
+        conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}".tenants RENAME TO "Tenants"')
+
+
+def _migration_base_tables(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    Base.metadata.create_all(bind=conn)
+
+
+def _migration_ativos_empresa_column(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    if "Empresa" not in _table_columns(conn, "Ativos"):
+        conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}"."Ativos" ADD COLUMN "Empresa" VARCHAR(255)')
+
+
+def _migration_usuarios_columns(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    existing = _table_columns(conn, "Usuarios")
+    columns = [
+        ("Usuario", "VARCHAR(255)"),
+        ("TenantId", "INTEGER"),
+        ("Role", "VARCHAR(50)"),
+        ("Nome", "VARCHAR(255)"),
+        ("Funcao", "VARCHAR(255)"),
+        ("Perfil", "VARCHAR(255)"),
+        ("Permissao", "VARCHAR(255)"),
+        ("Celular", "VARCHAR(30)"),
+        ("Email", "VARCHAR(255)"),
+        ("SenhaSalt", "VARCHAR(64)"),
+        ("SenhaHash", "VARCHAR(128)"),
+        ("Ativo", "INTEGER NOT NULL DEFAULT 1"),
+    ]
+    for name, ddl in columns:
+        if name not in existing:
+            conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" ADD COLUMN "{name}" {ddl}')
+
+
+def _migration_usuarios_nome_column_position(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    rows = conn.execute(
+        text(
+            """
+            select column_name, ordinal_position
+            from information_schema.columns
+            where table_schema=:s and table_name=:t
+            order by ordinal_position asc
+            """
+        ),
+        {"s": SCHEMA_NAME, "t": "Usuarios"},
+    ).fetchall()
+    positions = {str(r[0]): int(r[1]) for r in rows if r and r[0]}
+
+    if "IdUsuarios" not in positions or "Nome" not in positions:
+        return
+    if int(positions["Nome"]) == 2:
         return
-    try:
-        tenant_engine = _tenant_engine(db_name=_sanitize_db_name(db_name))
-        with tenant_engine.connect() as conn:
-            cols_rows = conn.execute(
-                text("select column_name from information_schema.columns where table_schema=:s and table_name=:t"),
-                {"s": SCHEMA_NAME, "t": table},
-            ).fetchall()
-            existing = {str(r[0]) for r in cols_rows}
-
-            statements: list[str] = []
-            if "TenantId" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."{table}" ADD COLUMN "TenantId" INTEGER')
-            if "Tenant" not in existing:
-                statements.append(f'ALTER TABLE "{SCHEMA_NAME}"."{table}" ADD COLUMN "Tenant" VARCHAR(255)')
-            for stmt in statements:
-                conn.exec_driver_sql(stmt)
-            if statements:
-                conn.commit()
 
-            conn.execute(
-                text(
-                    f"""
-                    update "{SCHEMA_NAME}"."{table}"
-                    set "TenantId" = :tenant_id,
-                        "Tenant" = :tenant_name
-                    where "TenantId" is null
-                       or "TenantId" = 0
-                       or "Tenant" is null
-                       or btrim("Tenant") = ''
-                    """
-                ),
-                {"tenant_id": int(tenant_id), "tenant_name": str(tenant_name or "").strip()},
-            )
-            conn.commit()
+    conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" RENAME TO "Usuarios__old_nome_order"')
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE "{SCHEMA_NAME}"."Usuarios" (
+            "IdUsuarios" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            "Nome" VARCHAR(255) NULL,
+            "Usuario" VARCHAR(255) NOT NULL,
+            "TenantId" INTEGER NOT NULL,
+            "Role" VARCHAR(50) NOT NULL,
+            "Funcao" VARCHAR(255) NULL,
+            "Perfil" VARCHAR(255) NULL,
+            "Permissao" VARCHAR(255) NULL,
+            "Celular" VARCHAR(30) NULL,
+            "Email" VARCHAR(255) NULL,
+            "SenhaSalt" VARCHAR(64) NOT NULL,
+            "SenhaHash" VARCHAR(128) NOT NULL,
+            "Ativo" INTEGER NOT NULL DEFAULT 1,
+            CONSTRAINT "uq_Usuarios_Usuario" UNIQUE ("Usuario")
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        INSERT INTO "{SCHEMA_NAME}"."Usuarios"
+            ("IdUsuarios","Nome","Usuario","TenantId","Role","Funcao","Perfil","Permissao","Celular","Email","SenhaSalt","SenhaHash","Ativo")
+        SELECT
+            "IdUsuarios","Nome","Usuario","TenantId","Role","Funcao","Perfil","Permissao","Celular","Email","SenhaSalt","SenhaHash","Ativo"
+        FROM "{SCHEMA_NAME}"."Usuarios__old_nome_order"
+        """
+    )
+    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Usuarios_TenantId" ON "{SCHEMA_NAME}"."Usuarios" ("TenantId")')
+    conn.exec_driver_sql(f'DROP TABLE "{SCHEMA_NAME}"."Usuarios__old_nome_order"')
+
+
+def _migration_gestao_interna_tables(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."Departamentos" (
+            "IdDepartamento" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            "Departamento" VARCHAR(255) NOT NULL,
+            "Descricao" VARCHAR(1000) NULL,
+            "IdTenant" INTEGER NULL,
+            "Tenant" VARCHAR(255) NULL,
+            "DataCadastro" DATE NULL,
+            "Cadastrante" VARCHAR(255) NULL
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."Funcoes" (
+            "IdFuncao" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            "Funcao" VARCHAR(255) NOT NULL,
+            "Descricao" VARCHAR(1000) NULL,
+            "Departamento" VARCHAR(255) NOT NULL,
+            "IdTenant" INTEGER NULL,
+            "Tenant" VARCHAR(255) NULL,
+            "DataCadastro" DATE NULL,
+            "Cadastrante" VARCHAR(255) NULL
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."Colaboradores" (
+            "IdColaborador" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            "Colaborador" VARCHAR(255) NOT NULL,
+            "Descricao" VARCHAR(1000) NULL,
+            "Funcao" VARCHAR(255) NOT NULL,
+            "IdTenant" INTEGER NULL,
+            "Tenant" VARCHAR(255) NULL,
+            "DataCadastro" DATE NULL,
+            "Cadastrante" VARCHAR(255) NULL
+        )
+        """
+    )
 
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_{table}_TenantId" ON "{SCHEMA_NAME}"."{table}" ("TenantId")')
-            conn.commit()
-    except Exception:
-        return
+    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Departamentos_IdTenant" ON "{SCHEMA_NAME}"."Departamentos" ("IdTenant")')
+    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Funcoes_IdTenant" ON "{SCHEMA_NAME}"."Funcoes" ("IdTenant")')
+    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Colaboradores_IdTenant" ON "{SCHEMA_NAME}"."Colaboradores" ("IdTenant")')
 
 
-def _ensure_gestao_interna_tables_in_engine(*, engine_to_use: Engine) -> None:
-    if not DATABASE_URL.startswith("postgresql"):
+def _add_tenant_columns(
+    conn: Any,
+    *,
+    table: str,
+    tenant: Optional[tuple[int, str, str]],
+    tenant_name_column: str = "Empresa",
+) -> None:
+    existing = _table_columns(conn, table)
+    if not existing:
         return
-    try:
-        with engine_to_use.connect() as conn:
-            conn.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA_NAME}"')
 
-            conn.exec_driver_sql(
-                f"""
-                CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."Departamentos" (
-                    "IdDepartamento" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                    "Departamento" VARCHAR(255) NOT NULL,
-                    "Descricao" VARCHAR(1000) NULL,
-                    "IdTenant" INTEGER NULL,
-                    "Tenant" VARCHAR(255) NULL,
-                    "DataCadastro" DATE NULL,
-                    "Cadastrante" VARCHAR(255) NULL
-                )
-                """
-            )
-            conn.exec_driver_sql(
+    if "TenantId" not in existing:
+        conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}"."{table}" ADD COLUMN "TenantId" INTEGER')
+    if "Tenant" not in existing:
+        conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}"."{table}" ADD COLUMN "Tenant" VARCHAR(255)')
+
+    if tenant is None:
+        conn.execute(
+            text(
                 f"""
-                CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."Funcoes" (
-                    "IdFuncao" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                    "Funcao" VARCHAR(255) NOT NULL,
-                    "Descricao" VARCHAR(1000) NULL,
-                    "Departamento" VARCHAR(255) NOT NULL,
-                    "IdTenant" INTEGER NULL,
-                    "Tenant" VARCHAR(255) NULL,
-                    "DataCadastro" DATE NULL,
-                    "Cadastrante" VARCHAR(255) NULL
-                )
+                update "{SCHEMA_NAME}"."{table}" r
+                set "TenantId" = t."IdTenant",
+                    "Tenant" = t."Tenant"
+                from "{SCHEMA_NAME}"."Tenants" t
+                where lower(r."{tenant_name_column}") = lower(t."Tenant")
+                  and (
+                    r."TenantId" is null
+                    or r."TenantId" = 0
+                    or r."Tenant" is null
+                    or btrim(r."Tenant") = ''
+                  )
                 """
             )
-            conn.exec_driver_sql(
+        )
+    else:
+        tenant_id, _tenant_slug, tenant_name = tenant
+        conn.execute(
+            text(
                 f"""
-                CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."Colaboradores" (
-                    "IdColaborador" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                    "Colaborador" VARCHAR(255) NOT NULL,
-                    "Descricao" VARCHAR(1000) NULL,
-                    "Funcao" VARCHAR(255) NOT NULL,
-                    "IdTenant" INTEGER NULL,
-                    "Tenant" VARCHAR(255) NULL,
-                    "DataCadastro" DATE NULL,
-                    "Cadastrante" VARCHAR(255) NULL
-                )
+                update "{SCHEMA_NAME}"."{table}"
+                set "TenantId" = :tenant_id,
+                    "Tenant" = :tenant_name
+                where "TenantId" is null
+                   or "TenantId" = 0
+                   or "Tenant" is null
+                   or btrim("Tenant") = ''
                 """
-            )
-
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Departamentos_IdTenant" ON "{SCHEMA_NAME}"."Departamentos" ("IdTenant")')
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Funcoes_IdTenant" ON "{SCHEMA_NAME}"."Funcoes" ("IdTenant")')
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Colaboradores_IdTenant" ON "{SCHEMA_NAME}"."Colaboradores" ("IdTenant")')
-            conn.commit()
-    except Exception:
-        return
-
+            ),
+            {"tenant_id": int(tenant_id), "tenant_name": str(tenant_name or "").strip()},
+        )
 
-def _ensure_gestao_interna_tables_for_auth(*, tenant_id: int, tenant_slug: str) -> None:
-    safe_slug = str(tenant_slug or "").strip().lower()
-    if tenant_id <= 0 or not safe_slug:
-        return
-    db_name = _tenant_db_name_for_auth(tenant_id=int(tenant_id), tenant_slug=safe_slug)
-    if safe_slug == "executive":
-        _ensure_gestao_interna_tables_in_engine(engine_to_use=engine)
-        return
-    tenant_engine = _tenant_engine(db_name=_sanitize_db_name(db_name))
-    _ensure_gestao_interna_tables_in_engine(engine_to_use=tenant_engine)
+    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_{table}_TenantId" ON "{SCHEMA_NAME}"."{table}" ("TenantId")')
 
 
-def _ensure_gestao_interna_tables_all_databases() -> None:
-    try:
-        _ensure_gestao_interna_tables_in_engine(engine_to_use=engine)
-        with SessionLocal() as db:
-            tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-        for t in tenants:
-            if str(t.Slug or "").strip().lower() == "executive":
-                continue
-            tenant_engine = _tenant_engine(db_name=_sanitize_db_name(_tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))))
-            _ensure_gestao_interna_tables_in_engine(engine_to_use=tenant_engine)
-    except Exception:
-        return
+def _migration_executivos_tenant_columns(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    _add_tenant_columns(conn, table="Executivos", tenant=tenant)
 
 
-def _gestao_interna_tables_exist_in_engine(*, engine_to_use: Engine) -> bool:
-    if not DATABASE_URL.startswith("postgresql"):
-        return False
-    try:
-        with engine_to_use.connect() as conn:
-            rows = conn.execute(
-                text(
-                    """
-                    select table_name
-                    from information_schema.tables
-                    where table_schema = :s
-                      and table_name in ('Departamentos', 'Funcoes', 'Colaboradores')
-                    """
-                ),
-                {"s": SCHEMA_NAME},
-            ).fetchall()
-            existing = {str(r[0]) for r in rows}
-            return {"Departamentos", "Funcoes", "Colaboradores"}.issubset(existing)
-    except Exception:
-        return False
+def _migration_table_tenant_columns(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    for table in ("Ativos", "ContasPagar", "CentroCustos"):
+        _add_tenant_columns(conn, table=table, tenant=tenant)
 
 
-def _ensure_tenant_columns_all_databases() -> None:
-    try:
-        _ensure_table_tenant_columns_executive_db(table="Ativos", tenant_name_column="Empresa")
-        _ensure_table_tenant_columns_executive_db(table="ContasPagar", tenant_name_column="Empresa")
-        _ensure_table_tenant_columns_executive_db(table="CentroCustos", tenant_name_column="Empresa")
+def _migration_drop_public_schema(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    conn.exec_driver_sql("DROP SCHEMA IF EXISTS public CASCADE")
 
-        with SessionLocal() as db:
-            tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
 
-        for t in tenants:
-            if str(t.Slug or "").strip().lower() == "executive":
-                continue
-            db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))
-            tenant_name = str(t.Tenant or "").strip()
-            _ensure_table_tenant_columns_tenant_db(db_name=db_name, table="Ativos", tenant_id=int(t.IdTenant), tenant_name=tenant_name)
-            _ensure_table_tenant_columns_tenant_db(db_name=db_name, table="ContasPagar", tenant_id=int(t.IdTenant), tenant_name=tenant_name)
-            _ensure_table_tenant_columns_tenant_db(db_name=db_name, table="CentroCustos", tenant_id=int(t.IdTenant), tenant_name=tenant_name)
-    except Exception:
-        return
+def _migration_list_sort_indexes(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    indexes = (
+        ("Usuarios", "IdUsuarios", ("Usuario", "Nome")),
+        ("Tenants", "IdTenant", ("Tenant", "Slug")),
+        ("Executivos", "IdExecutivo", ("Executivo", "Empresa")),
+        ("Ativos", "IdAtivo", ("Ativo", "Empresa", "CentroCusto")),
+        ("CentroCustos", "IdCustos", ("Nome", "Empresa")),
+        ("ContasPagar", "IdContasPagar", ("Vencimento", "Descricao", "Credor", "ValorFinal", "Empresa")),
+        ("Departamentos", "IdDepartamento", ("Departamento",)),
+        ("Funcoes", "IdFuncao", ("Funcao", "Departamento")),
+        ("Colaboradores", "IdColaborador", ("Colaborador", "Funcao")),
+    )
+    for table, pk_name, columns in indexes:
+        if not _table_columns(conn, table):
+            continue
+        for column in columns:
+            conn.exec_driver_sql(
+                f'CREATE INDEX IF NOT EXISTS "ix_{table}_{column}_{pk_name}" '
+                f'ON "{SCHEMA_NAME}"."{table}" ("{column}", "{pk_name}")'
+            )
 
 
-def _ensure_usuarios_nome_column_position() -> None:
-    if not DATABASE_URL.startswith("postgresql"):
+def _migration_contas_pagar_filter_indexes(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    if not _table_columns(conn, "ContasPagar"):
         return
-    try:
-        with engine.connect() as conn:
-            rows = conn.execute(
-                text(
-                    """
-                    select column_name, ordinal_position
-                    from information_schema.columns
-                    where table_schema=:s and table_name=:t
-                    order by ordinal_position asc
-                    """
-                ),
-                {"s": SCHEMA_NAME, "t": "Usuarios"},
-            ).fetchall()
-            positions = {str(r[0]): int(r[1]) for r in rows if r and r[0]}
+    for column in ("StatusPagamento", "StatusCobranca", "Credor", "TipoCobranca", "DevedorIdExecutivo"):
+        conn.exec_driver_sql(
+            f'CREATE INDEX IF NOT EXISTS "ix_ContasPagar_{column}_Vencimento" '
+            f'ON "{SCHEMA_NAME}"."ContasPagar" ("{column}", "Vencimento", "IdContasPagar")'
+        )
+    conn.exec_driver_sql(
+        f'CREATE INDEX IF NOT EXISTS "ix_ContasPagar_EmAberto_Vencimento" '
+        f'ON "{SCHEMA_NAME}"."ContasPagar" ("Vencimento", "IdContasPagar") '
+        f"WHERE \"StatusPagamento\" <> 'PAGO'"
+    )
 
-            if "IdUsuarios" not in positions or "Nome" not in positions:
-                return
-            if int(positions["Nome"]) == 2:
-                return
 
-            conn.exec_driver_sql(f'ALTER TABLE "{SCHEMA_NAME}"."Usuarios" RENAME TO "Usuarios__old_nome_order"')
-            conn.exec_driver_sql(
-                f"""
-                CREATE TABLE "{SCHEMA_NAME}"."Usuarios" (
-                    "IdUsuarios" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                    "Nome" VARCHAR(255) NULL,
-                    "Usuario" VARCHAR(255) NOT NULL,
-                    "TenantId" INTEGER NOT NULL,
-                    "Role" VARCHAR(50) NOT NULL,
-                    "Funcao" VARCHAR(255) NULL,
-                    "Perfil" VARCHAR(255) NULL,
-                    "Permissao" VARCHAR(255) NULL,
-                    "Celular" VARCHAR(30) NULL,
-                    "Email" VARCHAR(255) NULL,
-                    "SenhaSalt" VARCHAR(64) NOT NULL,
-                    "SenhaHash" VARCHAR(128) NOT NULL,
-                    "Ativo" INTEGER NOT NULL DEFAULT 1,
-                    CONSTRAINT "uq_Usuarios_Usuario" UNIQUE ("Usuario")
-                )
-                """
-            )
+def _migration_list_sort_collation_indexes(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    indexes = (
+        ("Usuarios", "IdUsuarios", ("Usuario", "Nome")),
+        ("Tenants", "IdTenant", ("Tenant", "Slug")),
+        ("Executivos", "IdExecutivo", ("Executivo", "Empresa")),
+        ("Ativos", "IdAtivo", ("Ativo", "Empresa", "CentroCusto")),
+        ("CentroCustos", "IdCustos", ("Nome", "Empresa")),
+        ("ContasPagar", "IdContasPagar", ("Descricao", "Credor", "Empresa")),
+        ("Departamentos", "IdDepartamento", ("Departamento",)),
+        ("Funcoes", "IdFuncao", ("Funcao", "Departamento")),
+        ("Colaboradores", "IdColaborador", ("Colaborador", "Funcao")),
+    )
+    for table, pk_name, columns in indexes:
+        if not _table_columns(conn, table):
+            continue
+        for column in columns:
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{SCHEMA_NAME}"."ix_{table}_{column}_{pk_name}"')
             conn.exec_driver_sql(
-                f"""
-                INSERT INTO "{SCHEMA_NAME}"."Usuarios"
-                    ("IdUsuarios","Nome","Usuario","TenantId","Role","Funcao","Perfil","Permissao","Celular","Email","SenhaSalt","SenhaHash","Ativo")
-                SELECT
-                    "IdUsuarios","Nome","Usuario","TenantId","Role","Funcao","Perfil","Permissao","Celular","Email","SenhaSalt","SenhaHash","Ativo"
-                FROM "{SCHEMA_NAME}"."Usuarios__old_nome_order"
-                """
+                f'CREATE INDEX IF NOT EXISTS "ix_{table}_{column}_C_{pk_name}" '
+                f'ON "{SCHEMA_NAME}"."{table}" ("{column}" COLLATE "C", "{pk_name}")'
             )
-            conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS "ix_Usuarios_TenantId" ON "{SCHEMA_NAME}"."Usuarios" ("TenantId")')
-            conn.exec_driver_sql(f'DROP TABLE "{SCHEMA_NAME}"."Usuarios__old_nome_order"')
-            conn.commit()
-    except Exception:
-        return
 
 
-_ensure_ativos_empresa_column()
-_ensure_usuarios_columns()
-_ensure_usuarios_nome_column_position()
-_ensure_gestao_interna_tables_all_databases()
-_ensure_default_tenant_executive()
-_ensure_default_admin_user()
-_ensure_executivos_tenant_columns_all_databases()
-_ensure_tenant_columns_all_databases()
+def _require_unique_usuario_logins(conn: Any) -> None:
+    duplicated = [
+        str(r[0])
+        for r in conn.exec_driver_sql(
+            f'SELECT lower("Usuario") FROM "{SCHEMA_NAME}"."Usuarios" GROUP BY 1 HAVING count(*) > 1 ORDER BY 1 LIMIT 20'
+        ).fetchall()
+    ]
+    if duplicated:
+        raise RuntimeError(
+            "Usuários duplicados sem distinção de maiúsculas/minúsculas; renomeie ou remova antes de migrar: "
+            + ", ".join(duplicated)
+        )
 
 
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _migration_usuarios_lower_index(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    if not _table_columns(conn, "Usuarios"):
+        return
+    _require_unique_usuario_logins(conn)
+    conn.exec_driver_sql(
+        f'CREATE UNIQUE INDEX IF NOT EXISTS "ux_Usuarios_Usuario_lower" '
+        f'ON "{SCHEMA_NAME}"."Usuarios" (lower("Usuario"))'
+    )
 
 
-_DEFAULT_DATABASE_NAME = str(make_url(DATABASE_URL).database or "").strip() or "postgres"
-_TENANT_SESSIONMAKERS: dict[str, sessionmaker] = {}
-_TENANT_DB_TENANT_COLUMNS_ENSURED: set[str] = set()
+def _migration_usuarios_lower_unique(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    if not _table_columns(conn, "Usuarios"):
+        return
+    unique = conn.execute(
+        text(
+            """
+            select i.indisunique
+            from pg_index i
+            join pg_class c on c.oid = i.indexrelid
+            join pg_namespace n on n.oid = c.relnamespace
+            where n.nspname = :s and c.relname = 'ux_Usuarios_Usuario_lower'
+            """
+        ),
+        {"s": SCHEMA_NAME},
+    ).scalar()
+    if unique:
+        return
+    _require_unique_usuario_logins(conn)
+    conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{SCHEMA_NAME}"."ux_Usuarios_Usuario_lower"')
+    conn.exec_driver_sql(
+        f'CREATE UNIQUE INDEX "ux_Usuarios_Usuario_lower" ON "{SCHEMA_NAME}"."Usuarios" (lower("Usuario"))'
+    )
 
 
-def _tenant_db_name_for_auth(*, tenant_id: int, tenant_slug: str) -> str:
-    if str(tenant_slug or "").strip().lower() == "executive":
-        return _DEFAULT_DATABASE_NAME
-    return _tenant_db_name(tenant_id=int(tenant_id), slug=str(tenant_slug))
+def _migration_table_change_counters(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    _ensure_schema_versions_table(conn)
+    conn.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION "{SCHEMA_NAME}"."fn_TableVersion"() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO "{SCHEMA_NAME}"."SchemaVersions" ("Componente", "Versao", "DataAtualizacao")
+            VALUES ('{TABLE_VERSION_COMPONENT_PREFIX}' || TG_TABLE_NAME, 1, now())
+            ON CONFLICT ("Componente") DO UPDATE
+            SET "Versao" = "SchemaVersions"."Versao" + 1, "DataAtualizacao" = excluded."DataAtualizacao";
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in (
+        "Usuarios",
+        "Tenants",
+        "Executivos",
+        "Ativos",
+        "CentroCustos",
+        "ContasPagar",
+        "Departamentos",
+        "Funcoes",
+        "Colaboradores",
+    ):
+        if not _table_columns(conn, table):
+            continue
+        conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS "tg_{table}_Versao" ON "{SCHEMA_NAME}"."{table}"')
+        conn.exec_driver_sql(
+            f'CREATE TRIGGER "tg_{table}_Versao" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE '
+            f'ON "{SCHEMA_NAME}"."{table}" FOR EACH STATEMENT EXECUTE FUNCTION "{SCHEMA_NAME}"."fn_TableVersion"()'
+        )
 
 
-def _tenant_sessionmaker(db_name: str) -> sessionmaker:
-    safe_db = _sanitize_db_name(db_name)
-    existing = _TENANT_SESSIONMAKERS.get(safe_db)
-    if existing is not None:
-        return existing
-    tenant_engine = _tenant_engine(db_name=safe_db)
-    TenantSession = sessionmaker(bind=tenant_engine, autoflush=False, autocommit=False)
-    _TENANT_SESSIONMAKERS[safe_db] = TenantSession
-    return TenantSession
+def _migration_table_version_shards(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_NAME}"."TableVersions" (
+            "Tabela" VARCHAR(100) NOT NULL,
+            "Shard" INTEGER NOT NULL,
+            "Versao" BIGINT NOT NULL,
+            PRIMARY KEY ("Tabela", "Shard")
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        INSERT INTO "{SCHEMA_NAME}"."TableVersions" ("Tabela", "Shard", "Versao")
+        SELECT substr("Componente", {len(TABLE_VERSION_COMPONENT_PREFIX) + 1}), 0, "Versao"
+        FROM "{SCHEMA_NAME}"."SchemaVersions"
+        WHERE left("Componente", {len(TABLE_VERSION_COMPONENT_PREFIX)}) = '{TABLE_VERSION_COMPONENT_PREFIX}'
+        ON CONFLICT ("Tabela", "Shard") DO UPDATE SET "Versao" = "TableVersions"."Versao" + excluded."Versao"
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        DELETE FROM "{SCHEMA_NAME}"."SchemaVersions"
+        WHERE left("Componente", {len(TABLE_VERSION_COMPONENT_PREFIX)}) = '{TABLE_VERSION_COMPONENT_PREFIX}'
+        """
+    )
+    conn.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION "{SCHEMA_NAME}"."fn_TableVersion"() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE "{SCHEMA_NAME}"."TableVersions" SET "Versao" = "Versao" + 1
+            WHERE "Tabela" = TG_TABLE_NAME AND "Shard" = (
+                SELECT "Shard" FROM "{SCHEMA_NAME}"."TableVersions"
+                WHERE "Tabela" = TG_TABLE_NAME
+                LIMIT 1 FOR UPDATE SKIP LOCKED
+            );
+            IF NOT FOUND THEN
+                INSERT INTO "{SCHEMA_NAME}"."TableVersions" ("Tabela", "Shard", "Versao")
+                VALUES (TG_TABLE_NAME, pg_backend_pid(), 1)
+                ON CONFLICT ("Tabela", "Shard") DO UPDATE SET "Versao" = "TableVersions"."Versao" + 1;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
 
 
-def _ensure_tenant_columns_for_auth(*, tenant_id: int, tenant_slug: str) -> None:
-    safe_slug = str(tenant_slug or "").strip().lower()
-    if tenant_id <= 0 or not safe_slug:
-        return
+def _migration_import_valid_input(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    conn.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION "{SCHEMA_NAME}"."fn_ImportValido"(valor text, tipo text) RETURNS boolean
+        LANGUAGE plpgsql STRICT STABLE AS $$
+        BEGIN
+            EXECUTE 'SELECT $1::' || tipo USING valor;
+            RETURN true;
+        EXCEPTION WHEN data_exception THEN
+            RETURN false;
+        END
+        $$
+        """
+    )
 
-    db_name = _tenant_db_name_for_auth(tenant_id=int(tenant_id), tenant_slug=safe_slug)
-    safe_db = _sanitize_db_name(db_name)
 
-    if safe_db in _TENANT_DB_TENANT_COLUMNS_ENSURED:
-        return
+def _migration_table_version_bounded_shards(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    shards = 16
+    conn.exec_driver_sql(
+        f"""
+        INSERT INTO "{SCHEMA_NAME}"."TableVersions" ("Tabela", "Shard", "Versao")
+        SELECT "Tabela", mod("Shard", {shards}), sum("Versao")
+        FROM "{SCHEMA_NAME}"."TableVersions"
+        WHERE "Shard" >= {shards}
+        GROUP BY 1, 2
+        ON CONFLICT ("Tabela", "Shard") DO UPDATE SET "Versao" = "TableVersions"."Versao" + excluded."Versao"
+        """
+    )
+    conn.exec_driver_sql(f'DELETE FROM "{SCHEMA_NAME}"."TableVersions" WHERE "Shard" >= {shards}')
+    for table in (
+        "Usuarios",
+        "Tenants",
+        "Executivos",
+        "Ativos",
+        "CentroCustos",
+        "ContasPagar",
+        "Departamentos",
+        "Funcoes",
+        "Colaboradores",
+    ):
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO "{SCHEMA_NAME}"."TableVersions" ("Tabela", "Shard", "Versao")
+                SELECT :t, s, 0 FROM generate_series(0, {shards - 1}) s
+                ON CONFLICT ("Tabela", "Shard") DO NOTHING
+                """
+            ),
+            {"t": table},
+        )
+    conn.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION "{SCHEMA_NAME}"."fn_TableVersion"() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE "{SCHEMA_NAME}"."TableVersions" SET "Versao" = "Versao" + 1
+            WHERE "Tabela" = TG_TABLE_NAME AND "Shard" = (
+                SELECT "Shard" FROM "{SCHEMA_NAME}"."TableVersions"
+                WHERE "Tabela" = TG_TABLE_NAME
+                LIMIT 1 FOR UPDATE SKIP LOCKED
+            );
+            IF NOT FOUND THEN
+                INSERT INTO "{SCHEMA_NAME}"."TableVersions" ("Tabela", "Shard", "Versao")
+                VALUES (TG_TABLE_NAME, mod(pg_backend_pid(), {shards}), 1)
+                ON CONFLICT ("Tabela", "Shard") DO UPDATE SET "Versao" = "TableVersions"."Versao" + 1;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
 
-    if not DATABASE_URL.startswith("postgresql"):
-        _TENANT_DB_TENANT_COLUMNS_ENSURED.add(safe_db)
-        return
 
-    if safe_slug == "executive":
-        _ensure_executivos_tenant_columns_executive_db()
-        _ensure_table_tenant_columns_executive_db(table="Ativos", tenant_name_column="Empresa")
-        _ensure_table_tenant_columns_executive_db(table="ContasPagar", tenant_name_column="Empresa")
-        _ensure_table_tenant_columns_executive_db(table="CentroCustos", tenant_name_column="Empresa")
-        _ensure_gestao_interna_tables_for_auth(tenant_id=int(tenant_id), tenant_slug=safe_slug)
-        _TENANT_DB_TENANT_COLUMNS_ENSURED.add(safe_db)
+def _migration_contas_pagar_em_aberto_index(conn: Any, tenant: Optional[tuple[int, str, str]]) -> None:
+    if not _table_columns(conn, "ContasPagar"):
         return
+    conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{SCHEMA_NAME}"."ix_ContasPagar_EmAberto_Vencimento"')
+    conn.exec_driver_sql(
+        f'CREATE INDEX IF NOT EXISTS "ix_ContasPagar_EmAberto_Vencimento" '
+        f'ON "{SCHEMA_NAME}"."ContasPagar" ("Vencimento", "IdContasPagar") '
+        f"WHERE \"StatusPagamento\" IS DISTINCT FROM 'PAGO'"
+    )
 
-    tenant_name = _tenant_name_from_id(int(tenant_id)) or safe_slug
-    _ensure_executivos_tenant_columns_tenant_db(db_name=safe_db, tenant_id=int(tenant_id), tenant_name=str(tenant_name))
-    _ensure_table_tenant_columns_tenant_db(db_name=safe_db, table="Ativos", tenant_id=int(tenant_id), tenant_name=str(tenant_name))
-    _ensure_table_tenant_columns_tenant_db(db_name=safe_db, table="ContasPagar", tenant_id=int(tenant_id), tenant_name=str(tenant_name))
-    _ensure_table_tenant_columns_tenant_db(db_name=safe_db, table="CentroCustos", tenant_id=int(tenant_id), tenant_name=str(tenant_name))
-    _ensure_gestao_interna_tables_for_auth(tenant_id=int(tenant_id), tenant_slug=safe_slug)
-    _TENANT_DB_TENANT_COLUMNS_ENSURED.add(safe_db)
 
-class ExecutivoCreate(BaseModel):
-    Executivo: str = Field(min_length=1, max_length=255)
-    Funcao: str = Field(min_length=1, max_length=255)
-    Perfil: str = Field(min_length=1, max_length=255)
-    Empresa: str = Field(min_length=1, max_length=255)
+_MIGRATIONS: list[tuple[int, str, str, Callable[[Any, Optional[tuple[int, str, str]]], None]]] = [
+    (1, "tenants_table_name", "control", _migration_tenants_table_name),
+    (2, "base_tables", "control", _migration_base_tables),
+    (3, "ativos_empresa_column", "control", _migration_ativos_empresa_column),
+    (4, "usuarios_columns", "control", _migration_usuarios_columns),
+    (5, "usuarios_nome_column_position", "control", _migration_usuarios_nome_column_position),
+    (6, "gestao_interna_tables", "all", _migration_gestao_interna_tables),
+    (7, "executivos_tenant_columns", "all", _migration_executivos_tenant_columns),
+    (8, "table_tenant_columns", "all", _migration_table_tenant_columns),
+    (9, "drop_public_schema", "tenant", _migration_drop_public_schema),
+    (10, "list_sort_indexes", "all", _migration_list_sort_indexes),
+    (11, "contas_pagar_filter_indexes", "all", _migration_contas_pagar_filter_indexes),
+    (12, "usuarios_lower_index", "all", _migration_usuarios_lower_index),
+    (13, "table_change_counters", "all", _migration_table_change_counters),
+    (14, "usuarios_lower_unique", "all", _migration_usuarios_lower_unique),
+    (15, "list_sort_collation_indexes", "all", _migration_list_sort_collation_indexes),
+    (16, "table_version_shards", "all", _migration_table_version_shards),
+    (17, "import_valid_input", "all", _migration_import_valid_input),
+    (18, "table_version_bounded_shards", "all", _migration_table_version_bounded_shards),
+    (19, "contas_pagar_em_aberto_index", "all", _migration_contas_pagar_em_aberto_index),
+]
+LATEST_MIGRATION_VERSION = max(m[0] for m in _MIGRATIONS)
+
+
+def _migrate_database(*, db_name: str, tenant: Optional[tuple[int, str, str]] = None) -> int:
+    safe_db = _sanitize_db_name(db_name)
+    if not DATABASE_URL.startswith("postgresql"):
+        return 0
+
+    scope = "control" if tenant is None else "tenant"
+    engine_to_use = engine if tenant is None else _tenant_engine(db_name=safe_db)
+    with engine_to_use.connect() as conn:
+        try:
+            conn.execute(text("select pg_advisory_xact_lock(hashtext(:k))"), {"k": _MIGRATIONS_LOCK_KEY})
+            conn.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA_NAME}"')
+            current = _schema_version_in_conn(conn, component=MIGRATIONS_COMPONENT)
+            pending = [m for m in _MIGRATIONS if m[0] > current]
+            for _version, _name, migration_scope, migration in pending:
+                if migration_scope in (scope, "all"):
+                    migration(conn, tenant)
+            if pending:
+                current = pending[-1][0]
+                _record_schema_version(conn, component=MIGRATIONS_COMPONENT, version=current)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    _mark_schema_ready(safe_db, MIGRATIONS_COMPONENT, current)
+    return current
+
+
+def _migration_targets() -> list[tuple[str, tuple[int, str, str]]]:
+    with SessionLocal() as db:
+        tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
+
+    targets: list[tuple[str, tuple[int, str, str]]] = []
+    for t in tenants:
+        slug = str(t.Slug or "").strip().lower()
+        if not slug or slug == "executive":
+            continue
+        tid = int(t.IdTenant)
+        name = str(t.Tenant or "").strip() or slug
+        targets.append((_sanitize_db_name(_tenant_db_name(tenant_id=tid, slug=slug)), (tid, slug, name)))
+    return targets
+
+
+def _migrate_all_databases(
+    *,
+    include_control: bool = True,
+    databases: Optional[set[str]] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[str, Any], None]] = None,
+) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+
+    def _done(db_name: str, result: Any) -> None:
+        results[db_name] = result
+        if progress:
+            progress(db_name, result)
+
+    control_db = _sanitize_db_name(_DEFAULT_DATABASE_NAME)
+    if include_control and (not databases or control_db in databases):
+        try:
+            _done(control_db, _migrate_database(db_name=control_db))
+        except Exception as e:
+            _done(control_db, e)
+            return results
+
+    targets = [t for t in _migration_targets() if not databases or t[0] in databases]
+    if not targets:
+        return results
+    if progress:
+        for db_name, _tenant in targets:
+            progress(db_name, None)
+
+    max_workers = max(1, workers if workers is not None else _env_int("MIGRATION_WORKERS", 4))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets)), thread_name_prefix="migrate") as executor:
+        futures = [(db_name, executor.submit(_migrate_database, db_name=db_name, tenant=tenant)) for db_name, tenant in targets]
+        for db_name, fut in futures:
+            try:
+                _done(db_name, fut.result())
+            except Exception as e:
+                _done(db_name, e)
+    return results
+
+
+async def get_db() -> AsyncSession:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _tenant_db_name_for_auth(*, tenant_id: int, tenant_slug: str) -> str:
+    if str(tenant_slug or "").strip().lower() == "executive":
+        return _DEFAULT_DATABASE_NAME
+    return _tenant_db_name(tenant_id=int(tenant_id), slug=str(tenant_slug))
+
+
+class _TenantSessionLease:
+    def __init__(self, entry: dict[str, Any], session: Any) -> None:
+        self.entry = entry
+        self.session = session
+
+    def __enter__(self) -> Any:
+        return self.session.__enter__()
+
+    def __exit__(self, *exc: Any) -> Any:
+        try:
+            return self.session.__exit__(*exc)
+        finally:
+            _release_tenant_engine_entry(self.entry)
+
+    async def __aenter__(self) -> Any:
+        return await self.session.__aenter__()
+
+    async def __aexit__(self, *exc: Any) -> Any:
+        try:
+            return await self.session.__aexit__(*exc)
+        finally:
+            _release_tenant_engine_entry(self.entry)
+
+
+def _tenant_session_factory(db_name: str, key: str) -> Callable[[], Any]:
+    def _open() -> Any:
+        entry = _tenant_engine_entry(db_name, lease=True)
+        try:
+            session = entry[key]()
+        except BaseException:
+            _release_tenant_engine_entry(entry)
+            raise
+        return _TenantSessionLease(entry, session)
+
+    return _open
+
+
+def _tenant_sessionmaker(db_name: str) -> Callable[[], Session]:
+    return _tenant_session_factory(db_name, "sessionmaker")
+
+
+def _tenant_async_sessionmaker(db_name: str) -> Callable[[], AsyncSession]:
+    return _tenant_session_factory(db_name, "async_sessionmaker")
+
+
+def _ensure_tenant_database_ready(*, tenant_id: int, tenant_slug: str) -> None:
+    safe_slug = str(tenant_slug or "").strip().lower()
+    if tenant_id <= 0 or not safe_slug:
+        return
+
+    db_name = _sanitize_db_name(_tenant_db_name_for_auth(tenant_id=int(tenant_id), tenant_slug=safe_slug))
+    if _schema_ready(db_name, MIGRATIONS_COMPONENT, LATEST_MIGRATION_VERSION):
+        return
+    if not DATABASE_URL.startswith("postgresql"):
+        return
+
+    tenant: Optional[tuple[int, str, str]] = None
+    if safe_slug != "executive":
+        tenant = (int(tenant_id), safe_slug, _tenant_name_from_id(int(tenant_id)) or safe_slug)
+    _migrate_database(db_name=db_name, tenant=tenant)
+
+
+async def _ensure_tenant_database_ready_async(*, tenant_id: int, tenant_slug: str) -> None:
+    safe_slug = str(tenant_slug or "").strip().lower()
+    if tenant_id <= 0 or not safe_slug:
+        return
+    db_name = _sanitize_db_name(_tenant_db_name_for_auth(tenant_id=int(tenant_id), tenant_slug=safe_slug))
+    if _schema_ready(db_name, MIGRATIONS_COMPONENT, LATEST_MIGRATION_VERSION):
+        return
+    await run_in_threadpool(_ensure_tenant_database_ready, tenant_id=int(tenant_id), tenant_slug=safe_slug)
+
+
+class ExecutivoCreate(BaseModel):
+    Executivo: str = Field(min_length=1, max_length=255)
+    Funcao: str = Field(min_length=1, max_length=255)
+    Perfil: str = Field(min_length=1, max_length=255)
+    Empresa: str = Field(min_length=1, max_length=255)
 
 
 class ExecutivoUpdate(BaseModel):
@@ -922,6 +1213,7 @@ class ExecutivoOut(BaseModel):
     Empresa: str
     TenantId: Optional[int] = None
     Tenant: Optional[str] = None
+    Chave: Optional[str] = None
 
 
 class ContasPagarCreate(BaseModel):
@@ -1000,6 +1292,22 @@ class ContasPagarOut(BaseModel):
     Empresa: Optional[str] = None
     TenantId: Optional[int] = None
     Tenant: Optional[str] = None
+    Chave: Optional[str] = None
+
+class ContasPagarResumoGrupo(BaseModel):
+    Grupo: Optional[str] = None
+    TenantId: Optional[int] = None
+    Quantidade: int = 0
+    ValorOriginal: float = 0
+    ValorFinal: float = 0
+
+
+class ContasPagarResumoOut(BaseModel):
+    Total: ContasPagarResumoGrupo
+    PorStatusPagamento: list[ContasPagarResumoGrupo]
+    PorMes: list[ContasPagarResumoGrupo]
+    PorCredor: list[ContasPagarResumoGrupo]
+    PorTenant: list[ContasPagarResumoGrupo]
 
 
 class AtivoCreate(BaseModel):
@@ -1042,6 +1350,7 @@ class AtivoOut(BaseModel):
     Empresa: Optional[str] = None
     TenantId: Optional[int] = None
     Tenant: Optional[str] = None
+    Chave: Optional[str] = None
 
 
 class CentroCustosCreate(BaseModel):
@@ -1078,6 +1387,7 @@ class CentroCustosOut(BaseModel):
     Responsavel: Optional[str] = None
     TenantId: Optional[int] = None
     Tenant: Optional[str] = None
+    Chave: Optional[str] = None
 
 
 class DepartamentoCreate(BaseModel):
@@ -1098,6 +1408,7 @@ class DepartamentoOut(BaseModel):
     Tenant: Optional[str] = None
     DataCadastro: Optional[date] = None
     Cadastrante: Optional[str] = None
+    Chave: Optional[str] = None
 
 
 class FuncaoCreate(BaseModel):
@@ -1121,6 +1432,7 @@ class FuncaoOut(BaseModel):
     Tenant: Optional[str] = None
     DataCadastro: Optional[date] = None
     Cadastrante: Optional[str] = None
+    Chave: Optional[str] = None
 
 
 class ColaboradorCreate(BaseModel):
@@ -1144,6 +1456,7 @@ class ColaboradorOut(BaseModel):
     Tenant: Optional[str] = None
     DataCadastro: Optional[date] = None
     Cadastrante: Optional[str] = None
+    Chave: Optional[str] = None
 
 
 class TenantCreate(BaseModel):
@@ -1225,10 +1538,65 @@ class LoginOut(BaseModel):
     superadmin: bool
 
 
+BULK_MAX_ITEMS = 5000
+
+
+class BulkOperacaoIn(BaseModel):
+    Operacao: Literal["create", "update", "delete"]
+    Id: Optional[int] = Field(default=None, ge=1)
+    Dados: Optional[dict[str, Any]] = None
+
+
+class BulkIn(BaseModel):
+    Operacoes: list[BulkOperacaoIn] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemOut(BaseModel):
+    Indice: int
+    Operacao: str
+    Status: int
+    Id: Optional[int] = None
+    Erro: Optional[str] = None
+
+
+class BulkOut(BaseModel):
+    Aplicado: bool
+    Criados: int
+    Atualizados: int
+    Excluidos: int
+    Erros: int
+    Resultados: list[BulkItemOut]
+
+
+class ImportErroOut(BaseModel):
+    Linha: int
+    Erros: list[str]
+
+
+class ImportOut(BaseModel):
+    Aplicado: bool
+    Linhas: int
+    Importados: int
+    Rejeitados: int
+    Relatorio: list[ImportErroOut]
+
+
 def _auth_secret() -> bytes:
     return str(os.getenv("AUTH_SECRET") or "dev-secret-change-me").encode("utf-8")
 
 
+_AUTH_HMAC: Optional["hmac.HMAC"] = None
+
+
+def _auth_hmac(body: str) -> bytes:
+    global _AUTH_HMAC
+    if _AUTH_HMAC is None:
+        _AUTH_HMAC = hmac.new(_auth_secret(), digestmod=hashlib.sha256)
+    h = _AUTH_HMAC.copy()
+    h.update(body.encode("utf-8"))
+    return h.digest()
+
+
 def _b64url_encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
 
@@ -1241,16 +1609,58 @@ def _b64url_decode(data: str) -> bytes:
 def _sign_token(payload: dict[str, Any]) -> str:
     raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
     body = _b64url_encode(raw)
-    sig = hmac.new(_auth_secret(), body.encode("utf-8"), hashlib.sha256).digest()
+    sig = _auth_hmac(body)
     return f"{body}.{_b64url_encode(sig)}"
 
 
+_AUTH_TOKEN_CACHE: "OrderedDict[bytes, tuple[float, dict[str, Any]]]" = OrderedDict()
+_AUTH_TOKEN_CACHE_LOCK = threading.Lock()
+_AUTH_TOKEN_CACHE_STATS = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+
 def _verify_token(token: str) -> Optional[dict[str, Any]]:
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+    with _AUTH_TOKEN_CACHE_LOCK:
+        cached = _AUTH_TOKEN_CACHE.get(key)
+        if cached is not None:
+            if now <= cached[0]:
+                _AUTH_TOKEN_CACHE.move_to_end(key)
+                _AUTH_TOKEN_CACHE_STATS["hits"] += 1
+                return dict(cached[1])
+            _AUTH_TOKEN_CACHE.pop(key, None)
+            _AUTH_TOKEN_CACHE_STATS["expired"] += 1
+        _AUTH_TOKEN_CACHE_STATS["misses"] += 1
+
+    payload = _verify_token_uncached(token)
+    exp = payload.get("exp") if payload else None
+    if payload and isinstance(exp, (int, float)):
+        max_size = max(0, _env_int("AUTH_TOKEN_CACHE_SIZE", 4096))
+        with _AUTH_TOKEN_CACHE_LOCK:
+            if max_size:
+                _AUTH_TOKEN_CACHE[key] = (float(exp), dict(payload))
+            while len(_AUTH_TOKEN_CACHE) > max_size:
+                _AUTH_TOKEN_CACHE.popitem(last=False)
+                _AUTH_TOKEN_CACHE_STATS["evicted"] += 1
+    return payload
+
+
+def _auth_token_cache_stats() -> dict[str, Any]:
+    with _AUTH_TOKEN_CACHE_LOCK:
+        stats: dict[str, Any] = dict(_AUTH_TOKEN_CACHE_STATS)
+        stats["size"] = len(_AUTH_TOKEN_CACHE)
+    lookups = int(stats["hits"]) + int(stats["misses"])
+    stats["max_size"] = max(0, _env_int("AUTH_TOKEN_CACHE_SIZE", 4096))
+    stats["hit_rate"] = round(int(stats["hits"]) / lookups, 4) if lookups else None
+    return stats
+
+
+def _verify_token_uncached(token: str) -> Optional[dict[str, Any]]:
     try:
         body, sig = token.split(".", 1)
     except ValueError:
         return None
-    expected = hmac.new(_auth_secret(), body.encode("utf-8"), hashlib.sha256).digest()
+    expected = _auth_hmac(body)
     try:
         provided = _b64url_decode(sig)
     except Exception:
@@ -1314,69 +1724,133 @@ def _require_superadmin(auth: Optional[dict[str, Any]] = Depends(_get_auth)) ->
     return auth or {}
 
 
-def get_tenant_db(auth: dict[str, Any] = Depends(_require_auth)) -> Session:
+async def get_tenant_db(auth: dict[str, Any] = Depends(_require_auth)) -> AsyncSession:
     tenant_id = int(auth.get("tenant_id") or 0)
     tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
     if tenant_id <= 0 or not tenant_slug:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autorizado")
 
     try:
-        _ensure_tenant_columns_for_auth(tenant_id=tenant_id, tenant_slug=tenant_slug)
+        await _ensure_tenant_database_ready_async(tenant_id=tenant_id, tenant_slug=tenant_slug)
     except HTTPException:
         raise
     except Exception as e:
-        msg = str(getattr(e, "orig", None) or e or "").strip()
-        msg = re.sub(r"\s+", " ", msg).strip()
-        if not msg:
-            msg = str(e.__class__.__name__)
-        if len(msg) > 240:
-            msg = msg[:240].rstrip() + "..."
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Falha ao preparar banco do tenant: {msg}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Falha ao preparar banco do tenant: {_error_message(e)}",
+        )
 
     db_name = _tenant_db_name_for_auth(tenant_id=tenant_id, tenant_slug=tenant_slug)
-    TenantSession = _tenant_sessionmaker(db_name)
-    db = TenantSession()
-    try:
+    TenantSession = _tenant_async_sessionmaker(db_name)
+    async with TenantSession() as db:
         yield db
-    finally:
-        db.close()
+
+
+TENANT_DIRECTORY_COMPONENT = "TenantDirectory"
+
+_TENANT_DIRECTORY: dict[str, Any] = {"loaded": False, "generation": 0, "version": 0, "checked_at": 0.0, "by_id": {}, "by_slug": {}}
+_TENANT_DIRECTORY_LOCK = threading.Lock()
+
+
+def _tenant_directory() -> dict[str, Any]:
+    interval = max(0, _env_int("TENANT_DIRECTORY_CHECK_SECONDS", 5))
+    now = time.monotonic()
+    with _TENANT_DIRECTORY_LOCK:
+        if _TENANT_DIRECTORY["loaded"] and now - float(_TENANT_DIRECTORY["checked_at"]) < interval:
+            return _TENANT_DIRECTORY
+        generation = int(_TENANT_DIRECTORY["generation"])
+        loaded = bool(_TENANT_DIRECTORY["loaded"])
+        known_version = int(_TENANT_DIRECTORY["version"])
+
+    with SessionLocal() as db:
+        version = _schema_version_in_conn(db.connection(), component=TENANT_DIRECTORY_COMPONENT)
+        if loaded and version == known_version:
+            with _TENANT_DIRECTORY_LOCK:
+                if int(_TENANT_DIRECTORY["generation"]) == generation:
+                    _TENANT_DIRECTORY["checked_at"] = now
+            return _TENANT_DIRECTORY
+        rows = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
+
+    by_id: dict[int, tuple[int, str, str]] = {}
+    by_slug: dict[str, tuple[int, str, str]] = {}
+    for row in rows:
+        meta = (int(row.IdTenant), str(row.Slug or "").strip().lower(), str(row.Tenant or "").strip())
+        by_id[meta[0]] = meta
+        if meta[1]:
+            by_slug[meta[1]] = meta
+    with _TENANT_DIRECTORY_LOCK:
+        if int(_TENANT_DIRECTORY["generation"]) == generation:
+            _TENANT_DIRECTORY.update(loaded=True, version=version, checked_at=now, by_id=by_id, by_slug=by_slug)
+    return {"by_id": by_id, "by_slug": by_slug}
+
+
+def _invalidate_tenant_directory() -> None:
+    with _TENANT_DIRECTORY_LOCK:
+        _TENANT_DIRECTORY["loaded"] = False
+        _TENANT_DIRECTORY["generation"] = int(_TENANT_DIRECTORY["generation"]) + 1
+
+
+async def _touch_tenant_directory(db: AsyncSession) -> None:
+    await db.execute(
+        text(
+            f"""
+            insert into "{SCHEMA_NAME}"."SchemaVersions" ("Componente", "Versao", "DataAtualizacao")
+            values (:c, 1, now())
+            on conflict ("Componente") do update
+            set "Versao" = "SchemaVersions"."Versao" + 1, "DataAtualizacao" = excluded."DataAtualizacao"
+            """
+        ),
+        {"c": TENANT_DIRECTORY_COMPONENT},
+    )
+
+
+async def _tenant_directory_async() -> dict[str, Any]:
+    interval = max(0, _env_int("TENANT_DIRECTORY_CHECK_SECONDS", 5))
+    with _TENANT_DIRECTORY_LOCK:
+        if _TENANT_DIRECTORY["loaded"] and time.monotonic() - float(_TENANT_DIRECTORY["checked_at"]) < interval:
+            return _TENANT_DIRECTORY
+    return await run_in_threadpool(_tenant_directory)
 
 
 def _tenant_name_from_id(tenant_id: int) -> Optional[str]:
     try:
-        with SessionLocal() as db:
-            row = db.get(TenantsModel, int(tenant_id))
-            if not row:
-                return None
-            name = str(row.Tenant or "").strip()
-            return name if name else None
+        meta = _tenant_directory()["by_id"].get(int(tenant_id))
     except Exception:
         return None
+    return meta[2] if meta and meta[2] else None
 
 
 def _tenant_meta_from_id(tenant_id: int) -> Optional[tuple[int, str, str]]:
     try:
-        with SessionLocal() as db:
-            row = db.get(TenantsModel, int(tenant_id))
-            if not row:
-                return None
-            tid = int(row.IdTenant)
-            slug = str(row.Slug or "").strip().lower()
-            name = str(row.Tenant or "").strip()
-            if not slug:
-                return None
-            return (tid, slug, name)
+        meta = _tenant_directory()["by_id"].get(int(tenant_id))
+    except Exception:
+        return None
+    return meta if meta and meta[1] else None
+
+
+async def _tenant_name_from_id_async(tenant_id: int) -> Optional[str]:
+    try:
+        meta = (await _tenant_directory_async())["by_id"].get(int(tenant_id))
     except Exception:
         return None
+    return meta[2] if meta and meta[2] else None
 
 
-@contextmanager
-def _target_tenant_session(
+async def _tenant_meta_from_id_async(tenant_id: int) -> Optional[tuple[int, str, str]]:
+    try:
+        meta = (await _tenant_directory_async())["by_id"].get(int(tenant_id))
+    except Exception:
+        return None
+    return meta if meta and meta[1] else None
+
+
+@asynccontextmanager
+async def _target_tenant_session(
     *,
-    db: Session,
+    db: AsyncSession,
     auth: dict[str, Any],
     tenant_id: Optional[int],
-) -> Session:
+) -> AsyncSession:
     if tenant_id is None or not (_is_superadmin(auth) or _is_executive_tenant(auth)):
         yield db
         return
@@ -1386,7 +1860,7 @@ def _target_tenant_session(
         yield db
         return
 
-    meta = _tenant_meta_from_id(tid)
+    meta = await _tenant_meta_from_id_async(tid)
     if not meta:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant não encontrado")
     target_id, target_slug, _target_name = meta
@@ -1394,13 +1868,752 @@ def _target_tenant_session(
         yield db
         return
 
-    _ensure_tenant_columns_for_auth(tenant_id=target_id, tenant_slug=target_slug)
+    await _ensure_tenant_database_ready_async(tenant_id=target_id, tenant_slug=target_slug)
     db_name = _tenant_db_name(tenant_id=target_id, slug=target_slug)
-    TenantSession = _tenant_sessionmaker(db_name)
-    with TenantSession() as tdb:
+    TenantSession = _tenant_async_sessionmaker(db_name)
+    async with TenantSession() as tdb:
         yield tdb
 
 
+async def _fan_out_tenant_targets(empresa_in: Optional[str] = None) -> list[tuple[int, str, str]]:
+    tenants = sorted((await _tenant_directory_async())["by_id"].values())
+    if empresa_in:
+        tenants = [t for t in tenants if t[2] == empresa_in or t[1] == empresa_in.lower()]
+    return tenants
+
+
+async def _fan_out_tenant_call(
+    meta: tuple[int, str, str],
+    query: Callable[[AsyncSession, int, str, str], Awaitable[list[Any]]],
+    timeout_ms: int,
+) -> list[Any]:
+    tid, slug, name = meta
+    await _ensure_tenant_database_ready_async(tenant_id=tid, tenant_slug=slug)
+    db_name = _tenant_db_name_for_auth(tenant_id=tid, tenant_slug=slug)
+    async with _tenant_async_sessionmaker(db_name)() as tdb:
+        await tdb.execute(text("select set_config('statement_timeout', :v, true)"), {"v": str(timeout_ms)})
+        return await query(tdb, tid, slug, name)
+
+
+async def _fan_out_tenants(
+    tenants: list[tuple[int, str, str]],
+    query: Callable[[AsyncSession, int, str, str], Awaitable[list[Any]]],
+) -> tuple[list[list[Any]], list[str], list[str]]:
+    try:
+        timeout = max(0.1, float(os.getenv("TENANT_FANOUT_TIMEOUT_SECONDS") or "10"))
+    except ValueError:
+        timeout = 10.0
+    slots = asyncio.Semaphore(max(1, _env_int("TENANT_FANOUT_WORKERS", 8)))
+
+    async def _bounded(meta: tuple[int, str, str]) -> list[Any]:
+        async with slots:
+            return await asyncio.wait_for(_fan_out_tenant_call(meta, query, int(timeout * 1000)), timeout=timeout)
+
+    outcomes = await asyncio.gather(*(_bounded(meta) for meta in tenants), return_exceptions=True)
+
+    results: list[list[Any]] = []
+    skipped: list[str] = []
+    timed_out: list[str] = []
+    for meta, outcome in zip(tenants, outcomes):
+        label = _tenant_db_name_for_auth(tenant_id=meta[0], tenant_slug=meta[1])
+        if isinstance(outcome, asyncio.TimeoutError):
+            timed_out.append(label)
+        elif isinstance(outcome, BaseException):
+            skipped.append(label)
+        else:
+            results.append(outcome)
+    return results, skipped, timed_out
+
+
+def _set_fan_out_headers(response: Response, skipped: list[str], timed_out: list[str]) -> None:
+    if skipped:
+        response.headers["X-Tenants-Skipped"] = ",".join(skipped)
+    if timed_out:
+        response.headers["X-Tenants-Timed-Out"] = ",".join(timed_out)
+
+
+LIST_MAX_LIMIT = 1000
+
+_LIST_SORTS: dict[str, dict[str, Any]] = {
+    "Usuarios": {
+        "IdUsuarios": UsuariosModel.IdUsuario,
+        "Usuario": UsuariosModel.Usuario,
+        "Nome": UsuariosModel.Nome,
+    },
+    "Tenants": {
+        "IdTenant": TenantsModel.IdTenant,
+        "Tenant": TenantsModel.Tenant,
+        "Slug": TenantsModel.Slug,
+    },
+    "Executivos": {
+        "IdExecutivo": ExecutivoModel.IdExecutivo,
+        "Executivo": ExecutivoModel.Executivo,
+        "Empresa": ExecutivoModel.Empresa,
+    },
+    "Ativos": {
+        "IdAtivo": AtivoModel.IdAtivo,
+        "Ativo": AtivoModel.Ativo,
+        "Empresa": AtivoModel.Empresa,
+        "CentroCusto": AtivoModel.CentroCusto,
+    },
+    "CentroCustos": {
+        "IdCustos": CentroCustosModel.IdCustos,
+        "Nome": CentroCustosModel.Nome,
+        "Empresa": CentroCustosModel.Empresa,
+    },
+    "ContasPagar": {
+        "IdContasPagar": ContasPagarModel.IdContasPagar,
+        "Vencimento": ContasPagarModel.Vencimento,
+        "Descricao": ContasPagarModel.Descricao,
+        "Credor": ContasPagarModel.Credor,
+        "ValorFinal": ContasPagarModel.ValorFinal,
+        "Empresa": ContasPagarModel.Empresa,
+    },
+    "Departamentos": {
+        "IdDepartamento": DepartamentoModel.IdDepartamento,
+        "Departamento": DepartamentoModel.Departamento,
+    },
+    "Funcoes": {
+        "IdFuncao": FuncaoModel.IdFuncao,
+        "Funcao": FuncaoModel.Funcao,
+        "Departamento": FuncaoModel.Departamento,
+    },
+    "Colaboradores": {
+        "IdColaborador": ColaboradorModel.IdColaborador,
+        "Colaborador": ColaboradorModel.Colaborador,
+        "Funcao": ColaboradorModel.Funcao,
+    },
+}
+
+
+def _list_codec(table: str, model: Any, out: type[BaseModel], **renames: str) -> dict[str, Any]:
+    fields = [name for name in out.model_fields if name != "Chave"]
+    attrs = [renames.get(name, name) for name in fields]
+    pk_key = next(iter(_LIST_SORTS[table].values())).key
+    return {
+        "columns": [getattr(model, attr) for attr in attrs],
+        "fields": tuple(fields),
+        "key_index": attrs.index(pk_key) if "Chave" in out.model_fields else None,
+    }
+
+
+_LIST_CODECS: dict[str, dict[str, Any]] = {
+    "Usuarios": _list_codec("Usuarios", UsuariosModel, UsuarioOut, IdUsuarios="IdUsuario"),
+    "Tenants": _list_codec("Tenants", TenantsModel, TenantOut),
+    "Executivos": _list_codec("Executivos", ExecutivoModel, ExecutivoOut),
+    "Ativos": _list_codec("Ativos", AtivoModel, AtivoOut),
+    "CentroCustos": _list_codec("CentroCustos", CentroCustosModel, CentroCustosOut),
+    "ContasPagar": _list_codec("ContasPagar", ContasPagarModel, ContasPagarOut),
+    "Departamentos": _list_codec("Departamentos", DepartamentoModel, DepartamentoOut),
+    "Funcoes": _list_codec("Funcoes", FuncaoModel, FuncaoOut),
+    "Colaboradores": _list_codec("Colaboradores", ColaboradorModel, ColaboradorOut),
+}
+
+
+def _list_projection(table: str, fields: Optional[str], *, required: list[Any]) -> dict[str, Any]:
+    codec = _LIST_CODECS[table]
+    wanted = {f.strip() for f in str(fields or "").split(",") if f.strip()}
+    if not wanted:
+        return codec
+    available = set(codec["fields"]) | ({"Chave"} if codec["key_index"] is not None else set())
+    unknown = sorted(wanted - available)
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Campos inválidos: {', '.join(unknown)}")
+
+    picked = [i for i, name in enumerate(codec["fields"]) if name in wanted]
+    columns = [codec["columns"][i] for i in picked]
+    for column in required:
+        if not any(c is column for c in columns):
+            columns.append(column)
+    key_index = None
+    if "Chave" in wanted:
+        pk = codec["columns"][codec["key_index"]]
+        key_index = next(i for i, c in enumerate(columns) if c is pk)
+    return {
+        "columns": columns,
+        "fields": tuple(codec["fields"][i] for i in picked),
+        "key_index": key_index,
+    }
+
+
+def _list_select(page: dict[str, Any]) -> Any:
+    return select(*page["codec"]["columns"])
+
+
+async def _get_row(db: AsyncSession, table: str, id_value: int) -> Any:
+    pk = next(iter(_LIST_SORTS[table].values()))
+    return (await db.execute(select(*_LIST_CODECS[table]["columns"]).where(pk == int(id_value)))).first()
+
+
+def _list_json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _list_response(response: Response, page: dict[str, Any], rows: Iterable[tuple[Optional[int], Any]]) -> Response:
+    codec = page["codec"]
+    fields = codec["fields"]
+    key_index = codec["key_index"]
+    items: list[dict[str, Any]] = []
+    for tid, row in rows:
+        item = dict(zip(fields, row))
+        if key_index is not None:
+            item["Chave"] = _row_key(tid, row[key_index])
+        items.append(item)
+    body = orjson.dumps(items, default=_list_json_default)
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+
+async def _table_version(db: AsyncSession, table: str) -> int:
+    version = (
+        await db.execute(
+            text(f'select sum("Versao") from "{SCHEMA_NAME}"."TableVersions" where "Tabela" = :t'),
+            {"t": table},
+        )
+    ).scalar()
+    return int(version or 0)
+
+
+async def _fan_out_table_versions(tenants: list[tuple[int, str, str]], table: str) -> Optional[list[Any]]:
+    ttl = min(
+        max(0, _env_int("RESPONSE_CACHE_VERSIONS_SECONDS", 2)),
+        max(0, _env_int("RESPONSE_CACHE_TTL_SECONDS", 30)),
+    )
+    key = (table, tuple(tenants))
+    now = time.monotonic()
+    with _RESPONSE_CACHE_LOCK:
+        cached = _FAN_OUT_VERSIONS.get(key)
+        if ttl and cached is not None and now < cached[0]:
+            return cached[1]
+        epoch = int(_RESPONSE_CACHE_STATE["epoch"])
+
+    async def _query(tdb: AsyncSession, tid: int, slug: str, name: str) -> list[Any]:
+        return [(tid, slug, name, await _table_version(tdb, table))]
+
+    results, skipped, timed_out = await _fan_out_tenants(tenants, _query)
+    if skipped or timed_out:
+        return None
+    versions = sorted(v for r in results for v in r)
+    if ttl:
+        with _RESPONSE_CACHE_LOCK:
+            if epoch == int(_RESPONSE_CACHE_STATE["epoch"]):
+                for stale in [k for k, v in _FAN_OUT_VERSIONS.items() if now >= v[0]]:
+                    _FAN_OUT_VERSIONS.pop(stale, None)
+                _FAN_OUT_VERSIONS[key] = (now + ttl, versions)
+    return versions
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in str(if_none_match).split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _not_modified(request: Request, response: Response, auth: dict[str, Any], versions: Any) -> Optional[Response]:
+    if versions is None:
+        return None
+    scope = (auth.get("tenant_id"), auth.get("tenant_slug"), auth.get("role"))
+    parts = (request.url.path, sorted(request.query_params.multi_items()), scope, versions)
+    etag = 'W/"' + hashlib.sha256(orjson.dumps(parts, default=str)).hexdigest()[:32] + '"'
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
+
+
+_RESPONSE_CACHE: "OrderedDict[tuple, dict[str, Any]]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_STATE = {"epoch": 0, "bytes": 0}
+_FAN_OUT_VERSIONS: dict[tuple, tuple[float, list[Any]]] = {}
+_RESPONSE_CACHE_STATS = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "stale": 0, "evicted": 0, "invalidated": 0}
+
+
+def _session_db_name(db: AsyncSession) -> str:
+    return str(db.bind.url.database or "")
+
+
+def _response_cache_ticket(request: Request, auth: dict[str, Any]) -> dict[str, Any]:
+    key = (
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        auth.get("tenant_id"),
+        auth.get("tenant_slug"),
+        auth.get("role"),
+    )
+    with _RESPONSE_CACHE_LOCK:
+        return {"key": key, "epoch": int(_RESPONSE_CACHE_STATE["epoch"]), "versions": None}
+
+
+def _cached_or_not_modified(
+    request: Request, response: Response, auth: dict[str, Any], ticket: dict[str, Any], versions: Any
+) -> Optional[Response]:
+    ticket["versions"] = versions
+    key = ticket["key"]
+    now = time.monotonic()
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is not None and now >= float(entry["expires"]):
+            _RESPONSE_CACHE.pop(key, None)
+            _RESPONSE_CACHE_STATE["bytes"] -= len(entry["body"])
+            _RESPONSE_CACHE_STATS["expired"] += 1
+            entry = None
+        if entry is not None and (versions is None or entry["versions"] != versions):
+            _RESPONSE_CACHE.pop(key, None)
+            _RESPONSE_CACHE_STATE["bytes"] -= len(entry["body"])
+            _RESPONSE_CACHE_STATS["stale"] += 1
+            entry = None
+        if entry is None:
+            _RESPONSE_CACHE_STATS["misses"] += 1
+        else:
+            _RESPONSE_CACHE.move_to_end(key)
+            _RESPONSE_CACHE_STATS["hits"] += 1
+
+    if entry is None:
+        return _not_modified(request, response, auth, versions)
+    headers = dict(entry["headers"])
+    etag = headers.get("etag")
+    if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def _response_cache_store(ticket: dict[str, Any], table: str, db_name: str, response: Response) -> Response:
+    ttl = max(0, _env_int("RESPONSE_CACHE_TTL_SECONDS", 30))
+    max_size = max(0, _env_int("RESPONSE_CACHE_SIZE", 512))
+    max_bytes = max(0, _env_int("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    body = bytes(response.body)
+    if not ttl or not max_size or response.status_code != status.HTTP_200_OK or len(body) > max_bytes // 4:
+        return response
+    if "x-tenants-skipped" in response.headers or "x-tenants-timed-out" in response.headers:
+        return response
+    if ticket["versions"] is None:
+        return response
+
+    key = ticket["key"]
+    headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+    with _RESPONSE_CACHE_LOCK:
+        if int(ticket["epoch"]) != int(_RESPONSE_CACHE_STATE["epoch"]):
+            return response
+        previous = _RESPONSE_CACHE.pop(key, None)
+        if previous is not None:
+            _RESPONSE_CACHE_STATE["bytes"] -= len(previous["body"])
+        _RESPONSE_CACHE[key] = {
+            "expires": time.monotonic() + ttl,
+            "body": body,
+            "headers": headers,
+            "table": table,
+            "db": db_name,
+            "versions": ticket["versions"],
+        }
+        _RESPONSE_CACHE_STATE["bytes"] += len(body)
+        _RESPONSE_CACHE_STATS["stores"] += 1
+        while _RESPONSE_CACHE and (len(_RESPONSE_CACHE) > max_size or int(_RESPONSE_CACHE_STATE["bytes"]) > max_bytes):
+            _key, evicted = _RESPONSE_CACHE.popitem(last=False)
+            _RESPONSE_CACHE_STATE["bytes"] -= len(evicted["body"])
+            _RESPONSE_CACHE_STATS["evicted"] += 1
+    return response
+
+
+def _invalidate_response_cache(table: Optional[str] = None, db_name: Optional[str] = None) -> None:
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE_STATE["epoch"] = int(_RESPONSE_CACHE_STATE["epoch"]) + 1
+        stale = [
+            key
+            for key, entry in _RESPONSE_CACHE.items()
+            if table is None or (entry["table"] == table and (db_name is None or entry["db"] in ("*", db_name)))
+        ]
+        for key in stale:
+            entry = _RESPONSE_CACHE.pop(key)
+            _RESPONSE_CACHE_STATE["bytes"] -= len(entry["body"])
+        _RESPONSE_CACHE_STATS["invalidated"] += len(stale)
+        for key in [k for k in _FAN_OUT_VERSIONS if table is None or k[0] == table]:
+            _FAN_OUT_VERSIONS.pop(key, None)
+
+
+def _response_cache_stats() -> dict[str, Any]:
+    with _RESPONSE_CACHE_LOCK:
+        stats: dict[str, Any] = dict(_RESPONSE_CACHE_STATS)
+        stats["size"] = len(_RESPONSE_CACHE)
+        stats["bytes"] = int(_RESPONSE_CACHE_STATE["bytes"])
+    lookups = int(stats["hits"]) + int(stats["misses"])
+    stats["max_size"] = max(0, _env_int("RESPONSE_CACHE_SIZE", 512))
+    stats["max_bytes"] = max(0, _env_int("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    stats["ttl_seconds"] = max(0, _env_int("RESPONSE_CACHE_TTL_SECONDS", 30))
+    stats["hit_rate"] = round(int(stats["hits"]) / lookups, 4) if lookups else None
+    return stats
+
+
+def _cursor_json_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _cursor_column_value(column: Any, raw: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is date:
+        return date.fromisoformat(str(raw))
+    if python_type is Decimal:
+        return Decimal(str(raw))
+    return python_type(raw)
+
+
+def _list_page(
+    table: str,
+    *,
+    sort: Optional[str],
+    cursor: Optional[str],
+    limit: Optional[int],
+    fields: Optional[str] = None,
+) -> dict[str, Any]:
+    sorts = _LIST_SORTS[table]
+    pk_name, pk = next(iter(sorts.items()))
+    sort_in = str(sort or "").strip() or pk_name
+    descending = sort_in.startswith("-")
+    name = sort_in.lstrip("-").strip()
+    if name not in sorts:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ordenação inválida")
+    column = None if name == pk_name else sorts[name]
+    order = column.collate("C") if column is not None and isinstance(column.type, String) else column
+    sort_key = f"-{name}" if descending else name
+
+    after: Optional[dict[str, Any]] = None
+    if cursor:
+        try:
+            data = json.loads(_b64url_decode(str(cursor).strip()).decode("utf-8"))
+            if not isinstance(data, dict) or data.get("s") != sort_key:
+                raise ValueError("sort")
+            after = {
+                "i": int(data["i"]),
+                "t": int(data["t"]) if data.get("t") is not None else None,
+                "v": _cursor_column_value(column, data["v"]) if column is not None and data.get("v") is not None else None,
+            }
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+    return {
+        "pk": pk,
+        "column": column,
+        "order": order,
+        "descending": descending,
+        "sort": sort_key,
+        "after": after,
+        "limit": limit,
+        "codec": _list_projection(table, fields, required=[c for c in (pk, column) if c is not None]),
+    }
+
+
+def _seek_predicate(page: dict[str, Any], ties: str) -> Any:
+    pk = page["pk"]
+    column = page["order"]
+    descending = bool(page["descending"])
+    value = page["after"]["v"]
+    last_id = page["after"]["i"]
+
+    def _beyond(a: Any, b: Any) -> Any:
+        return a < b if descending else a > b
+
+    if column is None:
+        return _beyond(pk, last_id)
+
+    if value is not None and ties == "after":
+        seek = _beyond(tuple_(column, pk), tuple_(value, last_id))
+        return seek if descending else or_(seek, column.is_(None))
+
+    if value is None:
+        tie = column.is_(None)
+        base = column.is_not(None) if descending else None
+    else:
+        tie = column == value
+        base = _beyond(column, value)
+        if not descending:
+            base = or_(base, column.is_(None))
+
+    if ties == "all":
+        clauses = [c for c in (base, tie) if c is not None]
+    elif ties == "none":
+        clauses = [base] if base is not None else []
+    else:
+        clauses = [c for c in (base, and_(tie, _beyond(pk, last_id))) if c is not None]
+    if not clauses:
+        return false()
+    return or_(*clauses) if len(clauses) > 1 else clauses[0]
+
+
+def _apply_list_page(stmt: Any, page: dict[str, Any], *, tenant_id: Optional[int] = None) -> Any:
+    pk = page["pk"]
+    column = page["order"]
+    descending = bool(page["descending"])
+    order_by = ([column] if column is not None else []) + [pk]
+    stmt = stmt.order_by(*[c.desc() if descending else c.asc() for c in order_by])
+
+    after = page["after"]
+    if after is not None:
+        ties = "after"
+        if tenant_id is not None:
+            if after["t"] is None:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+            if int(tenant_id) != int(after["t"]):
+                ahead = (int(tenant_id) > int(after["t"])) != descending
+                if column is None:
+                    if not ahead:
+                        return None
+                    ties = ""
+                else:
+                    ties = "all" if ahead else "none"
+        if ties:
+            stmt = stmt.where(_seek_predicate(page, ties))
+
+    if page["limit"]:
+        stmt = stmt.limit(int(page["limit"]) + 1)
+    return stmt
+
+
+def _list_cursor(page: dict[str, Any], *, value: Any, pk_value: Any, tenant_id: Optional[int] = None) -> str:
+    data: dict[str, Any] = {"s": page["sort"], "i": int(pk_value)}
+    if tenant_id is not None:
+        data["t"] = int(tenant_id)
+    if page["column"] is not None:
+        data["v"] = _cursor_json_value(value)
+    return _b64url_encode(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def _finish_list_page(response: Response, page: dict[str, Any], rows: list[Any]) -> list[Any]:
+    limit = page["limit"]
+    if not limit or len(rows) <= int(limit):
+        return rows
+    rows = rows[: int(limit)]
+    last = rows[-1]
+    value = getattr(last, page["column"].key) if page["column"] is not None else None
+    response.headers["X-Next-Cursor"] = _list_cursor(page, value=value, pk_value=getattr(last, page["pk"].key))
+    return rows
+
+
+def _row_key(tenant_id: Optional[int], local_id: Any) -> Optional[str]:
+    if not tenant_id or local_id is None:
+        return None
+    return f"{int(tenant_id)}:{int(local_id)}"
+
+
+async def _fan_out_list(
+    response: Response,
+    tenants: list[tuple[int, str, str]],
+    page: dict[str, Any],
+    base_stmt: Callable[[int, str, str], Any],
+) -> Response:
+    column = page["column"]
+    pk_key = page["pk"].key
+
+    async def _query(tdb: AsyncSession, tid: int, slug: str, name: str) -> list[tuple[tuple, int, Any]]:
+        stmt = _apply_list_page(base_stmt(tid, slug, name), page, tenant_id=tid)
+        if stmt is None:
+            return []
+        stream: list[tuple[tuple, int, Any]] = []
+        for r in await tdb.execute(stmt):
+            pk_value = int(getattr(r, pk_key))
+            if column is None:
+                key: tuple = (tid, pk_value)
+            else:
+                value = getattr(r, column.key)
+                key = (value is None, value, tid, pk_value)
+            stream.append((key, tid, r))
+        return stream
+
+    streams, skipped, timed_out = await _fan_out_tenants(tenants, _query)
+    _set_fan_out_headers(response, skipped, timed_out)
+    merged = heapq.merge(*streams, key=lambda e: e[0], reverse=bool(page["descending"]))
+
+    limit = page["limit"]
+    if not limit:
+        return _list_response(response, page, ((tid, r) for _key, tid, r in merged))
+
+    window = list(islice(merged, int(limit) + 1))
+    if len(window) > int(limit):
+        window = window[: int(limit)]
+        key = window[-1][0]
+        if column is None:
+            cursor = _list_cursor(page, value=None, pk_value=key[1], tenant_id=key[0])
+        else:
+            cursor = _list_cursor(page, value=key[1], pk_value=key[3], tenant_id=key[2])
+        response.headers["X-Next-Cursor"] = cursor
+    return _list_response(response, page, ((tid, r) for _key, tid, r in window))
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ExportSink:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.written = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.written += len(chunk)
+        return len(chunk)
+
+    def flush(self) -> None:
+        return None
+
+    def tell(self) -> int:
+        return self.written
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _export_arrow_type(column: Any) -> Any:
+    column_type = column.type
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision, column_type.scale)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _export_select(
+    table: str,
+    codec: dict[str, Any],
+    meta: tuple[int, str, str],
+    *,
+    empresa_column: Any,
+    filters: list[Any],
+) -> Any:
+    tid, slug, name = meta
+    columns = list(codec["columns"])
+    if codec["key_index"] is not None:
+        pk_column = codec["columns"][codec["key_index"]]
+        columns.append((func.concat(f"{int(tid)}:", pk_column) if tid else null()).label("Chave"))
+    stmt = select(*columns).where(*filters).order_by(next(iter(_LIST_SORTS[table].values())))
+    if slug == "executive" and empresa_column is not None and name:
+        stmt = stmt.where(empresa_column == name)
+    return stmt
+
+
+async def _export_csv(
+    fields: list[str],
+    tenants: list[tuple[int, str, str]],
+    select_for: Callable[[tuple[int, str, str]], Any],
+) -> AsyncIterator[bytes]:
+    header = io.StringIO()
+    csv.writer(header, lineterminator="\n").writerow(fields)
+    yield ("\ufeff" + header.getvalue()).encode("utf-8")
+    chunk_bytes = max(1, _env_int("EXPORT_CHUNK_BYTES", 256 * 1024))
+    for meta in tenants:
+        db_name = _tenant_db_name_for_auth(tenant_id=meta[0], tenant_slug=meta[1])
+        async with _tenant_async_sessionmaker(db_name)() as tdb:
+            conn = await tdb.connection()
+            compiled = select_for(meta).compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+            raw = (await conn.get_raw_connection()).driver_connection
+            buf = bytearray()
+            async with raw.cursor() as cur:
+                async with cur.copy(f"copy ({compiled}) to stdout with (format csv)", compiled.params) as copy:
+                    async for data in copy:
+                        buf += data
+                        if len(buf) >= chunk_bytes:
+                            yield bytes(buf)
+                            buf.clear()
+            if buf:
+                yield bytes(buf)
+
+
+async def _export_parquet(
+    fields: list[str],
+    types: list[Any],
+    tenants: list[tuple[int, str, str]],
+    select_for: Callable[[tuple[int, str, str]], Any],
+) -> AsyncIterator[bytes]:
+    schema = pa.schema(list(zip(fields, types)))
+    sink = _ExportSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    batch_rows = max(1, _env_int("EXPORT_BATCH_ROWS", 10000))
+    try:
+        for meta in tenants:
+            db_name = _tenant_db_name_for_auth(tenant_id=meta[0], tenant_slug=meta[1])
+            async with _tenant_async_sessionmaker(db_name)() as tdb:
+                result = await (await tdb.connection()).stream(select_for(meta).execution_options(yield_per=batch_rows))
+                async for rows in result.partitions():
+                    arrays = [pa.array(list(values), type=t) for values, t in zip(zip(*rows), types)]
+                    await run_in_threadpool(writer.write_batch, pa.record_batch(arrays, schema=schema))
+                    yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def _export_response(
+    table: str,
+    *,
+    auth: dict[str, Any],
+    formato: str,
+    fields: Optional[str],
+    tenant_id: Optional[int],
+    empresa: Optional[str] = None,
+    empresa_column: Any = None,
+    filters: Iterable[Any] = (),
+) -> StreamingResponse:
+    formato = str(formato or "").strip().lower()
+    if formato not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Formato inválido")
+    codec = _list_projection(table, fields, required=[])
+    filters = list(filters)
+
+    headers: dict[str, str] = {"Content-Disposition": f'attachment; filename="{table}.{formato}"'}
+    if _is_superadmin(auth) or _is_executive_tenant(auth):
+        empresa_in = empresa.strip() if isinstance(empresa, str) and empresa.strip() else None
+        if _is_executive_tenant(auth) and empresa_in and empresa_in.lower() == "executive":
+            empresa_in = None
+        targets = await _fan_out_tenant_targets(empresa_in)
+        if tenant_id is not None:
+            targets = [meta for meta in targets if meta[0] == int(tenant_id)]
+            if not targets:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant não encontrado")
+        tenants: list[tuple[int, str, str]] = []
+        skipped: list[str] = []
+        for meta in targets:
+            try:
+                await _ensure_tenant_database_ready_async(tenant_id=meta[0], tenant_slug=meta[1])
+                tenants.append(meta)
+            except Exception:
+                skipped.append(_tenant_db_name_for_auth(tenant_id=meta[0], tenant_slug=meta[1]))
+        if skipped:
+            headers["X-Tenants-Skipped"] = ",".join(skipped)
+    else:
+        tid = int(auth.get("tenant_id") or 0)
+        slug = str(auth.get("tenant_slug") or "").strip().lower()
+        await _ensure_tenant_database_ready_async(tenant_id=tid, tenant_slug=slug)
+        tenants = [(tid, slug, "")]
+
+    def _select_for(meta: tuple[int, str, str]) -> Any:
+        return _export_select(table, codec, meta, empresa_column=empresa_column, filters=filters)
+
+    fields_out = list(codec["fields"]) + (["Chave"] if codec["key_index"] is not None else [])
+    if formato == "csv":
+        body = _export_csv(fields_out, tenants, _select_for)
+    else:
+        types = [_export_arrow_type(c) for c in codec["columns"]] + ([pa.string()] if codec["key_index"] is not None else [])
+        body = _export_parquet(fields_out, types, tenants, _select_for)
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[formato], headers=headers)
+
+
 app = FastAPI(title="Executive API", version="0.1.0")
 
 def _cors_origins() -> list[str]:
@@ -1427,60 +2640,129 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Tenants-Skipped", "X-Tenants-Timed-Out", "X-Next-Cursor", "ETag", "Content-Disposition"],
     max_age=0,
 )
 
 
-@app.on_event("startup")
-def _startup_ensure_gestao_interna_tables() -> None:
-    if not DATABASE_URL.startswith("postgresql"):
-        return
+_STARTUP_STATE: dict[str, Any] = {
+    "phase": "starting",
+    "started_at": None,
+    "finished_at": None,
+    "attempts": 0,
+    "last_error": None,
+    "databases": {},
+}
+_STARTUP_STATE_LOCK = threading.Lock()
+
+
+def _set_startup_phase(phase: str) -> None:
+    with _STARTUP_STATE_LOCK:
+        _STARTUP_STATE["phase"] = phase
+        if phase in {"ready", "failed"}:
+            _STARTUP_STATE["finished_at"] = time.time()
+        else:
+            _STARTUP_STATE["finished_at"] = None
+
+
+def _set_startup_database(db_name: str, result: Any) -> None:
+    if result is None:
+        entry = {"status": "pending", "version": None}
+    elif isinstance(result, Exception):
+        entry = {"status": "failed", "version": None}
+    else:
+        entry = {"status": "ready", "version": int(result)}
+    with _STARTUP_STATE_LOCK:
+        _STARTUP_STATE["databases"][db_name] = entry
+
 
+def _prepare_databases_once() -> None:
     max_wait = int(os.getenv("STARTUP_DB_WAIT_SECONDS") or "60")
     deadline = time.time() + max(0, max_wait)
     backoff = 1.0
 
+    _set_startup_phase("waiting_db")
     while True:
         try:
             with engine.connect() as conn:
                 conn.execute(text("select 1"))
-        except OperationalError:
-            if time.time() >= deadline:
-                return
-            time.sleep(backoff)
-            backoff = min(backoff * 1.5, 5.0)
-            continue
+            break
         except Exception:
             if time.time() >= deadline:
-                return
+                raise
             time.sleep(backoff)
             backoff = min(backoff * 1.5, 5.0)
-            continue
 
-        _ensure_gestao_interna_tables_all_databases()
+    _set_startup_phase("migrating")
+    control_db = _sanitize_db_name(_DEFAULT_DATABASE_NAME)
+    try:
+        _set_startup_database(control_db, _migrate_database(db_name=control_db))
+    except Exception as e:
+        _set_startup_database(control_db, e)
+        raise
+
+    _set_startup_phase("seeding")
+    _ensure_default_tenant_executive()
+    _invalidate_tenant_directory()
+    _ensure_default_admin_user()
 
-        ok_exec = _gestao_interna_tables_exist_in_engine(engine_to_use=engine)
-        ok_tenants = True
+    if str(os.getenv("MIGRATE_TENANTS_ON_STARTUP") or "1").strip().lower() not in {"0", "false", "no"}:
+        _set_startup_phase("migrating_tenants")
         try:
-            with SessionLocal() as db:
-                tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-            for t in tenants:
-                slug = str(t.Slug or "").strip().lower()
-                if slug == "executive":
-                    continue
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=slug)
-                tenant_engine = _tenant_engine(db_name=_sanitize_db_name(db_name))
-                if not _gestao_interna_tables_exist_in_engine(engine_to_use=tenant_engine):
-                    ok_tenants = False
+            _migrate_all_databases(include_control=False, progress=_set_startup_database)
         except Exception:
-            ok_tenants = False
+            pass
 
-        if ok_exec and ok_tenants:
-            return
-        if time.time() >= deadline:
+    _set_startup_phase("ready")
+
+
+def _prepare_databases() -> None:
+    max_backoff = max(1, _env_int("STARTUP_RETRY_MAX_SECONDS", 60))
+    backoff = 1.0
+    while True:
+        with _STARTUP_STATE_LOCK:
+            _STARTUP_STATE["attempts"] = int(_STARTUP_STATE["attempts"]) + 1
+        try:
+            _prepare_databases_once()
+            with _STARTUP_STATE_LOCK:
+                _STARTUP_STATE["last_error"] = None
             return
+        except Exception as e:
+            with _STARTUP_STATE_LOCK:
+                _STARTUP_STATE["last_error"] = _error_message(e)
+            _set_startup_phase("failed")
         time.sleep(backoff)
-        backoff = min(backoff * 1.5, 5.0)
+        backoff = min(backoff * 2, float(max_backoff))
+
+
+@app.on_event("startup")
+def _startup_prepare_databases() -> None:
+    global _EVENT_LOOP
+    _EVENT_LOOP = asyncio.get_running_loop()
+    with _STARTUP_STATE_LOCK:
+        _STARTUP_STATE["started_at"] = time.time()
+    if not DATABASE_URL.startswith("postgresql"):
+        _set_startup_phase("ready")
+        return
+    threading.Thread(target=_prepare_databases, name="startup-prepare", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def _shutdown_async_engines() -> None:
+    with _TENANT_ENGINES_LOCK:
+        entries = list(_TENANT_ENGINES.values())
+    for entry in entries:
+        if not entry["pinned"]:
+            await entry["async_engine"].dispose()
+    await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+async def _shutdown_media_client() -> None:
+    for task in list(_MEDIA_CACHE_WARMING.values()):
+        task.cancel()
+    if _MEDIA_CLIENT is not None and _MEDIA_CLIENT_LOOP is asyncio.get_running_loop():
+        await _MEDIA_CLIENT.aclose()
 
 
 @app.get("/health")
@@ -1488,8 +2770,70 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-def _usuario_as_out(row: UsuariosModel) -> UsuarioOut:
-    return UsuarioOut(
+@app.get("/ready")
+def ready(response: Response) -> dict[str, Any]:
+    with _STARTUP_STATE_LOCK:
+        phase = str(_STARTUP_STATE["phase"])
+        started_at = _STARTUP_STATE["started_at"]
+        finished_at = _STARTUP_STATE["finished_at"]
+        attempts = int(_STARTUP_STATE["attempts"])
+        last_error = _STARTUP_STATE["last_error"]
+        databases = [{"database": k, **v} for k, v in sorted(_STARTUP_STATE["databases"].items())]
+
+    if phase != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    elapsed = None
+    if started_at is not None:
+        elapsed = round(float(finished_at or time.time()) - float(started_at), 3)
+    return {
+        "status": "ready" if phase == "ready" else "not_ready",
+        "phase": phase,
+        "elapsed_seconds": elapsed,
+        "latest_version": LATEST_MIGRATION_VERSION,
+        "attempts": attempts,
+        "last_error": last_error,
+        "pending": sum(1 for d in databases if d["status"] == "pending"),
+        "failed": sum(1 for d in databases if d["status"] == "failed"),
+        "databases": databases,
+    }
+
+
+@app.get("/api/monitoring/tenant-pools")
+def monitoring_tenant_pools(auth: dict[str, Any] = Depends(_require_superadmin)) -> dict[str, Any]:
+    evicted = _evict_idle_tenant_engines()
+    pools = _tenant_pool_stats()
+    return {
+        "open_pools": len(pools),
+        "checked_out": sum(int(p["checked_out"]) for p in pools),
+        "evicted": evicted,
+        "max_open": max(1, _env_int("TENANT_POOL_MAX_OPEN", 64)),
+        "idle_seconds": max(0, _env_int("TENANT_POOL_IDLE_SECONDS", 300)),
+        "pools": pools,
+    }
+
+
+@app.get("/api/monitoring/auth-cache")
+def monitoring_auth_cache(auth: dict[str, Any] = Depends(_require_superadmin)) -> dict[str, Any]:
+    return _auth_token_cache_stats()
+
+
+@app.get("/api/monitoring/response-cache")
+def monitoring_response_cache(auth: dict[str, Any] = Depends(_require_superadmin)) -> dict[str, Any]:
+    return _response_cache_stats()
+
+
+@app.get("/api/monitoring/media-client")
+def monitoring_media_client(auth: dict[str, Any] = Depends(_require_superadmin)) -> dict[str, Any]:
+    return _media_client_stats()
+
+
+@app.get("/api/monitoring/media-cache")
+def monitoring_media_cache(auth: dict[str, Any] = Depends(_require_superadmin)) -> dict[str, Any]:
+    return _media_cache_stats()
+
+
+def _usuario_as_out(row: UsuariosModel) -> UsuarioOut:
+    return UsuarioOut(
         IdUsuarios=int(row.IdUsuario),
         Usuario=str(row.Usuario),
         TenantId=int(row.TenantId or 0),
@@ -1505,39 +2849,83 @@ def _usuario_as_out(row: UsuariosModel) -> UsuarioOut:
 
 
 @app.get("/api/usuarios", response_model=list[UsuarioOut])
-def list_usuarios(
+async def list_usuarios(
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     auth: dict[str, Any] = Depends(_require_admin),
-) -> list[UsuarioOut]:
-    stmt = select(UsuariosModel)
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
+    page = _list_page("Usuarios", sort=sort, cursor=cursor, limit=limit, fields=fields)
+    stmt = _list_select(page)
     if _is_superadmin(auth):
         if tenant_id is not None:
             stmt = stmt.where(UsuariosModel.TenantId == int(tenant_id))
     else:
         stmt = stmt.where(UsuariosModel.TenantId == int(auth.get("tenant_id") or 0))
-    rows = db.execute(stmt.order_by(UsuariosModel.IdUsuario.asc())).scalars().all()
-    return [_usuario_as_out(r) for r in rows]
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Usuarios"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(stmt, page))).all()
+    listed = _list_response(response, page, ((None, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Usuarios", _session_db_name(db), listed)
 
 
 @app.get("/api/usuarios/{id_usuario}", response_model=UsuarioOut)
-def get_usuario(
+async def get_usuario(
     id_usuario: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     auth: dict[str, Any] = Depends(_require_admin),
 ) -> UsuarioOut:
-    row = db.get(UsuariosModel, int(id_usuario))
+    version = await _table_version(db, "Usuarios")
+    row = await _get_row(db, "Usuarios", id_usuario)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
     if not _is_superadmin(auth) and int(row.TenantId or 0) != int(auth.get("tenant_id") or 0):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autorizado")
+    not_modified = _not_modified(request, response, auth, version)
+    if not_modified is not None:
+        return not_modified
     return _usuario_as_out(row)
 
 
+def _usuario_by_login_stmt(usuario: str) -> Optional[Any]:
+    usuario_in = str(usuario or "").strip()
+    if not usuario_in:
+        return None
+    return (
+        select(UsuariosModel)
+        .where(func.lower(UsuariosModel.Usuario) == usuario_in.lower())
+        .order_by(
+            (UsuariosModel.Usuario == usuario_in).desc(),
+            (UsuariosModel.Usuario == usuario_in.upper()).desc(),
+            UsuariosModel.IdUsuario.asc(),
+        )
+        .limit(1)
+    )
+
+
+def _usuario_by_login(db: Session, usuario: str) -> Optional[UsuariosModel]:
+    stmt = _usuario_by_login_stmt(usuario)
+    return db.execute(stmt).scalars().first() if stmt is not None else None
+
+
+async def _usuario_by_login_async(db: AsyncSession, usuario: str) -> Optional[UsuariosModel]:
+    stmt = _usuario_by_login_stmt(usuario)
+    return (await db.execute(stmt)).scalars().first() if stmt is not None else None
+
+
 @app.post("/api/usuarios", response_model=UsuarioOut, status_code=status.HTTP_201_CREATED)
-def create_usuario(
+async def create_usuario(
     payload: UsuarioCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     auth: dict[str, Any] = Depends(_require_admin),
 ) -> UsuarioOut:
     username = payload.Usuario.strip()
@@ -1552,7 +2940,7 @@ def create_usuario(
     if not role:
         role = "USER"
 
-    existing = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == username)).scalar_one_or_none()
+    existing = await _usuario_by_login_async(db, username)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuário já existe")
 
@@ -1561,7 +2949,7 @@ def create_usuario(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nome inválido")
 
     salt_hex = os.urandom(16).hex()
-    senha_hash = _pbkdf2_hash_password(payload.Senha, salt_hex)
+    senha_hash = await _hash_password(payload.Senha, salt_hex)
     row = UsuariosModel(
         Usuario=username,
         TenantId=tenant_id,
@@ -1578,22 +2966,23 @@ def create_usuario(
     )
     db.add(row)
     try:
-        db.commit()
+        await db.commit()
+        _invalidate_response_cache("Usuarios", _session_db_name(db))
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar usuário")
-    db.refresh(row)
+    await db.refresh(row)
     return _usuario_as_out(row)
 
 
 @app.put("/api/usuarios/{id_usuario}", response_model=UsuarioOut)
-def update_usuario(
+async def update_usuario(
     id_usuario: int,
     payload: UsuarioUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     auth: dict[str, Any] = Depends(_require_admin),
 ) -> UsuarioOut:
-    row = db.get(UsuariosModel, int(id_usuario))
+    row = await db.get(UsuariosModel, int(id_usuario))
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
     if not _is_superadmin(auth) and int(row.TenantId or 0) != int(auth.get("tenant_id") or 0):
@@ -1635,60 +3024,52 @@ def update_usuario(
     if isinstance(senha, str) and senha.strip():
         salt_hex = os.urandom(16).hex()
         row.SenhaSalt = salt_hex
-        row.SenhaHash = _pbkdf2_hash_password(senha, salt_hex)
+        row.SenhaHash = await _hash_password(senha, salt_hex)
 
     try:
-        db.commit()
+        await db.commit()
+        _invalidate_response_cache("Usuarios", _session_db_name(db))
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar usuário")
-    db.refresh(row)
+    await db.refresh(row)
     return _usuario_as_out(row)
 
 
 @app.delete("/api/usuarios/{id_usuario}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_usuario(
+async def delete_usuario(
     id_usuario: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     auth: dict[str, Any] = Depends(_require_admin),
 ) -> None:
-    row = db.get(UsuariosModel, int(id_usuario))
+    row = await db.get(UsuariosModel, int(id_usuario))
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
     if not _is_superadmin(auth) and int(row.TenantId or 0) != int(auth.get("tenant_id") or 0):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autorizado")
-    db.delete(row)
-    db.commit()
+    await db.delete(row)
+    await db.commit()
+    _invalidate_response_cache("Usuarios", _session_db_name(db))
 
 
 @app.post("/api/login", response_model=LoginOut)
-def login(payload: LoginIn, db: Session = Depends(get_db)) -> LoginOut:
+async def login(payload: LoginIn, db: AsyncSession = Depends(get_db)) -> LoginOut:
     usuario_in = payload.Usuario.strip()
-    user = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == usuario_in)).scalar_one_or_none()
-    if not user:
-        user = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == usuario_in.upper())).scalar_one_or_none()
-    if not user:
-        user = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == usuario_in.lower())).scalar_one_or_none()
+    user = await _usuario_by_login_async(db, usuario_in)
     if not user or int(user.Ativo or 0) != 1:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário inválido")
 
-    senha_hash = _pbkdf2_hash_password(payload.Senha, str(user.SenhaSalt))
-    if not hmac.compare_digest(str(user.SenhaHash), senha_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
-
     username_upper = str(user.Usuario or "").upper()
     is_admin_user = username_upper in {"ADMINISTRADOR", "ADMINISTRATOR"}
     is_superadmin = str(user.Role or "").upper() == "SUPERADMIN"
 
     tenant: Optional[TenantsModel] = None
+    reassign_tenant = False
     if is_admin_user:
-        tenant = db.execute(select(TenantsModel).where(TenantsModel.Slug == "executive")).scalar_one_or_none()
+        tenant = (await db.execute(select(TenantsModel).where(TenantsModel.Slug == "executive"))).scalar_one_or_none()
         if not tenant or not is_superadmin:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autorizado")
-        if int(user.TenantId or 0) != int(tenant.IdTenant):
-            user.TenantId = int(tenant.IdTenant)
-            db.commit()
-            db.refresh(user)
+        reassign_tenant = int(user.TenantId or 0) != int(tenant.IdTenant)
     else:
         tenant_slug_raw = str(payload.TenantSlug or "").strip().lower()
         if not tenant_slug_raw:
@@ -1697,23 +3078,30 @@ def login(payload: LoginIn, db: Session = Depends(get_db)) -> LoginOut:
                 inferred = u.split(".", 1)[1].strip().lower()
                 tenant_slug_raw = inferred
         if tenant_slug_raw:
-            tenant = db.execute(select(TenantsModel).where(TenantsModel.Slug == tenant_slug_raw)).scalar_one_or_none()
+            tenant = (await db.execute(select(TenantsModel).where(TenantsModel.Slug == tenant_slug_raw))).scalar_one_or_none()
             if not tenant:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Tenant inválido")
             if int(user.TenantId) != int(tenant.IdTenant):
-                old_tenant = db.get(TenantsModel, int(user.TenantId))
+                old_tenant = await db.get(TenantsModel, int(user.TenantId))
                 old_slug = str(old_tenant.Slug).strip().lower() if old_tenant else ""
-                if not old_tenant or old_slug == tenant_slug_raw:
-                    user.TenantId = int(tenant.IdTenant)
-                    db.commit()
-                    db.refresh(user)
-                else:
+                if old_tenant and old_slug != tenant_slug_raw:
                     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autorizado")
+                reassign_tenant = True
         else:
-            tenant = db.get(TenantsModel, int(user.TenantId))
+            tenant = await db.get(TenantsModel, int(user.TenantId))
             if not tenant:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Tenant inválido")
 
+    senha_hash = await _hash_password(payload.Senha, str(user.SenhaSalt))
+    if not hmac.compare_digest(str(user.SenhaHash), senha_hash):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
+
+    if reassign_tenant:
+        user.TenantId = int(tenant.IdTenant)
+        await db.commit()
+        _invalidate_response_cache("Usuarios", _session_db_name(db))
+        await db.refresh(user)
+
     exp = time.time() + 60 * 60 * 12
     token = _sign_token(
         {
@@ -1743,189 +3131,204 @@ def login(payload: LoginIn, db: Session = Depends(get_db)) -> LoginOut:
     )
 
 
+def _executivo_as_out(row: ExecutivoModel, tenant_id: Optional[int] = None) -> ExecutivoOut:
+    return ExecutivoOut(
+        IdExecutivo=row.IdExecutivo,
+        Executivo=row.Executivo,
+        Funcao=row.Funcao,
+        Perfil=row.Perfil,
+        Empresa=row.Empresa,
+        TenantId=getattr(row, "TenantId", None),
+        Tenant=getattr(row, "Tenant", None),
+        Chave=_row_key(tenant_id, row.IdExecutivo),
+    )
+
+
+def _apply_stripped(row: Any, payload: BaseModel) -> dict[str, Any]:
+    data: dict[str, Any] = payload.model_dump(exclude_unset=True)
+    for k, v in data.items():
+        if isinstance(v, str):
+            v = v.strip()
+        setattr(row, k, v)
+    return data
+
+
+def _stamp_tenant(row: Any, ctx: dict[str, Any]) -> None:
+    if ctx["tenant_id"] > 0 and (getattr(row, "TenantId", None) is None or int(getattr(row, "TenantId") or 0) == 0):
+        row.TenantId = ctx["tenant_id"]
+    if not getattr(row, "Tenant", None):
+        row.Tenant = ctx["tenant_name"]
+
+
+async def _executivo_new(tdb: AsyncSession, payload: ExecutivoCreate, ctx: dict[str, Any]) -> ExecutivoModel:
+    return ExecutivoModel(
+        Executivo=payload.Executivo.strip(),
+        Funcao=payload.Funcao.strip(),
+        Perfil=payload.Perfil.strip(),
+        Empresa=payload.Empresa.strip(),
+        TenantId=ctx["tenant_id"] if ctx["tenant_id"] > 0 else None,
+        Tenant=ctx["tenant_name"],
+    )
+
+
+async def _executivo_apply(tdb: AsyncSession, row: ExecutivoModel, payload: ExecutivoUpdate, ctx: dict[str, Any]) -> None:
+    data: dict[str, Any] = payload.model_dump(exclude_unset=True)
+    for k, v in data.items():
+        if v is None:
+            continue
+        setattr(row, k, v.strip() if isinstance(v, str) else v)
+
+    _stamp_tenant(row, ctx)
+
+
 @app.get("/api/executivos", response_model=list[ExecutivoOut])
-def list_executivos(
+async def list_executivos(
+    request: Request,
+    response: Response,
     empresa: Optional[str] = None,
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[ExecutivoOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     empresa_in = empresa.strip() if isinstance(empresa, str) and empresa.strip() else None
     if _is_executive_tenant(auth) and empresa_in and empresa_in.strip().lower() == "executive":
         empresa_in = None
+    page = _list_page("Executivos", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        stmt_tenants = select(TenantsModel)
-        if empresa_in:
-            stmt_tenants = stmt_tenants.where(or_(TenantsModel.Tenant == empresa_in, TenantsModel.Slug == empresa_in.lower()))
-        tenants = db.execute(stmt_tenants.order_by(TenantsModel.IdTenant.asc())).scalars().all()
-
-        out: list[ExecutivoOut] = []
-        for t in tenants:
-            _ensure_tenant_columns_for_auth(tenant_id=int(t.IdTenant), tenant_slug=str(t.Slug or ""))
-            if str(t.Slug or "").lower() == "executive":
-                stmt = select(ExecutivoModel).where(ExecutivoModel.Empresa == str(t.Tenant)).order_by(ExecutivoModel.IdExecutivo.asc())
-                rows = db.execute(stmt).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    stmt = select(ExecutivoModel).order_by(ExecutivoModel.IdExecutivo.asc())
-                    rows = tdb.execute(stmt).scalars().all()
-            out.extend(
-                [
-                    ExecutivoOut(
-                        IdExecutivo=r.IdExecutivo,
-                        Executivo=r.Executivo,
-                        Funcao=r.Funcao,
-                        Perfil=r.Perfil,
-                        Empresa=r.Empresa,
-                        TenantId=getattr(r, "TenantId", None),
-                        Tenant=getattr(r, "Tenant", None),
-                    )
-                    for r in rows
-                ]
-            )
+        tenants = await _fan_out_tenant_targets(empresa_in)
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "Executivos"))
+        if cached is not None:
+            return cached
 
-        out.sort(key=lambda r: (str(r.Empresa or ""), int(r.IdExecutivo or 0)))
-        return out
-
-    stmt = select(ExecutivoModel).order_by(ExecutivoModel.IdExecutivo.asc())
-    rows = db.execute(stmt).scalars().all()
-    return [
-        ExecutivoOut(
-            IdExecutivo=r.IdExecutivo,
-            Executivo=r.Executivo,
-            Funcao=r.Funcao,
-            Perfil=r.Perfil,
-            Empresa=r.Empresa,
-            TenantId=getattr(r, "TenantId", None),
-            Tenant=getattr(r, "Tenant", None),
-        )
-        for r in rows
-    ]
+        def _stmt(tid: int, slug: str, name: str) -> Any:
+            stmt = _list_select(page)
+            if slug == "executive":
+                stmt = stmt.where(ExecutivoModel.Empresa == name)
+            return stmt
+
+        return _response_cache_store(ticket, "Executivos", "*", await _fan_out_list(response, tenants, page, _stmt))
+
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Executivos"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    tid = int(auth.get("tenant_id") or 0)
+    listed = _list_response(response, page, ((tid, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Executivos", _session_db_name(db), listed)
+
+
+@app.get("/api/executivos/export")
+async def export_executivos(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "Executivos",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+        empresa=empresa,
+        empresa_column=ExecutivoModel.Empresa,
+    )
 
 
 @app.get("/api/executivos/{id_executivo}", response_model=ExecutivoOut)
-def get_executivo(
+async def get_executivo(
     id_executivo: int,
-    db: Session = Depends(get_tenant_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ExecutivoOut:
-    row = db.get(ExecutivoModel, id_executivo)
+    not_modified = _not_modified(request, response, auth, await _table_version(db, "Executivos"))
+    if not_modified is not None:
+        return not_modified
+    row = await _get_row(db, "Executivos", id_executivo)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Executivo não encontrado")
-    return ExecutivoOut(
-        IdExecutivo=row.IdExecutivo,
-        Executivo=row.Executivo,
-        Funcao=row.Funcao,
-        Perfil=row.Perfil,
-        Empresa=row.Empresa,
-        TenantId=getattr(row, "TenantId", None),
-        Tenant=getattr(row, "Tenant", None),
-    )
+    return _executivo_as_out(row)
 
 
 @app.post("/api/executivos", response_model=ExecutivoOut, status_code=status.HTTP_201_CREATED)
-def create_executivo(
+async def create_executivo(
     payload: ExecutivoCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ExecutivoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = ExecutivoModel(
-            Executivo=payload.Executivo.strip(),
-            Funcao=payload.Funcao.strip(),
-            Perfil=payload.Perfil.strip(),
-            Empresa=payload.Empresa.strip(),
-            TenantId=target_tenant_id if target_tenant_id > 0 else None,
-            Tenant=tenant_name,
-        )
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _executivo_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Executivos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar executivo")
-        tdb.refresh(row)
-    return ExecutivoOut(
-        IdExecutivo=row.IdExecutivo,
-        Executivo=row.Executivo,
-        Funcao=row.Funcao,
-        Perfil=row.Perfil,
-        Empresa=row.Empresa,
-        TenantId=getattr(row, "TenantId", None),
-        Tenant=getattr(row, "Tenant", None),
-    )
+        await tdb.refresh(row)
+    return _executivo_as_out(row)
 
 
 @app.put("/api/executivos/{id_executivo}", response_model=ExecutivoOut)
-def update_executivo(
+async def update_executivo(
     id_executivo: int,
     payload: ExecutivoUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ExecutivoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ExecutivoModel, id_executivo)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ExecutivoModel, id_executivo)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Executivo não encontrado")
-
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if v is None:
-                continue
-            setattr(row, k, v.strip() if isinstance(v, str) else v)
-
-        if target_tenant_id > 0 and (getattr(row, "TenantId", None) is None or int(getattr(row, "TenantId") or 0) == 0):
-            row.TenantId = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
+        await _executivo_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
 
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Executivos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar executivo")
-        tdb.refresh(row)
-    return ExecutivoOut(
-        IdExecutivo=row.IdExecutivo,
-        Executivo=row.Executivo,
-        Funcao=row.Funcao,
-        Perfil=row.Perfil,
-        Empresa=row.Empresa,
-        TenantId=getattr(row, "TenantId", None),
-        Tenant=getattr(row, "Tenant", None),
-    )
+        await tdb.refresh(row)
+    return _executivo_as_out(row)
 
 
 @app.delete("/api/executivos/{id_executivo}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_executivo(
+async def delete_executivo(
     id_executivo: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ExecutivoModel, id_executivo)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ExecutivoModel, id_executivo)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Executivo não encontrado")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("Executivos", _session_db_name(tdb))
 
 
-def _ativo_as_out(row: AtivoModel) -> AtivoOut:
+def _ativo_as_out(row: AtivoModel, tenant_id: Optional[int] = None) -> AtivoOut:
     return AtivoOut(
         IdAtivo=row.IdAtivo,
         Ativo=row.Ativo,
@@ -1940,150 +3343,180 @@ def _ativo_as_out(row: AtivoModel) -> AtivoOut:
         Empresa=row.Empresa,
         TenantId=getattr(row, "TenantId", None),
         Tenant=getattr(row, "Tenant", None),
+        Chave=_row_key(tenant_id, row.IdAtivo),
     )
 
 
+async def _ativo_new(tdb: AsyncSession, payload: AtivoCreate, ctx: dict[str, Any]) -> AtivoModel:
+    return AtivoModel(
+        Ativo=payload.Ativo.strip(),
+        CodigoInternoAtivo=payload.CodigoInternoAtivo.strip() if isinstance(payload.CodigoInternoAtivo, str) else None,
+        Placa=payload.Placa.strip() if isinstance(payload.Placa, str) else None,
+        Cidade=payload.Cidade.strip() if isinstance(payload.Cidade, str) else None,
+        UF=payload.UF.strip() if isinstance(payload.UF, str) else None,
+        CentroCusto=payload.CentroCusto.strip() if isinstance(payload.CentroCusto, str) else None,
+        Proprietario=payload.Proprietario.strip() if isinstance(payload.Proprietario, str) else None,
+        Responsavel=payload.Responsavel.strip() if isinstance(payload.Responsavel, str) else None,
+        Atribuido=payload.Atribuido.strip() if isinstance(payload.Atribuido, str) else None,
+        Empresa=payload.Empresa.strip(),
+        TenantId=ctx["tenant_id"] if ctx["tenant_id"] > 0 else None,
+        Tenant=ctx["tenant_name"],
+    )
+
+
+async def _ativo_apply(tdb: AsyncSession, row: AtivoModel, payload: AtivoUpdate, ctx: dict[str, Any]) -> None:
+    _apply_stripped(row, payload)
+    _stamp_tenant(row, ctx)
+
+
 @app.get("/api/ativos", response_model=list[AtivoOut])
-def list_ativos(
+async def list_ativos(
+    request: Request,
+    response: Response,
     empresa: Optional[str] = None,
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[AtivoOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     empresa_in = empresa.strip() if isinstance(empresa, str) and empresa.strip() else None
     if _is_executive_tenant(auth) and empresa_in and empresa_in.strip().lower() == "executive":
         empresa_in = None
+    page = _list_page("Ativos", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        stmt_tenants = select(TenantsModel)
-        if empresa_in:
-            stmt_tenants = stmt_tenants.where(or_(TenantsModel.Tenant == empresa_in, TenantsModel.Slug == empresa_in.lower()))
-        tenants = db.execute(stmt_tenants.order_by(TenantsModel.IdTenant.asc())).scalars().all()
-
-        out: list[AtivoOut] = []
-        for t in tenants:
-            _ensure_tenant_columns_for_auth(tenant_id=int(t.IdTenant), tenant_slug=str(t.Slug or ""))
-            if str(t.Slug or "").lower() == "executive":
-                stmt = select(AtivoModel).where(AtivoModel.Empresa == str(t.Tenant)).order_by(AtivoModel.IdAtivo.asc())
-                rows = db.execute(stmt).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    stmt = select(AtivoModel).order_by(AtivoModel.IdAtivo.asc())
-                    rows = tdb.execute(stmt).scalars().all()
-            out.extend([_ativo_as_out(r) for r in rows])
+        tenants = await _fan_out_tenant_targets(empresa_in)
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "Ativos"))
+        if cached is not None:
+            return cached
+
+        def _stmt(tid: int, slug: str, name: str) -> Any:
+            stmt = _list_select(page)
+            if slug == "executive":
+                stmt = stmt.where(AtivoModel.Empresa == name)
+            return stmt
 
-        out.sort(key=lambda r: (str(r.Empresa or ""), int(r.IdAtivo or 0)))
-        return out
+        return _response_cache_store(ticket, "Ativos", "*", await _fan_out_list(response, tenants, page, _stmt))
 
-    stmt = select(AtivoModel).order_by(AtivoModel.IdAtivo.asc())
-    rows = db.execute(stmt).scalars().all()
-    return [_ativo_as_out(r) for r in rows]
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Ativos"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    tid = int(auth.get("tenant_id") or 0)
+    listed = _list_response(response, page, ((tid, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Ativos", _session_db_name(db), listed)
+
+
+@app.get("/api/ativos/export")
+async def export_ativos(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "Ativos",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+        empresa=empresa,
+        empresa_column=AtivoModel.Empresa,
+    )
 
 
 @app.get("/api/ativos/{id_ativo}", response_model=AtivoOut)
-def get_ativo(
+async def get_ativo(
     id_ativo: int,
-    db: Session = Depends(get_tenant_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> AtivoOut:
-    row = db.get(AtivoModel, id_ativo)
+    not_modified = _not_modified(request, response, auth, await _table_version(db, "Ativos"))
+    if not_modified is not None:
+        return not_modified
+    row = await _get_row(db, "Ativos", id_ativo)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ativo não encontrado")
     return _ativo_as_out(row)
 
 
 @app.post("/api/ativos", response_model=AtivoOut, status_code=status.HTTP_201_CREATED)
-def create_ativo(
+async def create_ativo(
     payload: AtivoCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> AtivoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = AtivoModel(
-            Ativo=payload.Ativo.strip(),
-            CodigoInternoAtivo=payload.CodigoInternoAtivo.strip() if isinstance(payload.CodigoInternoAtivo, str) else None,
-            Placa=payload.Placa.strip() if isinstance(payload.Placa, str) else None,
-            Cidade=payload.Cidade.strip() if isinstance(payload.Cidade, str) else None,
-            UF=payload.UF.strip() if isinstance(payload.UF, str) else None,
-            CentroCusto=payload.CentroCusto.strip() if isinstance(payload.CentroCusto, str) else None,
-            Proprietario=payload.Proprietario.strip() if isinstance(payload.Proprietario, str) else None,
-            Responsavel=payload.Responsavel.strip() if isinstance(payload.Responsavel, str) else None,
-            Atribuido=payload.Atribuido.strip() if isinstance(payload.Atribuido, str) else None,
-            Empresa=payload.Empresa.strip(),
-            TenantId=target_tenant_id if target_tenant_id > 0 else None,
-            Tenant=tenant_name,
-        )
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _ativo_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Ativos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar ativo")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _ativo_as_out(row)
 
 
 @app.put("/api/ativos/{id_ativo}", response_model=AtivoOut)
-def update_ativo(
+async def update_ativo(
     id_ativo: int,
     payload: AtivoUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> AtivoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(AtivoModel, id_ativo)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(AtivoModel, id_ativo)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ativo não encontrado")
-
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if isinstance(v, str):
-                v = v.strip()
-            setattr(row, k, v)
-
-        if target_tenant_id > 0 and (getattr(row, "TenantId", None) is None or int(getattr(row, "TenantId") or 0) == 0):
-            row.TenantId = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
+        await _ativo_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
 
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Ativos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar ativo")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _ativo_as_out(row)
 
 
 @app.delete("/api/ativos/{id_ativo}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_ativo(
+async def delete_ativo(
     id_ativo: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(AtivoModel, id_ativo)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(AtivoModel, id_ativo)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ativo não encontrado")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("Ativos", _session_db_name(tdb))
 
 
-def _centro_custos_as_out(row: CentroCustosModel) -> CentroCustosOut:
+def _centro_custos_as_out(row: CentroCustosModel, tenant_id: Optional[int] = None) -> CentroCustosOut:
     return CentroCustosOut(
         IdCustos=row.IdCustos,
         CodigoInterno=row.CodigoInterno,
@@ -2096,152 +3529,178 @@ def _centro_custos_as_out(row: CentroCustosModel) -> CentroCustosOut:
         Responsavel=row.Responsavel,
         TenantId=getattr(row, "TenantId", None),
         Tenant=getattr(row, "Tenant", None),
+        Chave=_row_key(tenant_id, row.IdCustos),
+    )
+
+
+async def _centro_custos_new(tdb: AsyncSession, payload: CentroCustosCreate, ctx: dict[str, Any]) -> CentroCustosModel:
+    return CentroCustosModel(
+        CodigoInterno=payload.CodigoInterno.strip() if isinstance(payload.CodigoInterno, str) else None,
+        Classe=payload.Classe.strip() if isinstance(payload.Classe, str) else None,
+        Nome=payload.Nome.strip(),
+        Cidade=payload.Cidade.strip() if isinstance(payload.Cidade, str) else None,
+        UF=payload.UF.strip() if isinstance(payload.UF, str) else None,
+        Empresa=payload.Empresa.strip(),
+        Departamento=payload.Departamento.strip() if isinstance(payload.Departamento, str) else None,
+        Responsavel=payload.Responsavel.strip() if isinstance(payload.Responsavel, str) else None,
+        TenantId=ctx["tenant_id"] if ctx["tenant_id"] > 0 else None,
+        Tenant=ctx["tenant_name"],
     )
 
 
+async def _centro_custos_apply(tdb: AsyncSession, row: CentroCustosModel, payload: CentroCustosUpdate, ctx: dict[str, Any]) -> None:
+    _apply_stripped(row, payload)
+    _stamp_tenant(row, ctx)
+
+
 @app.get("/api/centro-custos", response_model=list[CentroCustosOut])
-def list_centro_custos(
+async def list_centro_custos(
+    request: Request,
+    response: Response,
     empresa: Optional[str] = None,
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[CentroCustosOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     empresa_in = empresa.strip() if isinstance(empresa, str) and empresa.strip() else None
     if _is_executive_tenant(auth) and empresa_in and empresa_in.strip().lower() == "executive":
         empresa_in = None
+    page = _list_page("CentroCustos", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        stmt_tenants = select(TenantsModel)
-        if empresa_in:
-            stmt_tenants = stmt_tenants.where(or_(TenantsModel.Tenant == empresa_in, TenantsModel.Slug == empresa_in.lower()))
-        tenants = db.execute(stmt_tenants.order_by(TenantsModel.IdTenant.asc())).scalars().all()
-
-        out: list[CentroCustosOut] = []
-        for t in tenants:
-            _ensure_tenant_columns_for_auth(tenant_id=int(t.IdTenant), tenant_slug=str(t.Slug or ""))
-            if str(t.Slug or "").lower() == "executive":
-                stmt = (
-                    select(CentroCustosModel)
-                    .where(CentroCustosModel.Empresa == str(t.Tenant))
-                    .order_by(CentroCustosModel.IdCustos.asc())
-                )
-                rows = db.execute(stmt).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    stmt = select(CentroCustosModel).order_by(CentroCustosModel.IdCustos.asc())
-                    rows = tdb.execute(stmt).scalars().all()
-            out.extend([_centro_custos_as_out(r) for r in rows])
+        tenants = await _fan_out_tenant_targets(empresa_in)
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "CentroCustos"))
+        if cached is not None:
+            return cached
+
+        def _stmt(tid: int, slug: str, name: str) -> Any:
+            stmt = _list_select(page)
+            if slug == "executive":
+                stmt = stmt.where(CentroCustosModel.Empresa == name)
+            return stmt
+
+        return _response_cache_store(ticket, "CentroCustos", "*", await _fan_out_list(response, tenants, page, _stmt))
 
-        out.sort(key=lambda r: (str(r.Empresa or ""), int(r.IdCustos or 0)))
-        return out
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "CentroCustos"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    tid = int(auth.get("tenant_id") or 0)
+    listed = _list_response(response, page, ((tid, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "CentroCustos", _session_db_name(db), listed)
 
-    stmt = select(CentroCustosModel).order_by(CentroCustosModel.IdCustos.asc())
-    rows = db.execute(stmt).scalars().all()
-    return [_centro_custos_as_out(r) for r in rows]
+
+@app.get("/api/centro-custos/export")
+async def export_centro_custos(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "CentroCustos",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+        empresa=empresa,
+        empresa_column=CentroCustosModel.Empresa,
+    )
 
 
 @app.get("/api/centro-custos/{id_custos}", response_model=CentroCustosOut)
-def get_centro_custos(
+async def get_centro_custos(
     id_custos: int,
-    db: Session = Depends(get_tenant_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> CentroCustosOut:
-    row = db.get(CentroCustosModel, id_custos)
+    not_modified = _not_modified(request, response, auth, await _table_version(db, "CentroCustos"))
+    if not_modified is not None:
+        return not_modified
+    row = await _get_row(db, "CentroCustos", id_custos)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Centro de custos não encontrado")
     return _centro_custos_as_out(row)
 
 
 @app.post("/api/centro-custos", response_model=CentroCustosOut, status_code=status.HTTP_201_CREATED)
-def create_centro_custos(
+async def create_centro_custos(
     payload: CentroCustosCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> CentroCustosOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = CentroCustosModel(
-            CodigoInterno=payload.CodigoInterno.strip() if isinstance(payload.CodigoInterno, str) else None,
-            Classe=payload.Classe.strip() if isinstance(payload.Classe, str) else None,
-            Nome=payload.Nome.strip(),
-            Cidade=payload.Cidade.strip() if isinstance(payload.Cidade, str) else None,
-            UF=payload.UF.strip() if isinstance(payload.UF, str) else None,
-            Empresa=payload.Empresa.strip(),
-            Departamento=payload.Departamento.strip() if isinstance(payload.Departamento, str) else None,
-            Responsavel=payload.Responsavel.strip() if isinstance(payload.Responsavel, str) else None,
-            TenantId=target_tenant_id if target_tenant_id > 0 else None,
-            Tenant=tenant_name,
-        )
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _centro_custos_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("CentroCustos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar centro de custos")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _centro_custos_as_out(row)
 
 
 @app.put("/api/centro-custos/{id_custos}", response_model=CentroCustosOut)
-def update_centro_custos(
+async def update_centro_custos(
     id_custos: int,
     payload: CentroCustosUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> CentroCustosOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(CentroCustosModel, id_custos)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(CentroCustosModel, id_custos)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Centro de custos não encontrado")
-
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if isinstance(v, str):
-                v = v.strip()
-            setattr(row, k, v)
-
-        if target_tenant_id > 0 and (getattr(row, "TenantId", None) is None or int(getattr(row, "TenantId") or 0) == 0):
-            row.TenantId = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
+        await _centro_custos_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
 
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("CentroCustos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar centro de custos")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _centro_custos_as_out(row)
 
 
 @app.delete("/api/centro-custos/{id_custos}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_centro_custos(
+async def delete_centro_custos(
     id_custos: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(CentroCustosModel, id_custos)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(CentroCustosModel, id_custos)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Centro de custos não encontrado")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("CentroCustos", _session_db_name(tdb))
 
 
-def _departamento_as_out(row: DepartamentoModel) -> DepartamentoOut:
+def _departamento_as_out(row: DepartamentoModel, tenant_id: Optional[int] = None) -> DepartamentoOut:
     return DepartamentoOut(
         IdDepartamento=row.IdDepartamento,
         Departamento=row.Departamento,
@@ -2250,10 +3709,11 @@ def _departamento_as_out(row: DepartamentoModel) -> DepartamentoOut:
         Tenant=getattr(row, "Tenant", None),
         DataCadastro=getattr(row, "DataCadastro", None),
         Cadastrante=getattr(row, "Cadastrante", None),
+        Chave=_row_key(tenant_id, row.IdDepartamento),
     )
 
 
-def _funcao_as_out(row: FuncaoModel) -> FuncaoOut:
+def _funcao_as_out(row: FuncaoModel, tenant_id: Optional[int] = None) -> FuncaoOut:
     return FuncaoOut(
         IdFuncao=row.IdFuncao,
         Funcao=row.Funcao,
@@ -2263,10 +3723,11 @@ def _funcao_as_out(row: FuncaoModel) -> FuncaoOut:
         Tenant=getattr(row, "Tenant", None),
         DataCadastro=getattr(row, "DataCadastro", None),
         Cadastrante=getattr(row, "Cadastrante", None),
+        Chave=_row_key(tenant_id, row.IdFuncao),
     )
 
 
-def _colaborador_as_out(row: ColaboradorModel) -> ColaboradorOut:
+def _colaborador_as_out(row: ColaboradorModel, tenant_id: Optional[int] = None) -> ColaboradorOut:
     return ColaboradorOut(
         IdColaborador=row.IdColaborador,
         Colaborador=row.Colaborador,
@@ -2276,423 +3737,526 @@ def _colaborador_as_out(row: ColaboradorModel) -> ColaboradorOut:
         Tenant=getattr(row, "Tenant", None),
         DataCadastro=getattr(row, "DataCadastro", None),
         Cadastrante=getattr(row, "Cadastrante", None),
+        Chave=_row_key(tenant_id, row.IdColaborador),
+    )
+
+
+async def _departamento_new(tdb: AsyncSession, payload: DepartamentoCreate, ctx: dict[str, Any]) -> DepartamentoModel:
+    return DepartamentoModel(
+        Departamento=payload.Departamento.strip(),
+        Descricao=payload.Descricao.strip() if isinstance(payload.Descricao, str) else None,
+        IdTenant=ctx["tenant_id"] if ctx["tenant_id"] > 0 else None,
+        Tenant=ctx["tenant_name"],
+        DataCadastro=date.today(),
+        Cadastrante=ctx["cadastrante"],
     )
 
 
+async def _departamento_apply(tdb: AsyncSession, row: DepartamentoModel, payload: DepartamentoUpdate, ctx: dict[str, Any]) -> None:
+    _apply_stripped(row, payload)
+    if getattr(row, "IdTenant", None) is None and ctx["tenant_id"] > 0:
+        row.IdTenant = ctx["tenant_id"]
+    if not getattr(row, "Tenant", None):
+        row.Tenant = ctx["tenant_name"]
+
+
 @app.get("/api/departamentos", response_model=list[DepartamentoOut])
-def list_departamentos(
+async def list_departamentos(
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[DepartamentoOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     auth_tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
-    _ensure_gestao_interna_tables_for_auth(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    await _ensure_tenant_database_ready_async(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    page = _list_page("Departamentos", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if (_is_superadmin(auth) or _is_executive_tenant(auth)) and tenant_id is not None:
-        with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-            rows = tdb.execute(select(DepartamentoModel).order_by(DepartamentoModel.IdDepartamento.asc())).scalars().all()
-            return [_departamento_as_out(r) for r in rows]
+        async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+            cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(tdb, "Departamentos"))
+            if cached is not None:
+                return cached
+            rows = (await tdb.execute(_apply_list_page(_list_select(page), page))).all()
+            listed = _list_response(response, page, ((int(tenant_id), r) for r in _finish_list_page(response, page, rows)))
+            return _response_cache_store(ticket, "Departamentos", _session_db_name(tdb), listed)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-        out: list[DepartamentoOut] = []
-        for t in tenants:
-            slug = str(t.Slug or "").strip().lower()
-            _ensure_gestao_interna_tables_for_auth(tenant_id=int(t.IdTenant), tenant_slug=slug)
-            if slug == "executive":
-                rows = db.execute(select(DepartamentoModel).order_by(DepartamentoModel.IdDepartamento.asc())).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=slug)
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    rows = tdb.execute(select(DepartamentoModel).order_by(DepartamentoModel.IdDepartamento.asc())).scalars().all()
-            out.extend([_departamento_as_out(r) for r in rows])
-        out.sort(key=lambda r: (str(r.Tenant or ""), int(r.IdDepartamento or 0)))
-        return out
-
-    rows = db.execute(select(DepartamentoModel).order_by(DepartamentoModel.IdDepartamento.asc())).scalars().all()
-    return [_departamento_as_out(r) for r in rows]
+        tenants = await _fan_out_tenant_targets()
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "Departamentos"))
+        if cached is not None:
+            return cached
+        return _response_cache_store(ticket, "Departamentos", "*", await _fan_out_list(response, tenants, page, lambda tid, slug, name: _list_select(page)))
+
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Departamentos"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    listed = _list_response(response, page, ((auth_tenant_id, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Departamentos", _session_db_name(db), listed)
+
+
+@app.get("/api/departamentos/export")
+async def export_departamentos(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "Departamentos",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+    )
 
 
 @app.get("/api/departamentos/{id_departamento}", response_model=DepartamentoOut)
-def get_departamento(
+async def get_departamento(
     id_departamento: int,
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> DepartamentoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     auth_tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
-    _ensure_gestao_interna_tables_for_auth(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(DepartamentoModel, id_departamento)
+    await _ensure_tenant_database_ready_async(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        not_modified = _not_modified(request, response, auth, await _table_version(tdb, "Departamentos"))
+        if not_modified is not None:
+            return not_modified
+        row = await _get_row(tdb, "Departamentos", id_departamento)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Departamento não encontrado")
         return _departamento_as_out(row)
 
 
 @app.post("/api/departamentos", response_model=DepartamentoOut, status_code=status.HTTP_201_CREATED)
-def create_departamento(
+async def create_departamento(
     payload: DepartamentoCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> DepartamentoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
     tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or tenant_slug or None
-    _ensure_gestao_interna_tables_for_auth(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = DepartamentoModel(
-            Departamento=payload.Departamento.strip(),
-            Descricao=payload.Descricao.strip() if isinstance(payload.Descricao, str) else None,
-            IdTenant=target_tenant_id if target_tenant_id > 0 else None,
-            Tenant=tenant_name,
-            DataCadastro=date.today(),
-            Cadastrante=str(auth.get("nome") or auth.get("usuario") or "").strip() or None,
-        )
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _departamento_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name, "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Departamentos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar departamento")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _departamento_as_out(row)
 
 
 @app.put("/api/departamentos/{id_departamento}", response_model=DepartamentoOut)
-def update_departamento(
+async def update_departamento(
     id_departamento: int,
     payload: DepartamentoUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> DepartamentoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
     tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or tenant_slug or None
-    _ensure_gestao_interna_tables_for_auth(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(DepartamentoModel, id_departamento)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(DepartamentoModel, id_departamento)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Departamento não encontrado")
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if isinstance(v, str):
-                v = v.strip()
-            setattr(row, k, v)
-        if getattr(row, "IdTenant", None) is None and target_tenant_id > 0:
-            row.IdTenant = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
+        await _departamento_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name, "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None})
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Departamentos", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar departamento")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _departamento_as_out(row)
 
 
 @app.delete("/api/departamentos/{id_departamento}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_departamento(
+async def delete_departamento(
     id_departamento: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(DepartamentoModel, id_departamento)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(DepartamentoModel, id_departamento)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Departamento não encontrado")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("Departamentos", _session_db_name(tdb))
+
+
+async def _funcao_new(tdb: AsyncSession, payload: FuncaoCreate, ctx: dict[str, Any]) -> FuncaoModel:
+    return FuncaoModel(
+        Funcao=payload.Funcao.strip(),
+        Descricao=payload.Descricao.strip() if isinstance(payload.Descricao, str) else None,
+        Departamento=payload.Departamento.strip(),
+        IdTenant=ctx["tenant_id"] if ctx["tenant_id"] > 0 else None,
+        Tenant=ctx["tenant_name"],
+        DataCadastro=date.today(),
+        Cadastrante=ctx["cadastrante"],
+    )
+
+
+async def _funcao_apply(tdb: AsyncSession, row: FuncaoModel, payload: FuncaoUpdate, ctx: dict[str, Any]) -> None:
+    _apply_stripped(row, payload)
+    if getattr(row, "IdTenant", None) is None and ctx["tenant_id"] > 0:
+        row.IdTenant = ctx["tenant_id"]
+    if not getattr(row, "Tenant", None):
+        row.Tenant = ctx["tenant_name"]
 
 
 @app.get("/api/funcoes", response_model=list[FuncaoOut])
-def list_funcoes(
+async def list_funcoes(
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[FuncaoOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     auth_tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
-    _ensure_gestao_interna_tables_for_auth(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    await _ensure_tenant_database_ready_async(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    page = _list_page("Funcoes", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if (_is_superadmin(auth) or _is_executive_tenant(auth)) and tenant_id is not None:
-        with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-            rows = tdb.execute(select(FuncaoModel).order_by(FuncaoModel.IdFuncao.asc())).scalars().all()
-            return [_funcao_as_out(r) for r in rows]
+        async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+            cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(tdb, "Funcoes"))
+            if cached is not None:
+                return cached
+            rows = (await tdb.execute(_apply_list_page(_list_select(page), page))).all()
+            listed = _list_response(response, page, ((int(tenant_id), r) for r in _finish_list_page(response, page, rows)))
+            return _response_cache_store(ticket, "Funcoes", _session_db_name(tdb), listed)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-        out: list[FuncaoOut] = []
-        for t in tenants:
-            slug = str(t.Slug or "").strip().lower()
-            _ensure_gestao_interna_tables_for_auth(tenant_id=int(t.IdTenant), tenant_slug=slug)
-            if slug == "executive":
-                rows = db.execute(select(FuncaoModel).order_by(FuncaoModel.IdFuncao.asc())).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=slug)
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    rows = tdb.execute(select(FuncaoModel).order_by(FuncaoModel.IdFuncao.asc())).scalars().all()
-            out.extend([_funcao_as_out(r) for r in rows])
-        out.sort(key=lambda r: (str(r.Tenant or ""), int(r.IdFuncao or 0)))
-        return out
-
-    rows = db.execute(select(FuncaoModel).order_by(FuncaoModel.IdFuncao.asc())).scalars().all()
-    return [_funcao_as_out(r) for r in rows]
+        tenants = await _fan_out_tenant_targets()
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "Funcoes"))
+        if cached is not None:
+            return cached
+        return _response_cache_store(ticket, "Funcoes", "*", await _fan_out_list(response, tenants, page, lambda tid, slug, name: _list_select(page)))
+
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Funcoes"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    listed = _list_response(response, page, ((auth_tenant_id, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Funcoes", _session_db_name(db), listed)
+
+
+@app.get("/api/funcoes/export")
+async def export_funcoes(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "Funcoes",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+    )
 
 
 @app.get("/api/funcoes/{id_funcao}", response_model=FuncaoOut)
-def get_funcao(
+async def get_funcao(
     id_funcao: int,
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> FuncaoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     auth_tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
-    _ensure_gestao_interna_tables_for_auth(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(FuncaoModel, id_funcao)
+    await _ensure_tenant_database_ready_async(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        not_modified = _not_modified(request, response, auth, await _table_version(tdb, "Funcoes"))
+        if not_modified is not None:
+            return not_modified
+        row = await _get_row(tdb, "Funcoes", id_funcao)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Função não encontrada")
         return _funcao_as_out(row)
 
 
 @app.post("/api/funcoes", response_model=FuncaoOut, status_code=status.HTTP_201_CREATED)
-def create_funcao(
+async def create_funcao(
     payload: FuncaoCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> FuncaoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
     tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or tenant_slug or None
-    _ensure_gestao_interna_tables_for_auth(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = FuncaoModel(
-            Funcao=payload.Funcao.strip(),
-            Descricao=payload.Descricao.strip() if isinstance(payload.Descricao, str) else None,
-            Departamento=payload.Departamento.strip(),
-            IdTenant=target_tenant_id if target_tenant_id > 0 else None,
-            Tenant=tenant_name,
-            DataCadastro=date.today(),
-            Cadastrante=str(auth.get("nome") or auth.get("usuario") or "").strip() or None,
-        )
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _funcao_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name, "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Funcoes", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar função")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _funcao_as_out(row)
 
 
 @app.put("/api/funcoes/{id_funcao}", response_model=FuncaoOut)
-def update_funcao(
+async def update_funcao(
     id_funcao: int,
     payload: FuncaoUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> FuncaoOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
     tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or tenant_slug or None
-    _ensure_gestao_interna_tables_for_auth(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(FuncaoModel, id_funcao)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(FuncaoModel, id_funcao)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Função não encontrada")
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if isinstance(v, str):
-                v = v.strip()
-            setattr(row, k, v)
-        if getattr(row, "IdTenant", None) is None and target_tenant_id > 0:
-            row.IdTenant = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
+        await _funcao_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name, "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None})
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Funcoes", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar função")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _funcao_as_out(row)
 
 
 @app.delete("/api/funcoes/{id_funcao}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_funcao(
+async def delete_funcao(
     id_funcao: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(FuncaoModel, id_funcao)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(FuncaoModel, id_funcao)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Função não encontrada")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("Funcoes", _session_db_name(tdb))
+
+
+async def _colaborador_new(tdb: AsyncSession, payload: ColaboradorCreate, ctx: dict[str, Any]) -> ColaboradorModel:
+    return ColaboradorModel(
+        Colaborador=payload.Colaborador.strip(),
+        Descricao=payload.Descricao.strip() if isinstance(payload.Descricao, str) else None,
+        Funcao=payload.Funcao.strip(),
+        IdTenant=ctx["tenant_id"] if ctx["tenant_id"] > 0 else None,
+        Tenant=ctx["tenant_name"],
+        DataCadastro=date.today(),
+        Cadastrante=ctx["cadastrante"],
+    )
+
+
+async def _colaborador_apply(tdb: AsyncSession, row: ColaboradorModel, payload: ColaboradorUpdate, ctx: dict[str, Any]) -> None:
+    _apply_stripped(row, payload)
+    if getattr(row, "IdTenant", None) is None and ctx["tenant_id"] > 0:
+        row.IdTenant = ctx["tenant_id"]
+    if not getattr(row, "Tenant", None):
+        row.Tenant = ctx["tenant_name"]
 
 
 @app.get("/api/colaboradores", response_model=list[ColaboradorOut])
-def list_colaboradores(
+async def list_colaboradores(
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[ColaboradorOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     auth_tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
-    _ensure_gestao_interna_tables_for_auth(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    await _ensure_tenant_database_ready_async(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    page = _list_page("Colaboradores", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if (_is_superadmin(auth) or _is_executive_tenant(auth)) and tenant_id is not None:
-        with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-            rows = tdb.execute(select(ColaboradorModel).order_by(ColaboradorModel.IdColaborador.asc())).scalars().all()
-            return [_colaborador_as_out(r) for r in rows]
+        async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+            cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(tdb, "Colaboradores"))
+            if cached is not None:
+                return cached
+            rows = (await tdb.execute(_apply_list_page(_list_select(page), page))).all()
+            listed = _list_response(response, page, ((int(tenant_id), r) for r in _finish_list_page(response, page, rows)))
+            return _response_cache_store(ticket, "Colaboradores", _session_db_name(tdb), listed)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-        out: list[ColaboradorOut] = []
-        for t in tenants:
-            slug = str(t.Slug or "").strip().lower()
-            _ensure_gestao_interna_tables_for_auth(tenant_id=int(t.IdTenant), tenant_slug=slug)
-            if slug == "executive":
-                rows = db.execute(select(ColaboradorModel).order_by(ColaboradorModel.IdColaborador.asc())).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=slug)
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    rows = tdb.execute(select(ColaboradorModel).order_by(ColaboradorModel.IdColaborador.asc())).scalars().all()
-            out.extend([_colaborador_as_out(r) for r in rows])
-        out.sort(key=lambda r: (str(r.Tenant or ""), int(r.IdColaborador or 0)))
-        return out
-
-    rows = db.execute(select(ColaboradorModel).order_by(ColaboradorModel.IdColaborador.asc())).scalars().all()
-    return [_colaborador_as_out(r) for r in rows]
+        tenants = await _fan_out_tenant_targets()
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "Colaboradores"))
+        if cached is not None:
+            return cached
+        return _response_cache_store(ticket, "Colaboradores", "*", await _fan_out_list(response, tenants, page, lambda tid, slug, name: _list_select(page)))
+
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Colaboradores"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    listed = _list_response(response, page, ((auth_tenant_id, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Colaboradores", _session_db_name(db), listed)
+
+
+@app.get("/api/colaboradores/export")
+async def export_colaboradores(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "Colaboradores",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+    )
 
 
 @app.get("/api/colaboradores/{id_colaborador}", response_model=ColaboradorOut)
-def get_colaborador(
+async def get_colaborador(
     id_colaborador: int,
+    request: Request,
+    response: Response,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ColaboradorOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     auth_tenant_slug = str(auth.get("tenant_slug") or "").strip().lower()
-    _ensure_gestao_interna_tables_for_auth(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ColaboradorModel, id_colaborador)
+    await _ensure_tenant_database_ready_async(tenant_id=auth_tenant_id, tenant_slug=auth_tenant_slug)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        not_modified = _not_modified(request, response, auth, await _table_version(tdb, "Colaboradores"))
+        if not_modified is not None:
+            return not_modified
+        row = await _get_row(tdb, "Colaboradores", id_colaborador)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Colaborador não encontrado")
         return _colaborador_as_out(row)
 
 
 @app.post("/api/colaboradores", response_model=ColaboradorOut, status_code=status.HTTP_201_CREATED)
-def create_colaborador(
+async def create_colaborador(
     payload: ColaboradorCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ColaboradorOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
     tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or tenant_slug or None
-    _ensure_gestao_interna_tables_for_auth(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = ColaboradorModel(
-            Colaborador=payload.Colaborador.strip(),
-            Descricao=payload.Descricao.strip() if isinstance(payload.Descricao, str) else None,
-            Funcao=payload.Funcao.strip(),
-            IdTenant=target_tenant_id if target_tenant_id > 0 else None,
-            Tenant=tenant_name,
-            DataCadastro=date.today(),
-            Cadastrante=str(auth.get("nome") or auth.get("usuario") or "").strip() or None,
-        )
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _colaborador_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name, "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Colaboradores", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar colaborador")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _colaborador_as_out(row)
 
 
 @app.put("/api/colaboradores/{id_colaborador}", response_model=ColaboradorOut)
-def update_colaborador(
+async def update_colaborador(
     id_colaborador: int,
     payload: ColaboradorUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ColaboradorOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
     tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or tenant_slug or None
-    _ensure_gestao_interna_tables_for_auth(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ColaboradorModel, id_colaborador)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ColaboradorModel, id_colaborador)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Colaborador não encontrado")
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if isinstance(v, str):
-                v = v.strip()
-            setattr(row, k, v)
-        if getattr(row, "IdTenant", None) is None and target_tenant_id > 0:
-            row.IdTenant = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
+        await _colaborador_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name, "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None})
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("Colaboradores", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar colaborador")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _colaborador_as_out(row)
 
 
 @app.delete("/api/colaboradores/{id_colaborador}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_colaborador(
+async def delete_colaborador(
     id_colaborador: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ColaboradorModel, id_colaborador)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ColaboradorModel, id_colaborador)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Colaborador não encontrado")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("Colaboradores", _session_db_name(tdb))
 
 
 def _sanitize_identifier(value: str) -> str:
@@ -2722,12 +4286,241 @@ def _tenant_db_name(*, tenant_id: int, slug: str) -> str:
     return _sanitize_db_name(f"{str(slug or '').strip().lower()}-{int(tenant_id)}")
 
 
-def _tenant_engine(*, db_name: str) -> Engine:
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+_TENANT_ENGINES: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+_TENANT_ENGINES_LOCK = threading.RLock()
+_TENANT_ENGINES_LAST_SWEEP = 0.0
+_ADMIN_ENGINE: Optional[Engine] = None
+_EVENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_EVENT_LOOP_TASKS: set[asyncio.Task] = set()
+
+
+def _tenant_pool_settings(db_name: str) -> tuple[int, int]:
+    pool_size = max(1, _env_int("TENANT_POOL_SIZE", 2))
+    max_overflow = max(0, _env_int("TENANT_POOL_MAX_OVERFLOW", 3))
+    raw = str(os.getenv("TENANT_POOL_OVERRIDES") or "").strip()
+    for item in raw.split(","):
+        name, sep, sizes = item.partition("=")
+        if not sep or _sanitize_db_name(name) != db_name:
+            continue
+        size_raw, _, overflow_raw = sizes.partition(":")
+        try:
+            pool_size = max(1, int(size_raw))
+            if overflow_raw.strip():
+                max_overflow = max(0, int(overflow_raw))
+        except ValueError:
+            continue
+    return pool_size, max_overflow
+
+
+def _create_tenant_engine_entry(db_name: str) -> dict[str, Any]:
+    if db_name == _sanitize_db_name(_DEFAULT_DATABASE_NAME):
+        return {
+            "engine": engine,
+            "sessionmaker": SessionLocal,
+            "async_engine": async_engine,
+            "async_sessionmaker": AsyncSessionLocal,
+            "pool_size": engine.pool.size() if hasattr(engine.pool, "size") else None,
+            "max_overflow": None,
+            "created_at": time.time(),
+            "last_used": time.time(),
+            "pinned": True,
+            "leases": 0,
+        }
+
     url = make_url(DATABASE_URL)
     tenant_url = url.set(database=db_name)
     tenant_url_str = tenant_url.render_as_string(hide_password=False)
     connect_args = _connect_args(tenant_url_str)
-    return create_engine(tenant_url_str, connect_args=connect_args, pool_pre_ping=True)
+    pool_size, max_overflow = _tenant_pool_settings(db_name)
+    pool_options: dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": max(1, _env_int("TENANT_POOL_TIMEOUT_SECONDS", 30)),
+        "pool_recycle": max(-1, _env_int("TENANT_POOL_RECYCLE_SECONDS", 1800)),
+    }
+    tenant_engine = create_engine(tenant_url_str, connect_args=connect_args, **pool_options)
+    tenant_async_engine = create_async_engine(_async_database_url(tenant_url_str), connect_args=connect_args, **pool_options)
+    entry: dict[str, Any] = {
+        "engine": tenant_engine,
+        "sessionmaker": sessionmaker(bind=tenant_engine, autoflush=False, autocommit=False),
+        "async_engine": tenant_async_engine,
+        "async_sessionmaker": async_sessionmaker(bind=tenant_async_engine, autoflush=False, expire_on_commit=False),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "created_at": time.time(),
+        "last_used": time.time(),
+        "pinned": False,
+        "evicted": False,
+        "leases": 0,
+    }
+
+    def _touch(*_args: Any) -> None:
+        entry["last_used"] = time.time()
+
+    def _checkout(*_args: Any) -> None:
+        if entry["evicted"]:
+            raise RuntimeError(f"Pool do banco {db_name} já foi descartado")
+        entry["last_used"] = time.time()
+
+    for target in (tenant_engine, tenant_async_engine.sync_engine):
+        event.listen(target, "checkout", _checkout)
+        event.listen(target, "checkin", _touch)
+    return entry
+
+
+def _pool_checked_out(entry: dict[str, Any]) -> int:
+    total = 0
+    for pool in (entry["engine"].pool, entry["async_engine"].pool):
+        total += int(pool.checkedout()) if hasattr(pool, "checkedout") else 0
+    return total
+
+
+def _schedule_on_event_loop(coro: Any) -> bool:
+    loop = _EVENT_LOOP
+    if loop is None or loop.is_closed():
+        coro.close()
+        return False
+
+    def _start() -> None:
+        task = loop.create_task(coro)
+        _EVENT_LOOP_TASKS.add(task)
+        task.add_done_callback(_EVENT_LOOP_TASKS.discard)
+
+    loop.call_soon_threadsafe(_start)
+    return True
+
+
+def _dispose_engine_entry(entry: dict[str, Any]) -> None:
+    entry["evicted"] = True
+    entry["engine"].dispose()
+    tenant_async_engine: AsyncEngine = entry["async_engine"]
+    if not _schedule_on_event_loop(tenant_async_engine.dispose()):
+        tenant_async_engine.sync_engine.dispose(close=False)
+
+
+def _collect_idle_tenant_engines(now: float, *, keep: Optional[str] = None) -> list[dict[str, Any]]:
+    global _TENANT_ENGINES_LAST_SWEEP
+    idle_seconds = max(0, _env_int("TENANT_POOL_IDLE_SECONDS", 300))
+    max_open = max(1, _env_int("TENANT_POOL_MAX_OPEN", 64))
+    if len(_TENANT_ENGINES) <= max_open and now - _TENANT_ENGINES_LAST_SWEEP < 5:
+        return []
+    _TENANT_ENGINES_LAST_SWEEP = now
+
+    evicted: list[dict[str, Any]] = []
+    for name, entry in list(_TENANT_ENGINES.items()):
+        if entry["pinned"] or name == keep or entry["leases"] > 0 or _pool_checked_out(entry) > 0:
+            continue
+        if now - float(entry["last_used"]) >= idle_seconds or len(_TENANT_ENGINES) > max_open:
+            _TENANT_ENGINES.pop(name, None)
+            evicted.append(entry)
+    return evicted
+
+
+def _tenant_engine_entry(db_name: str, *, lease: bool = False) -> dict[str, Any]:
+    safe_db = _sanitize_db_name(db_name)
+    now = time.time()
+    with _TENANT_ENGINES_LOCK:
+        entry = _TENANT_ENGINES.get(safe_db)
+        if entry is None:
+            entry = _create_tenant_engine_entry(safe_db)
+            _TENANT_ENGINES[safe_db] = entry
+        entry["last_used"] = now
+        if lease:
+            entry["leases"] += 1
+        _TENANT_ENGINES.move_to_end(safe_db)
+        evicted = _collect_idle_tenant_engines(now, keep=safe_db)
+    for old in evicted:
+        _dispose_engine_entry(old)
+    return entry
+
+
+def _release_tenant_engine_entry(entry: dict[str, Any]) -> None:
+    with _TENANT_ENGINES_LOCK:
+        entry["leases"] -= 1
+        entry["last_used"] = time.time()
+
+
+def _tenant_engine(*, db_name: str) -> Engine:
+    return _tenant_engine_entry(db_name)["engine"]
+
+
+def _dispose_tenant_engine(db_name: str) -> None:
+    safe_db = _sanitize_db_name(db_name)
+    with _TENANT_ENGINES_LOCK:
+        entry = _TENANT_ENGINES.get(safe_db)
+        if entry is None or entry["pinned"]:
+            return
+        _TENANT_ENGINES.pop(safe_db, None)
+    _dispose_engine_entry(entry)
+
+
+def _evict_idle_tenant_engines() -> int:
+    global _TENANT_ENGINES_LAST_SWEEP
+    with _TENANT_ENGINES_LOCK:
+        _TENANT_ENGINES_LAST_SWEEP = 0.0
+        evicted = _collect_idle_tenant_engines(time.time())
+    for old in evicted:
+        _dispose_engine_entry(old)
+    return len(evicted)
+
+
+def _tenant_pool_stats() -> list[dict[str, Any]]:
+    now = time.time()
+    with _TENANT_ENGINES_LOCK:
+        items = list(_TENANT_ENGINES.items())
+    out: list[dict[str, Any]] = []
+    for name, entry in items:
+        pool = entry["engine"].pool
+        async_pool = entry["async_engine"].pool
+        out.append(
+            {
+                "database": name,
+                "pinned": bool(entry["pinned"]),
+                "pool_size": entry["pool_size"],
+                "max_overflow": entry["max_overflow"],
+                "checked_out": _pool_checked_out(entry),
+                "leases": int(entry["leases"]),
+                "checked_in": int(pool.checkedin()) if hasattr(pool, "checkedin") else 0,
+                "overflow": int(pool.overflow()) if hasattr(pool, "overflow") else 0,
+                "async_checked_in": int(async_pool.checkedin()) if hasattr(async_pool, "checkedin") else 0,
+                "async_overflow": int(async_pool.overflow()) if hasattr(async_pool, "overflow") else 0,
+                "created_at": datetime.fromtimestamp(float(entry["created_at"])).isoformat(timespec="seconds"),
+                "last_used": datetime.fromtimestamp(float(entry["last_used"])).isoformat(timespec="seconds"),
+                "idle_seconds": round(max(0.0, now - float(entry["last_used"])), 1),
+            }
+        )
+    return out
+
+
+def _admin_engine() -> Engine:
+    global _ADMIN_ENGINE
+    with _TENANT_ENGINES_LOCK:
+        if _ADMIN_ENGINE is not None:
+            return _ADMIN_ENGINE
+        url = make_url(DATABASE_URL)
+        admin_db = os.getenv("POSTGRES_ADMIN_DB")
+        if not admin_db or not str(admin_db).strip():
+            admin_db = str(url.database or "").strip() or "postgres"
+        admin_url = url.set(database=admin_db)
+        admin_url_str = admin_url.render_as_string(hide_password=False)
+        _ADMIN_ENGINE = create_engine(
+            admin_url_str,
+            connect_args=_connect_args(admin_url_str),
+            isolation_level="AUTOCOMMIT",
+            poolclass=NullPool,
+        )
+        return _ADMIN_ENGINE
 
 
 def _seed_tenant_admin_user(*, db_name: str, tenant_id: int, slug: str) -> None:
@@ -2738,10 +4531,9 @@ def _seed_tenant_admin_user(*, db_name: str, tenant_id: int, slug: str) -> None:
         return
 
     admin_username = f"ADMIN.{str(slug).upper()}"
-    tenant_engine = _tenant_engine(db_name=db_name)
-    TenantSession = sessionmaker(bind=tenant_engine, autoflush=False, autocommit=False)
+    TenantSession = _tenant_sessionmaker(db_name)
     with TenantSession() as db:
-        existing = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == admin_username)).scalar_one_or_none()
+        existing = _usuario_by_login(db, admin_username)
         if existing:
             if int(existing.TenantId) != int(tenant_id):
                 existing.TenantId = int(tenant_id)
@@ -2772,21 +4564,7 @@ def _create_db_schema(db_name: str, schema_name: str) -> None:
     db_name = _sanitize_db_name(db_name)
     schema_name = _sanitize_identifier(schema_name)
 
-    url = make_url(DATABASE_URL)
-    admin_db = os.getenv("POSTGRES_ADMIN_DB")
-    if not admin_db or not str(admin_db).strip():
-        admin_db = str(url.database or "").strip() or "postgres"
-    admin_url = url.set(database=admin_db)
-
-    admin_url_str = admin_url.render_as_string(hide_password=False)
-    admin_connect_args = _connect_args(admin_url_str)
-    admin_engine = create_engine(
-        admin_url_str,
-        connect_args=admin_connect_args,
-        isolation_level="AUTOCOMMIT",
-        pool_pre_ping=True,
-    )
-    with admin_engine.connect() as conn:
+    with _admin_engine().connect() as conn:
         exists = conn.execute(text("select 1 from pg_database where datname=:n"), {"n": db_name}).first()
         if not exists:
             conn.exec_driver_sql(f'CREATE DATABASE "{db_name}"')
@@ -2821,65 +4599,15 @@ def _create_db_schema(db_name: str, schema_name: str) -> None:
     meta.create_all(bind=tenant_engine, checkfirst=True)
 
 
-def _drop_public_schema_existing_tenant_databases() -> None:
-    if not DATABASE_URL.startswith("postgresql"):
-        return
-
-    url = make_url(DATABASE_URL)
-    admin_db = os.getenv("POSTGRES_ADMIN_DB")
-    if not admin_db or not str(admin_db).strip():
-        admin_db = str(url.database or "").strip() or "postgres"
-    admin_url = url.set(database=admin_db)
-    admin_url_str = admin_url.render_as_string(hide_password=False)
-    admin_connect_args = _connect_args(admin_url_str)
-    admin_engine = create_engine(
-        admin_url_str,
-        connect_args=admin_connect_args,
-        isolation_level="AUTOCOMMIT",
-        pool_pre_ping=True,
-    )
-
-    with SessionLocal() as db:
-        tenants = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-
-    for t in tenants:
-        if str(t.Slug or "").strip().lower() == "executive":
-            continue
-        db_name = _sanitize_db_name(_tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug or "")))
-        with admin_engine.connect() as conn:
-            exists = conn.execute(text("select 1 from pg_database where datname=:n"), {"n": db_name}).first()
-            if not exists:
-                continue
-        tenant_engine = _tenant_engine(db_name=db_name)
-        with tenant_engine.connect() as conn:
-            conn.exec_driver_sql("DROP SCHEMA IF EXISTS public CASCADE")
-            conn.commit()
-
-
-_drop_public_schema_existing_tenant_databases()
-
-
 def _drop_database(db_name: str) -> None:
     if not DATABASE_URL.startswith("postgresql"):
         raise RuntimeError("Somente PostgreSQL é suportado")
 
     safe_db = _sanitize_db_name(db_name)
+    _dispose_tenant_engine(safe_db)
+    _forget_schema_ready(safe_db)
 
-    url = make_url(DATABASE_URL)
-    admin_db = os.getenv("POSTGRES_ADMIN_DB")
-    if not admin_db or not str(admin_db).strip():
-        admin_db = str(url.database or "").strip() or "postgres"
-    admin_url = url.set(database=admin_db)
-
-    admin_url_str = admin_url.render_as_string(hide_password=False)
-    admin_connect_args = _connect_args(admin_url_str)
-    admin_engine = create_engine(
-        admin_url_str,
-        connect_args=admin_connect_args,
-        isolation_level="AUTOCOMMIT",
-        pool_pre_ping=True,
-    )
-    with admin_engine.connect() as conn:
+    with _admin_engine().connect() as conn:
         exists = conn.execute(text("select 1 from pg_database where datname=:n"), {"n": safe_db}).first()
         if not exists:
             return
@@ -2920,27 +4648,51 @@ def _tenant_as_out(row: TenantsModel) -> TenantOut:
 
 
 @app.get("/api/tenants", response_model=list[TenantOut])
-def list_tenants(db: Session = Depends(get_db), auth: dict[str, Any] = Depends(_require_superadmin)) -> list[TenantOut]:
-    rows = db.execute(select(TenantsModel).order_by(TenantsModel.IdTenant.asc())).scalars().all()
-    return [_tenant_as_out(r) for r in rows]
+async def list_tenants(
+    request: Request,
+    response: Response,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    auth: dict[str, Any] = Depends(_require_superadmin),
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
+    page = _list_page("Tenants", sort=sort, cursor=cursor, limit=limit, fields=fields)
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "Tenants"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page), page))).all()
+    listed = _list_response(response, page, ((None, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "Tenants", _session_db_name(db), listed)
 
 
 @app.get("/api/tenants/{id_tenant}", response_model=TenantOut)
-def get_tenant(id_tenant: int, db: Session = Depends(get_db), auth: dict[str, Any] = Depends(_require_superadmin)) -> TenantOut:
-    row = db.get(TenantsModel, id_tenant)
+async def get_tenant(
+    id_tenant: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    auth: dict[str, Any] = Depends(_require_superadmin),
+) -> TenantOut:
+    not_modified = _not_modified(request, response, auth, await _table_version(db, "Tenants"))
+    if not_modified is not None:
+        return not_modified
+    row = await _get_row(db, "Tenants", id_tenant)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant não encontrado")
     return _tenant_as_out(row)
 
 
 @app.post("/api/tenants", response_model=TenantOut, status_code=status.HTTP_201_CREATED)
-def create_tenant(payload: TenantCreate, db: Session = Depends(get_db), auth: dict[str, Any] = Depends(_require_superadmin)) -> TenantOut:
+async def create_tenant(payload: TenantCreate, db: AsyncSession = Depends(get_db), auth: dict[str, Any] = Depends(_require_superadmin)) -> TenantOut:
     tenant_name = payload.Tenant.strip()
     slug_raw = payload.Slug.strip().lower()
     if not slug_raw:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug inválido")
 
-    existing = db.execute(select(TenantsModel).where(TenantsModel.Slug == slug_raw)).scalar_one_or_none()
+    existing = (await db.execute(select(TenantsModel).where(TenantsModel.Slug == slug_raw))).scalar_one_or_none()
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug já existe")
 
@@ -2953,31 +4705,33 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db), auth: di
         Cadastrante=payload.Cadastrante.strip() if isinstance(payload.Cadastrante, str) else None,
     )
     db.add(row)
+    await _touch_tenant_directory(db)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar tenant")
-    db.refresh(row)
+    finally:
+        _invalidate_tenant_directory()
+        _invalidate_response_cache()
+    await db.refresh(row)
 
     db_name = _tenant_db_name(tenant_id=int(row.IdTenant), slug=str(row.Slug))
     try:
-        _create_db_schema(db_name, SCHEMA_NAME)
-        _seed_tenant_admin_user(db_name=db_name, tenant_id=int(row.IdTenant), slug=str(row.Slug))
-        safe_db = _sanitize_db_name(db_name)
+        await run_in_threadpool(_create_db_schema, db_name, SCHEMA_NAME)
+        await run_in_threadpool(_seed_tenant_admin_user, db_name=db_name, tenant_id=int(row.IdTenant), slug=str(row.Slug))
         if str(row.Slug).lower() != "executive":
             tenant_name_safe = str(row.Tenant or "").strip() or str(row.Slug or "").strip().lower()
-            _ensure_executivos_tenant_columns_tenant_db(db_name=safe_db, tenant_id=int(row.IdTenant), tenant_name=tenant_name_safe)
-            _ensure_table_tenant_columns_tenant_db(db_name=safe_db, table="Ativos", tenant_id=int(row.IdTenant), tenant_name=tenant_name_safe)
-            _ensure_table_tenant_columns_tenant_db(db_name=safe_db, table="ContasPagar", tenant_id=int(row.IdTenant), tenant_name=tenant_name_safe)
-            _ensure_table_tenant_columns_tenant_db(db_name=safe_db, table="CentroCustos", tenant_id=int(row.IdTenant), tenant_name=tenant_name_safe)
-            _TENANT_DB_TENANT_COLUMNS_ENSURED.add(safe_db)
+            await run_in_threadpool(_migrate_database, db_name=db_name, tenant=(int(row.IdTenant), str(row.Slug).lower(), tenant_name_safe))
     except Exception as e:
         try:
-            db.delete(row)
-            db.commit()
+            await db.delete(row)
+            await _touch_tenant_directory(db)
+            await db.commit()
         except Exception:
             pass
+        _invalidate_tenant_directory()
+        _invalidate_response_cache()
         safe_db = _sanitize_db_name(db_name)
         safe_schema = _sanitize_identifier(SCHEMA_NAME)
         orig = getattr(e, "orig", None)
@@ -2992,16 +4746,16 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db), auth: di
 
     if str(row.Slug).lower() != "executive":
         admin_username = f"ADMIN.{str(row.Slug).upper()}"
-        existing_admin = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == admin_username)).scalar_one_or_none()
+        existing_admin = await _usuario_by_login_async(db, admin_username)
         if existing_admin:
             if int(existing_admin.TenantId or 0) != int(row.IdTenant):
                 existing_admin.TenantId = int(row.IdTenant)
             existing_admin.Role = "ADMIN"
             existing_admin.Ativo = 1
-            db.commit()
+            await db.commit()
         else:
             salt_hex = os.urandom(16).hex()
-            senha_hash = _pbkdf2_hash_password("admin", salt_hex)
+            senha_hash = await _hash_password("admin", salt_hex)
             db.add(
                 UsuariosModel(
                     Usuario=admin_username,
@@ -3013,10 +4767,10 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db), auth: di
                 )
             )
             try:
-                db.commit()
+                await db.commit()
             except IntegrityError:
-                db.rollback()
-                existing_admin = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == admin_username)).scalar_one_or_none()
+                await db.rollback()
+                existing_admin = await _usuario_by_login_async(db, admin_username)
                 if not existing_admin or int(existing_admin.TenantId) != int(row.IdTenant):
                     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Falha ao criar usuário do tenant")
 
@@ -3024,14 +4778,15 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db), auth: di
 
 
 @app.put("/api/tenants/{id_tenant}", response_model=TenantOut)
-def update_tenant(
-    id_tenant: int, payload: TenantUpdate, db: Session = Depends(get_db), auth: dict[str, Any] = Depends(_require_superadmin)
+async def update_tenant(
+    id_tenant: int, payload: TenantUpdate, db: AsyncSession = Depends(get_db), auth: dict[str, Any] = Depends(_require_superadmin)
 ) -> TenantOut:
-    row = db.get(TenantsModel, id_tenant)
+    row = await db.get(TenantsModel, id_tenant)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant não encontrado")
 
     old_slug = str(row.Slug or "")
+    old_db_name = _tenant_db_name(tenant_id=int(row.IdTenant), slug=old_slug)
     data: dict[str, Any] = payload.model_dump(exclude_unset=True)
     if "Tenant" in data and isinstance(data.get("Tenant"), str):
         row.Tenant = data["Tenant"].strip()
@@ -3039,7 +4794,7 @@ def update_tenant(
         slug_raw = data["Slug"].strip().lower()
         if not slug_raw:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug inválido")
-        existing = db.execute(select(TenantsModel).where(TenantsModel.Slug == slug_raw, TenantsModel.IdTenant != id_tenant)).scalar_one_or_none()
+        existing = (await db.execute(select(TenantsModel).where(TenantsModel.Slug == slug_raw, TenantsModel.IdTenant != id_tenant))).scalar_one_or_none()
         if existing:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug já existe")
         row.Slug = slug_raw
@@ -3049,17 +4804,26 @@ def update_tenant(
 
     row.DataUpdate = date.today()
 
+    await _touch_tenant_directory(db)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar tenant")
-    db.refresh(row)
+    finally:
+        _invalidate_tenant_directory()
+        _invalidate_response_cache()
+    await db.refresh(row)
 
     db_name = _tenant_db_name(tenant_id=int(row.IdTenant), slug=str(row.Slug))
+    if _sanitize_db_name(old_db_name) != _sanitize_db_name(db_name):
+        await run_in_threadpool(_dispose_tenant_engine, old_db_name)
     try:
-        _create_db_schema(db_name, SCHEMA_NAME)
-        _seed_tenant_admin_user(db_name=db_name, tenant_id=int(row.IdTenant), slug=str(row.Slug))
+        await run_in_threadpool(_create_db_schema, db_name, SCHEMA_NAME)
+        await run_in_threadpool(_seed_tenant_admin_user, db_name=db_name, tenant_id=int(row.IdTenant), slug=str(row.Slug))
+        if str(row.Slug).lower() != "executive":
+            tenant_name_safe = str(row.Tenant or "").strip() or str(row.Slug or "").strip().lower()
+            await run_in_threadpool(_migrate_database, db_name=db_name, tenant=(int(row.IdTenant), str(row.Slug).lower(), tenant_name_safe))
     except Exception as e:
         safe_db = _sanitize_db_name(db_name)
         safe_schema = _sanitize_identifier(SCHEMA_NAME)
@@ -3075,30 +4839,26 @@ def update_tenant(
 
     if str(row.Slug).lower() != "executive":
         desired_username = f"ADMIN.{str(row.Slug).upper()}"
-        existing_desired = db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == desired_username)).scalar_one_or_none()
+        existing_desired = await _usuario_by_login_async(db, desired_username)
         if existing_desired:
             if int(existing_desired.TenantId or 0) != int(row.IdTenant):
                 existing_desired.TenantId = int(row.IdTenant)
             existing_desired.Role = "ADMIN"
             existing_desired.Ativo = 1
-            db.commit()
+            await db.commit()
         else:
             old_username = f"ADMIN.{old_slug.upper()}" if old_slug else ""
-            existing_old = (
-                db.execute(select(UsuariosModel).where(UsuariosModel.Usuario == old_username)).scalar_one_or_none()
-                if old_username
-                else None
-            )
+            existing_old = await _usuario_by_login_async(db, old_username) if old_username else None
             if existing_old and int(existing_old.TenantId) == int(row.IdTenant):
                 existing_old.Usuario = desired_username
                 try:
-                    db.commit()
+                    await db.commit()
                 except IntegrityError:
-                    db.rollback()
+                    await db.rollback()
                     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Falha ao atualizar usuário do tenant")
             else:
                 salt_hex = os.urandom(16).hex()
-                senha_hash = _pbkdf2_hash_password("admin", salt_hex)
+                senha_hash = await _hash_password("admin", salt_hex)
                 db.add(
                     UsuariosModel(
                         Usuario=desired_username,
@@ -3110,22 +4870,22 @@ def update_tenant(
                     )
                 )
                 try:
-                    db.commit()
+                    await db.commit()
                 except IntegrityError:
-                    db.rollback()
+                    await db.rollback()
                     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Falha ao criar usuário do tenant")
 
     return _tenant_as_out(row)
 
 
 @app.delete("/api/tenants/{id_tenant}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_tenant(
+async def delete_tenant(
     id_tenant: int,
     delete_db: bool = Query(False, alias="delete_db"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     auth: dict[str, Any] = Depends(_require_superadmin),
 ) -> None:
-    row = db.get(TenantsModel, id_tenant)
+    row = await db.get(TenantsModel, id_tenant)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant não encontrado")
     if int(row.IdTenant) == 1 or str(row.Slug or "").strip().lower() == "executive":
@@ -3134,7 +4894,7 @@ def delete_tenant(
     if delete_db:
         db_name = _tenant_db_name(tenant_id=int(row.IdTenant), slug=str(row.Slug))
         try:
-            _drop_database(db_name)
+            await run_in_threadpool(_drop_database, db_name)
         except Exception as e:
             msg = str(getattr(e, "orig", None) or e or "").strip()
             msg = re.sub(r"\s+", " ", msg).strip()
@@ -3146,14 +4906,17 @@ def delete_tenant(
 
         tenant_name = str(row.Tenant or "").strip()
         if tenant_name:
-            db.execute(delete(ExecutivoModel).where(func.lower(ExecutivoModel.Empresa) == tenant_name.lower()))
-            db.execute(delete(ContasPagarModel).where(func.lower(ContasPagarModel.Empresa) == tenant_name.lower()))
-            db.execute(delete(AtivoModel).where(func.lower(AtivoModel.Empresa) == tenant_name.lower()))
-            db.execute(delete(CentroCustosModel).where(func.lower(CentroCustosModel.Empresa) == tenant_name.lower()))
+            await db.execute(delete(ExecutivoModel).where(func.lower(ExecutivoModel.Empresa) == tenant_name.lower()))
+            await db.execute(delete(ContasPagarModel).where(func.lower(ContasPagarModel.Empresa) == tenant_name.lower()))
+            await db.execute(delete(AtivoModel).where(func.lower(AtivoModel.Empresa) == tenant_name.lower()))
+            await db.execute(delete(CentroCustosModel).where(func.lower(CentroCustosModel.Empresa) == tenant_name.lower()))
 
-    db.execute(delete(UsuariosModel).where(UsuariosModel.TenantId == int(row.IdTenant)))
-    db.delete(row)
-    db.commit()
+    await db.execute(delete(UsuariosModel).where(UsuariosModel.TenantId == int(row.IdTenant)))
+    await db.delete(row)
+    await _touch_tenant_directory(db)
+    await db.commit()
+    _invalidate_tenant_directory()
+    _invalidate_response_cache()
 
 
 def _sanitize_segment(value: str) -> str:
@@ -3245,7 +5008,378 @@ def _nestjs_media_url(path: str = "") -> str:
     return f"{base}/media{p}"
 
 
-def _multipart_file_body(*, field_name: str, filename: str, content_type: Optional[str], content: bytes) -> tuple[bytes, str]:
+MEDIA_CHUNK_BYTES = 1024 * 1024
+MEDIA_RETRY_STATUSES = frozenset({502, 503, 504})
+
+_MEDIA_CLIENT: Optional[httpx.AsyncClient] = None
+_MEDIA_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_MEDIA_CLIENT_STATS: dict[str, int] = {"requests": 0, "retries": 0, "failures": 0, "pool_timeouts": 0}
+
+
+def _media_client() -> httpx.AsyncClient:
+    global _MEDIA_CLIENT, _MEDIA_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _MEDIA_CLIENT is None or _MEDIA_CLIENT_LOOP is not loop:
+        limits = httpx.Limits(
+            max_connections=max(1, _env_int("MEDIA_POOL_MAX_CONNECTIONS", 32)),
+            max_keepalive_connections=max(0, _env_int("MEDIA_POOL_MAX_KEEPALIVE", 16)),
+            keepalive_expiry=max(0, _env_int("MEDIA_POOL_KEEPALIVE_SECONDS", 30)),
+        )
+        _MEDIA_CLIENT = httpx.AsyncClient(limits=limits, headers={"Accept-Encoding": "identity"})
+        _MEDIA_CLIENT_LOOP = loop
+    return _MEDIA_CLIENT
+
+
+def _media_timeout(name: str, default: int) -> httpx.Timeout:
+    return httpx.Timeout(
+        max(1, _env_int(name, default)),
+        connect=max(1, _env_int("MEDIA_CONNECT_TIMEOUT_SECONDS", 5)),
+        pool=max(1, _env_int("MEDIA_POOL_TIMEOUT_SECONDS", 10)),
+    )
+
+
+def _media_busy() -> HTTPException:
+    _MEDIA_CLIENT_STATS["pool_timeouts"] += 1
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Serviço de mídia ocupado, tente novamente em instantes",
+        headers={"Retry-After": str(max(1, _env_int("MEDIA_RETRY_AFTER_SECONDS", 1)))},
+    )
+
+
+async def _media_get(
+    url: str,
+    *,
+    timeout: httpx.Timeout,
+    headers: Optional[dict[str, str]] = None,
+    follow_redirects: bool = False,
+) -> httpx.Response:
+    client = _media_client()
+    retries = max(0, _env_int("MEDIA_GET_RETRIES", 2))
+    backoff = max(0, _env_int("MEDIA_RETRY_BACKOFF_MS", 100)) / 1000
+    attempt = 0
+    while True:
+        _MEDIA_CLIENT_STATS["requests"] += 1
+        try:
+            resp = await client.send(
+                client.build_request("GET", url, headers=headers, timeout=timeout),
+                stream=True,
+                follow_redirects=follow_redirects,
+            )
+        except httpx.PoolTimeout:
+            raise _media_busy()
+        except httpx.TransportError:
+            if attempt >= retries:
+                _MEDIA_CLIENT_STATS["failures"] += 1
+                raise
+        else:
+            if resp.status_code not in MEDIA_RETRY_STATUSES or attempt >= retries:
+                return resp
+            await resp.aclose()
+        attempt += 1
+        _MEDIA_CLIENT_STATS["retries"] += 1
+        await asyncio.sleep(random.uniform(0, backoff * 2**attempt))
+
+
+async def _media_body(resp: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in resp.aiter_raw(MEDIA_CHUNK_BYTES):
+            yield chunk
+    finally:
+        await resp.aclose()
+
+
+def _media_client_stats() -> dict[str, Any]:
+    stats: dict[str, Any] = dict(_MEDIA_CLIENT_STATS)
+    pool = getattr(getattr(_MEDIA_CLIENT, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for conn in connections if conn.is_idle())
+    stats["connections"] = len(connections)
+    stats["idle"] = idle
+    stats["active"] = len(connections) - idle
+    stats["max_connections"] = max(1, _env_int("MEDIA_POOL_MAX_CONNECTIONS", 32))
+    stats["max_keepalive"] = max(0, _env_int("MEDIA_POOL_MAX_KEEPALIVE", 16))
+    stats["keepalive_seconds"] = max(0, _env_int("MEDIA_POOL_KEEPALIVE_SECONDS", 30))
+    stats["get_retries"] = max(0, _env_int("MEDIA_GET_RETRIES", 2))
+    return stats
+
+
+MEDIA_ID_PATTERN = re.compile(r"[0-9a-f]{24}")
+MEDIA_CACHE_CONTROL = "private, no-cache"
+
+_MEDIA_CACHE: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+_MEDIA_CACHE_LOCK = threading.Lock()
+_MEDIA_CACHE_STATE = {"bytes": 0, "loaded": False}
+_MEDIA_CACHE_STATS = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0, "aborted": 0, "warmed": 0}
+_MEDIA_CACHE_WARMING: dict[str, "asyncio.Task[None]"] = {}
+
+
+def _media_cache_dir() -> Path:
+    base = os.getenv("MEDIA_CACHE_DIR")
+    if base:
+        return Path(base)
+    return Path(tempfile.gettempdir()) / "executive-media-cache"
+
+
+def _media_cache_max_bytes() -> int:
+    return max(0, _env_int("MEDIA_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+
+
+def _media_etag(media_id: str) -> str:
+    return f'"media-{media_id}"'
+
+
+def _media_cache_load_locked(directory: Path) -> None:
+    if _MEDIA_CACHE_STATE["loaded"]:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    found: list[tuple[float, str, dict[str, Any]]] = []
+    for path in directory.iterdir():
+        name = path.name
+        if name.endswith(".part") or (name.endswith(".json") and not (directory / name[:-5]).exists()):
+            path.unlink(missing_ok=True)
+            continue
+        if not MEDIA_ID_PATTERN.fullmatch(name):
+            continue
+        try:
+            meta = json.loads((directory / f"{name}.json").read_text(encoding="utf-8"))
+            st = path.stat()
+        except Exception:
+            continue
+        found.append((st.st_mtime, name, {**meta, "size": int(st.st_size)}))
+    for _mtime, name, entry in sorted(found):
+        _MEDIA_CACHE[name] = entry
+        _MEDIA_CACHE_STATE["bytes"] += int(entry["size"])
+    _MEDIA_CACHE_STATE["loaded"] = True
+
+
+def _media_cache_drop_locked(directory: Path, media_id: str) -> None:
+    entry = _MEDIA_CACHE.pop(media_id, None)
+    if entry is not None:
+        _MEDIA_CACHE_STATE["bytes"] -= int(entry["size"])
+    (directory / media_id).unlink(missing_ok=True)
+    (directory / f"{media_id}.json").unlink(missing_ok=True)
+
+
+def _media_cache_lookup(media_id: str) -> Optional[tuple[Any, dict[str, Any], os.stat_result]]:
+    if not _media_cache_max_bytes() or not MEDIA_ID_PATTERN.fullmatch(media_id):
+        return None
+    directory = _media_cache_dir()
+    with _MEDIA_CACHE_LOCK:
+        try:
+            _media_cache_load_locked(directory)
+        except OSError:
+            return None
+        entry = _MEDIA_CACHE.get(media_id)
+        fh = None
+        if entry is not None:
+            try:
+                fh = open(directory / media_id, "rb")
+            except OSError:
+                _media_cache_drop_locked(directory, media_id)
+        if fh is None:
+            _MEDIA_CACHE_STATS["misses"] += 1
+            return None
+        _MEDIA_CACHE.move_to_end(media_id)
+        _MEDIA_CACHE_STATS["hits"] += 1
+        return fh, dict(entry), os.fstat(fh.fileno())
+
+
+def _media_cache_commit(media_id: str, part: Path, meta: dict[str, Any]) -> None:
+    directory = part.parent
+    size = part.stat().st_size
+    max_bytes = _media_cache_max_bytes()
+    if size > max_bytes:
+        part.unlink(missing_ok=True)
+        return
+    meta_part = directory / f"{media_id}.{uuid4().hex}.json.part"
+    meta_part.write_text(json.dumps(meta), encoding="utf-8")
+    with _MEDIA_CACHE_LOCK:
+        _media_cache_load_locked(directory)
+        previous = _MEDIA_CACHE.pop(media_id, None)
+        if previous is not None:
+            _MEDIA_CACHE_STATE["bytes"] -= int(previous["size"])
+        os.replace(meta_part, directory / f"{media_id}.json")
+        os.replace(part, directory / media_id)
+        _MEDIA_CACHE[media_id] = {**meta, "size": size}
+        _MEDIA_CACHE_STATE["bytes"] += size
+        _MEDIA_CACHE_STATS["stores"] += 1
+        while _MEDIA_CACHE and int(_MEDIA_CACHE_STATE["bytes"]) > max_bytes:
+            evicted = next(iter(_MEDIA_CACHE))
+            _media_cache_drop_locked(directory, evicted)
+            _MEDIA_CACHE_STATS["evicted"] += 1
+
+
+def _media_cache_settle(media_id: str, part: Path, meta: dict[str, Any], complete: bool) -> None:
+    if complete:
+        try:
+            _media_cache_commit(media_id, part, meta)
+            return
+        except OSError:
+            pass
+    else:
+        with _MEDIA_CACHE_LOCK:
+            _MEDIA_CACHE_STATS["aborted"] += 1
+    part.unlink(missing_ok=True)
+
+
+async def _media_cache_fill(media_id: str, resp: httpx.Response, meta: dict[str, Any]) -> AsyncIterator[bytes]:
+    part = _media_cache_dir() / f"{media_id}.{uuid4().hex}.part"
+    try:
+        fh = open(part, "wb")
+    except OSError:
+        async for chunk in _media_body(resp):
+            yield chunk
+        return
+    expected = resp.headers.get("Content-Length")
+    written = 0
+    complete = False
+    try:
+        with fh:
+            async for chunk in resp.aiter_raw(MEDIA_CHUNK_BYTES):
+                await run_in_threadpool(fh.write, chunk)
+                written += len(chunk)
+                yield chunk
+        complete = expected is None or str(written) == expected
+    finally:
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(_media_cache_settle, media_id, part, meta, complete)
+            await resp.aclose()
+
+
+async def _media_cache_warm(media_id: str, url: str) -> None:
+    try:
+        resp = await _media_get(url, timeout=_media_timeout("MEDIA_DOWNLOAD_TIMEOUT_SECONDS", 60))
+    except Exception:
+        return
+    length = resp.headers.get("Content-Length")
+    if resp.status_code != status.HTTP_200_OK or (length and int(length) > _media_cache_max_bytes()):
+        await resp.aclose()
+        return
+    meta = {
+        "content_type": resp.headers.get("Content-Type") or "application/octet-stream",
+        "disposition": resp.headers.get("Content-Disposition"),
+    }
+    async for _chunk in _media_cache_fill(media_id, resp, meta):
+        pass
+    with _MEDIA_CACHE_LOCK:
+        _MEDIA_CACHE_STATS["warmed"] += 1
+
+
+def _media_cache_warm_start(media_id: str, url: str, total: Optional[str]) -> None:
+    max_bytes = _media_cache_max_bytes()
+    if media_id in _MEDIA_CACHE_WARMING or not max_bytes or not MEDIA_ID_PATTERN.fullmatch(media_id):
+        return
+    if not total or not total.isdigit() or int(total) > max_bytes:
+        return
+    task = asyncio.get_running_loop().create_task(_media_cache_warm(media_id, url))
+    _MEDIA_CACHE_WARMING[media_id] = task
+    task.add_done_callback(lambda _task: _MEDIA_CACHE_WARMING.pop(media_id, None))
+
+
+def _media_cache_stats() -> dict[str, Any]:
+    with _MEDIA_CACHE_LOCK:
+        stats: dict[str, Any] = dict(_MEDIA_CACHE_STATS)
+        stats["size"] = len(_MEDIA_CACHE)
+        stats["bytes"] = int(_MEDIA_CACHE_STATE["bytes"])
+    lookups = int(stats["hits"]) + int(stats["misses"])
+    stats["warming"] = len(_MEDIA_CACHE_WARMING)
+    stats["max_bytes"] = _media_cache_max_bytes()
+    stats["directory"] = str(_media_cache_dir())
+    stats["hit_rate"] = round(int(stats["hits"]) / lookups, 4) if lookups else None
+    return stats
+
+
+def _range_not_satisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Intervalo solicitado inválido",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+def _attachment_disposition(filename: str) -> str:
+    quoted = urllib.parse.quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _parse_byte_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", str(header or "").strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    first, last = match.group(1), match.group(2)
+    if not first:
+        suffix = int(last)
+        if not suffix or not size:
+            raise _range_not_satisfiable(size)
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise _range_not_satisfiable(size)
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(if_range: Optional[str], etag: Optional[str], last_modified: Optional[str] = None) -> bool:
+    if not if_range:
+        return True
+    value = if_range.strip()
+    if value.startswith('"') or value.startswith("W/"):
+        return bool(etag) and value == etag
+    return bool(last_modified) and value == last_modified
+
+
+async def _file_slice(fh: Any, offset: int, length: int) -> AsyncIterator[bytes]:
+    with fh:
+        fh.seek(offset)
+        while length > 0:
+            chunk = await run_in_threadpool(fh.read, min(MEDIA_CHUNK_BYTES, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _file_range_response(
+    request: Request,
+    fh: Any,
+    st: os.stat_result,
+    *,
+    media_type: str,
+    headers: dict[str, str],
+    last_modified: Optional[str] = None,
+) -> Response:
+    headers["Accept-Ranges"] = "bytes"
+    byte_range = None
+    if _if_range_matches(request.headers.get("if-range"), headers.get("ETag"), last_modified):
+        try:
+            byte_range = _parse_byte_range(request.headers.get("range"), int(st.st_size))
+        except HTTPException:
+            fh.close()
+            raise
+    if byte_range is None:
+        headers["Content-Length"] = str(st.st_size)
+        return StreamingResponse(_file_slice(fh, 0, int(st.st_size)), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _file_slice(fh, start, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def _media_max_upload_bytes() -> int:
+    return max(1, _env_int("MEDIA_MAX_UPLOAD_BYTES", 100 * 1024 * 1024))
+
+
+def _multipart_file_parts(*, field_name: str, filename: str, content_type: Optional[str]) -> tuple[bytes, bytes, str]:
     boundary = uuid4().hex
     safe_filename = filename.replace('"', "'")
     pre = (
@@ -3255,35 +5389,59 @@ def _multipart_file_body(*, field_name: str, filename: str, content_type: Option
         + "\r\n"
     ).encode("utf-8")
     post = f"\r\n--{boundary}--\r\n".encode("utf-8")
-    body = pre + content + post
-    return body, f"multipart/form-data; boundary={boundary}"
-
-
-def _nestjs_upload_media(*, filename: str, content_type: Optional[str], content: bytes) -> str:
-    body, ct = _multipart_file_body(field_name="file", filename=filename, content_type=content_type, content=content)
-    req = urllib.request.Request(
-        _nestjs_media_url(),
-        data=body,
-        method="POST",
-        headers={
-            "Content-Type": ct,
-            "Content-Length": str(len(body)),
-        },
-    )
+    return pre, post, f"multipart/form-data; boundary={boundary}"
+
+
+async def _multipart_file_stream(pre: bytes, chunks: AsyncIterator[bytes], post: bytes, *, max_bytes: int) -> AsyncIterator[bytes]:
+    yield pre
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Arquivo muito grande")
+        yield chunk
+    yield post
+
+
+async def _upload_file_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(MEDIA_CHUNK_BYTES):
+        yield chunk
+
+
+async def _nestjs_upload_media(
+    *,
+    filename: str,
+    content_type: Optional[str],
+    chunks: AsyncIterator[bytes],
+    size: Optional[int] = None,
+) -> str:
+    max_bytes = _media_max_upload_bytes()
+    if size is not None and size > max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Arquivo muito grande")
+    pre, post, ct = _multipart_file_parts(field_name="file", filename=filename, content_type=content_type)
+    headers = {"Content-Type": ct}
+    if size is not None:
+        headers["Content-Length"] = str(len(pre) + size + len(post))
+    _MEDIA_CLIENT_STATS["requests"] += 1
     try:
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            payload = resp.read()
-    except urllib.error.HTTPError as e:
-        try:
-            detail = e.read().decode("utf-8", errors="ignore")
-        except Exception:
-            detail = ""
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Falha ao salvar mídia no NestJS: {detail}".strip())
+        resp = await _media_client().post(
+            _nestjs_media_url(),
+            content=_multipart_file_stream(pre, chunks, post, max_bytes=max_bytes),
+            headers=headers,
+            timeout=_media_timeout("MEDIA_UPLOAD_TIMEOUT_SECONDS", 60),
+        )
+    except HTTPException:
+        raise
+    except httpx.PoolTimeout:
+        raise _media_busy()
     except Exception:
+        _MEDIA_CLIENT_STATS["failures"] += 1
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Falha ao salvar mídia no NestJS")
+    if resp.status_code >= 400:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Falha ao salvar mídia no NestJS: {resp.text}".strip())
 
     try:
-        data = json.loads(payload.decode("utf-8"))
+        data = resp.json()
     except Exception:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Resposta inválida do NestJS ao salvar mídia")
 
@@ -3309,20 +5467,6 @@ def _media_id_from_ref(value: str) -> str:
     return v.split("media:", 1)[1].strip() if v.startswith("media:") else v
 
 
-def _stream_urlopen_response(resp: Any):
-    try:
-        while True:
-            chunk = resp.read(1024 * 1024)
-            if not chunk:
-                break
-            yield chunk
-    finally:
-        try:
-            resp.close()
-        except Exception:
-            pass
-
-
 def _calc_valor_final(valor_original: Optional[float], parcelas: Optional[int], desconto: Optional[float], acrescimo: Optional[float]) -> Optional[float]:
     if valor_original is None:
         return None
@@ -3336,7 +5480,7 @@ def _calc_valor_final(valor_original: Optional[float], parcelas: Optional[int],
     return total / p if p > 1 else total
 
 
-def _as_out(row: ContasPagarModel) -> ContasPagarOut:
+def _as_out(row: ContasPagarModel, tenant_id: Optional[int] = None) -> ContasPagarOut:
     def _to_float(v: Any) -> Optional[float]:
         if v is None:
             return None
@@ -3371,181 +5515,815 @@ def _as_out(row: ContasPagarModel) -> ContasPagarOut:
         Empresa=row.Empresa,
         TenantId=getattr(row, "TenantId", None),
         Tenant=getattr(row, "Tenant", None),
+        Chave=_row_key(tenant_id, row.IdContasPagar),
+    )
+
+
+def _query_values(raw: Optional[str]) -> list[str]:
+    return [v.strip() for v in str(raw or "").split(",") if v.strip()]
+
+
+def _contas_pagar_filters(
+    vencimento_de: Optional[date] = None,
+    vencimento_ate: Optional[date] = None,
+    status_pagamento: Optional[str] = None,
+    status_cobranca: Optional[str] = None,
+    credor: Optional[str] = None,
+    tipo_cobranca: Optional[str] = None,
+    devedor_id_executivo: Optional[int] = Query(None, ge=1),
+    em_aberto: Optional[bool] = None,
+) -> list[Any]:
+    if vencimento_de and vencimento_ate and vencimento_de > vencimento_ate:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Período de vencimento inválido")
+
+    filters: list[Any] = []
+    if vencimento_de:
+        filters.append(ContasPagarModel.Vencimento >= vencimento_de)
+    if vencimento_ate:
+        filters.append(ContasPagarModel.Vencimento <= vencimento_ate)
+    for column, raw in (
+        (ContasPagarModel.StatusPagamento, status_pagamento),
+        (ContasPagarModel.StatusCobranca, status_cobranca),
+        (ContasPagarModel.Credor, credor),
+        (ContasPagarModel.TipoCobranca, tipo_cobranca),
+    ):
+        values = _query_values(raw)
+        if len(values) == 1:
+            filters.append(column == values[0])
+        elif values:
+            filters.append(column.in_(values))
+    if devedor_id_executivo is not None:
+        filters.append(ContasPagarModel.DevedorIdExecutivo == int(devedor_id_executivo))
+    if em_aberto is True:
+        filters.append(ContasPagarModel.StatusPagamento.is_distinct_from(literal_column("'PAGO'")))
+    elif em_aberto is False:
+        filters.append(ContasPagarModel.StatusPagamento == literal_column("'PAGO'"))
+    return filters
+
+
+_CONTAS_PAGAR_RESUMO_GROUPINGS = {3: "PorStatusPagamento", 5: "PorMes", 6: "PorCredor", 7: "Total"}
+
+
+async def _contas_pagar_resumo_rows(tdb: AsyncSession, filters: list[Any]) -> list[tuple[str, Optional[str], int, Decimal, Decimal]]:
+    mes = func.to_char(ContasPagarModel.Vencimento, "YYYY-MM")
+    stmt = (
+        select(
+            func.grouping(ContasPagarModel.StatusPagamento, mes, ContasPagarModel.Credor),
+            ContasPagarModel.StatusPagamento,
+            mes,
+            ContasPagarModel.Credor,
+            func.count(),
+            func.coalesce(func.sum(ContasPagarModel.ValorOriginal), 0),
+            func.coalesce(func.sum(ContasPagarModel.ValorFinal), 0),
+        )
+        .where(*filters)
+        .group_by(
+            func.grouping_sets(
+                tuple_(ContasPagarModel.StatusPagamento),
+                tuple_(mes),
+                tuple_(ContasPagarModel.Credor),
+                tuple_(),
+            )
+        )
+    )
+    out: list[tuple[str, Optional[str], int, Decimal, Decimal]] = []
+    for grouping, status_pagamento, mes_value, credor, quantidade, original, final in (await tdb.execute(stmt)).all():
+        dimension = _CONTAS_PAGAR_RESUMO_GROUPINGS.get(int(grouping))
+        if dimension is None:
+            continue
+        label = {"PorStatusPagamento": status_pagamento, "PorMes": mes_value, "PorCredor": credor}.get(dimension)
+        out.append((dimension, label, int(quantidade), Decimal(original), Decimal(final)))
+    return out
+
+
+def _contas_pagar_resumo_out(per_tenant: list[tuple[int, str, list[tuple[str, Optional[str], int, Decimal, Decimal]]]]) -> ContasPagarResumoOut:
+    groups: dict[str, dict[Optional[str], list[Any]]] = {d: {} for d in _CONTAS_PAGAR_RESUMO_GROUPINGS.values()}
+    por_tenant: list[ContasPagarResumoGrupo] = []
+    for tid, name, rows in per_tenant:
+        for dimension, label, quantidade, original, final in rows:
+            acc = groups[dimension].setdefault(label, [0, Decimal(0), Decimal(0)])
+            acc[0] += quantidade
+            acc[1] += original
+            acc[2] += final
+            if dimension == "Total":
+                por_tenant.append(
+                    ContasPagarResumoGrupo(
+                        Grupo=name, TenantId=tid, Quantidade=quantidade, ValorOriginal=float(original), ValorFinal=float(final)
+                    )
+                )
+
+    def _grupos(dimension: str) -> list[ContasPagarResumoGrupo]:
+        items = sorted(groups[dimension].items(), key=lambda kv: (kv[0] is None, kv[0] or ""))
+        return [
+            ContasPagarResumoGrupo(Grupo=label, Quantidade=acc[0], ValorOriginal=float(acc[1]), ValorFinal=float(acc[2]))
+            for label, acc in items
+        ]
+
+    total = groups["Total"].get(None, [0, Decimal(0), Decimal(0)])
+    return ContasPagarResumoOut(
+        Total=ContasPagarResumoGrupo(Quantidade=total[0], ValorOriginal=float(total[1]), ValorFinal=float(total[2])),
+        PorStatusPagamento=_grupos("PorStatusPagamento"),
+        PorMes=_grupos("PorMes"),
+        PorCredor=_grupos("PorCredor"),
+        PorTenant=por_tenant,
     )
 
 
 @app.get("/api/contas-pagar", response_model=list[ContasPagarOut])
-def list_contas_pagar(
+async def list_contas_pagar(
+    request: Request,
+    response: Response,
     empresa: Optional[str] = None,
-    db: Session = Depends(get_tenant_db),
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    fields: Optional[str] = None,
+    filters: list[Any] = Depends(_contas_pagar_filters),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
-) -> list[ContasPagarOut]:
+) -> Response:
+    ticket = _response_cache_ticket(request, auth)
     empresa_in = empresa.strip() if isinstance(empresa, str) and empresa.strip() else None
     if _is_executive_tenant(auth) and empresa_in and empresa_in.strip().lower() == "executive":
         empresa_in = None
+    page = _list_page("ContasPagar", sort=sort, cursor=cursor, limit=limit, fields=fields)
 
     if _is_superadmin(auth) or _is_executive_tenant(auth):
-        stmt_tenants = select(TenantsModel)
-        if empresa_in:
-            stmt_tenants = stmt_tenants.where(or_(TenantsModel.Tenant == empresa_in, TenantsModel.Slug == empresa_in.lower()))
-        tenants = db.execute(stmt_tenants.order_by(TenantsModel.IdTenant.asc())).scalars().all()
-
-        out: list[ContasPagarOut] = []
-        for t in tenants:
-            _ensure_tenant_columns_for_auth(tenant_id=int(t.IdTenant), tenant_slug=str(t.Slug or ""))
-            if str(t.Slug or "").lower() == "executive":
-                stmt = (
-                    select(ContasPagarModel)
-                    .where(ContasPagarModel.Empresa == str(t.Tenant))
-                    .order_by(ContasPagarModel.IdContasPagar.asc())
-                )
-                rows = db.execute(stmt).scalars().all()
-            else:
-                db_name = _tenant_db_name(tenant_id=int(t.IdTenant), slug=str(t.Slug))
-                TenantSession = _tenant_sessionmaker(db_name)
-                with TenantSession() as tdb:
-                    stmt = select(ContasPagarModel).order_by(ContasPagarModel.IdContasPagar.asc())
-                    rows = tdb.execute(stmt).scalars().all()
-            out.extend([_as_out(r) for r in rows])
+        tenants = await _fan_out_tenant_targets(empresa_in)
+        cached = _cached_or_not_modified(request, response, auth, ticket, await _fan_out_table_versions(tenants, "ContasPagar"))
+        if cached is not None:
+            return cached
+
+        def _stmt(tid: int, slug: str, name: str) -> Any:
+            stmt = _list_select(page).where(*filters)
+            if slug == "executive":
+                stmt = stmt.where(ContasPagarModel.Empresa == name)
+            return stmt
+
+        return _response_cache_store(ticket, "ContasPagar", "*", await _fan_out_list(response, tenants, page, _stmt))
+
+    cached = _cached_or_not_modified(request, response, auth, ticket, await _table_version(db, "ContasPagar"))
+    if cached is not None:
+        return cached
+    rows = (await db.execute(_apply_list_page(_list_select(page).where(*filters), page))).all()
+    tid = int(auth.get("tenant_id") or 0)
+    listed = _list_response(response, page, ((tid, r) for r in _finish_list_page(response, page, rows)))
+    return _response_cache_store(ticket, "ContasPagar", _session_db_name(db), listed)
+
 
-        out.sort(key=lambda r: (str(r.Empresa or ""), int(r.IdContasPagar or 0)))
-        return out
+@app.get("/api/contas-pagar/resumo", response_model=ContasPagarResumoOut)
+async def resumo_contas_pagar(
+    request: Request,
+    response: Response,
+    empresa: Optional[str] = None,
+    filters: list[Any] = Depends(_contas_pagar_filters),
+    db: AsyncSession = Depends(get_tenant_db),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> ContasPagarResumoOut:
+    empresa_in = empresa.strip() if isinstance(empresa, str) and empresa.strip() else None
+    if _is_executive_tenant(auth) and empresa_in and empresa_in.strip().lower() == "executive":
+        empresa_in = None
+
+    if _is_superadmin(auth) or _is_executive_tenant(auth):
+        tenants = await _fan_out_tenant_targets(empresa_in)
+        not_modified = _not_modified(request, response, auth, await _fan_out_table_versions(tenants, "ContasPagar"))
+        if not_modified is not None:
+            return not_modified
+
+        async def _query(tdb: AsyncSession, tid: int, slug: str, name: str) -> list[Any]:
+            tenant_filters = list(filters)
+            if slug == "executive":
+                tenant_filters.append(ContasPagarModel.Empresa == name)
+            return [(tid, name, await _contas_pagar_resumo_rows(tdb, tenant_filters))]
 
-    stmt = select(ContasPagarModel).order_by(ContasPagarModel.IdContasPagar.asc())
-    rows = db.execute(stmt).scalars().all()
-    return [_as_out(r) for r in rows]
+        results, skipped, timed_out = await _fan_out_tenants(tenants, _query)
+        _set_fan_out_headers(response, skipped, timed_out)
+        return _contas_pagar_resumo_out([item for result in results for item in result])
+
+    tid = int(auth.get("tenant_id") or 0)
+    name = await _tenant_name_from_id_async(tid) or str(auth.get("tenant_slug") or "")
+    not_modified = _not_modified(request, response, auth, (name, await _table_version(db, "ContasPagar")))
+    if not_modified is not None:
+        return not_modified
+    return _contas_pagar_resumo_out([(tid, name, await _contas_pagar_resumo_rows(db, filters))])
+
+
+@app.get("/api/contas-pagar/export")
+async def export_contas_pagar(
+    formato: str = Query("csv", alias="format"),
+    fields: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    filters: list[Any] = Depends(_contas_pagar_filters),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> StreamingResponse:
+    return await _export_response(
+        "ContasPagar",
+        auth=auth,
+        formato=formato,
+        fields=fields,
+        tenant_id=tenant_id,
+        empresa=empresa,
+        empresa_column=ContasPagarModel.Empresa,
+        filters=filters,
+    )
 
 
 @app.get("/api/contas-pagar/{id_contas_pagar}", response_model=ContasPagarOut)
-def get_contas_pagar(
+async def get_contas_pagar(
     id_contas_pagar: int,
-    db: Session = Depends(get_tenant_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ContasPagarOut:
-    row = db.get(ContasPagarModel, id_contas_pagar)
+    not_modified = _not_modified(request, response, auth, await _table_version(db, "ContasPagar"))
+    if not_modified is not None:
+        return not_modified
+    row = await _get_row(db, "ContasPagar", id_contas_pagar)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta a pagar não encontrada")
     return _as_out(row)
 
 
+async def _contas_pagar_new(tdb: AsyncSession, payload: ContasPagarCreate, ctx: dict[str, Any]) -> ContasPagarModel:
+    data = payload.model_dump()
+    data["TenantId"] = ctx["tenant_id"] if ctx["tenant_id"] > 0 else None
+    data["Tenant"] = ctx["tenant_name"]
+    tipo_pagamento = (data.get("TipoPagamento") or "").strip()
+    parcelas = data.get("Parcelas")
+    if tipo_pagamento.upper() in {"COTA UNICA", "COTA_UNICA", "COTAÚNICA", "COTA ÚNICA"}:
+        data["TipoPagamento"] = "COTA_UNICA"
+        data["Parcelas"] = 1
+        parcelas = 1
+    elif tipo_pagamento.upper() in {"PARCELAS", "PARCELA"}:
+        data["TipoPagamento"] = "PARCELAS"
+
+    if data.get("ValorFinal") is None:
+        data["ValorFinal"] = _calc_valor_final(data.get("ValorOriginal"), parcelas, data.get("Desconto"), data.get("Acrescimo"))
+
+    devedor_id = data.get("DevedorIdExecutivo")
+    if devedor_id and not data.get("Devedor"):
+        exec_row = await tdb.get(ExecutivoModel, int(devedor_id))
+        if exec_row:
+            data["Devedor"] = exec_row.Executivo
+
+    return ContasPagarModel(**data)
+
+
+async def _contas_pagar_apply(tdb: AsyncSession, row: ContasPagarModel, payload: ContasPagarUpdate, ctx: dict[str, Any]) -> None:
+    data = _apply_stripped(row, payload)
+    _stamp_tenant(row, ctx)
+
+    tipo_pagamento = (row.TipoPagamento or "").strip()
+    if tipo_pagamento.upper() in {"COTA UNICA", "COTA_UNICA", "COTAÚNICA", "COTA ÚNICA"}:
+        row.TipoPagamento = "COTA_UNICA"
+        row.Parcelas = 1
+    elif tipo_pagamento.upper() in {"PARCELAS", "PARCELA"}:
+        row.TipoPagamento = "PARCELAS"
+
+    if payload.ValorFinal is None and any(
+        key in data for key in ("ValorOriginal", "Parcelas", "Desconto", "Acrescimo", "TipoPagamento")
+    ):
+        row.ValorFinal = _calc_valor_final(
+            float(row.ValorOriginal) if row.ValorOriginal is not None else None,
+            row.Parcelas,
+            float(row.Desconto) if row.Desconto is not None else None,
+            float(row.Acrescimo) if row.Acrescimo is not None else None,
+        )
+
+    if row.DevedorIdExecutivo and ("DevedorIdExecutivo" in data) and not row.Devedor:
+        exec_row = await tdb.get(ExecutivoModel, int(row.DevedorIdExecutivo))
+        if exec_row:
+            row.Devedor = exec_row.Executivo
+
+
 @app.post("/api/contas-pagar", response_model=ContasPagarOut, status_code=status.HTTP_201_CREATED)
-def create_contas_pagar(
+async def create_contas_pagar(
     payload: ContasPagarCreate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ContasPagarOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
-
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        data = payload.model_dump()
-        data["TenantId"] = target_tenant_id if target_tenant_id > 0 else None
-        data["Tenant"] = tenant_name
-        tipo_pagamento = (data.get("TipoPagamento") or "").strip()
-        parcelas = data.get("Parcelas")
-        if tipo_pagamento.upper() in {"COTA UNICA", "COTA_UNICA", "COTAÚNICA", "COTA ÚNICA"}:
-            data["TipoPagamento"] = "COTA_UNICA"
-            data["Parcelas"] = 1
-            parcelas = 1
-        elif tipo_pagamento.upper() in {"PARCELAS", "PARCELA"}:
-            data["TipoPagamento"] = "PARCELAS"
-
-        if data.get("ValorFinal") is None:
-            data["ValorFinal"] = _calc_valor_final(data.get("ValorOriginal"), parcelas, data.get("Desconto"), data.get("Acrescimo"))
-
-        devedor_id = data.get("DevedorIdExecutivo")
-        if devedor_id and not data.get("Devedor"):
-            exec_row = tdb.get(ExecutivoModel, int(devedor_id))
-            if exec_row:
-                data["Devedor"] = exec_row.Executivo
-
-        row = ContasPagarModel(**data)
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await _contas_pagar_new(tdb, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
         tdb.add(row)
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("ContasPagar", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar conta a pagar")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _as_out(row)
 
 
 @app.put("/api/contas-pagar/{id_contas_pagar}", response_model=ContasPagarOut)
-def update_contas_pagar(
+async def update_contas_pagar(
     id_contas_pagar: int,
     payload: ContasPagarUpdate,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ContasPagarOut:
     auth_tenant_id = int(auth.get("tenant_id") or 0)
     target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
-    target_meta = _tenant_meta_from_id(target_tenant_id) if target_tenant_id > 0 else None
-    tenant_name = (target_meta[2] if target_meta else None) or _tenant_name_from_id(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
 
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ContasPagarModel, id_contas_pagar)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ContasPagarModel, id_contas_pagar)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta a pagar não encontrada")
-
-        data: dict[str, Any] = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if isinstance(v, str):
-                v = v.strip()
-            setattr(row, k, v)
-
-        if target_tenant_id > 0 and (getattr(row, "TenantId", None) is None or int(getattr(row, "TenantId") or 0) == 0):
-            row.TenantId = target_tenant_id
-        if not getattr(row, "Tenant", None):
-            row.Tenant = tenant_name
-
-        tipo_pagamento = (row.TipoPagamento or "").strip()
-        if tipo_pagamento.upper() in {"COTA UNICA", "COTA_UNICA", "COTAÚNICA", "COTA ÚNICA"}:
-            row.TipoPagamento = "COTA_UNICA"
-            row.Parcelas = 1
-        elif tipo_pagamento.upper() in {"PARCELAS", "PARCELA"}:
-            row.TipoPagamento = "PARCELAS"
-
-        if payload.ValorFinal is None and any(
-            key in data for key in ("ValorOriginal", "Parcelas", "Desconto", "Acrescimo", "TipoPagamento")
-        ):
-            row.ValorFinal = _calc_valor_final(
-                float(row.ValorOriginal) if row.ValorOriginal is not None else None,
-                row.Parcelas,
-                float(row.Desconto) if row.Desconto is not None else None,
-                float(row.Acrescimo) if row.Acrescimo is not None else None,
-            )
-
-        if row.DevedorIdExecutivo and ("DevedorIdExecutivo" in data) and not row.Devedor:
-            exec_row = tdb.get(ExecutivoModel, int(row.DevedorIdExecutivo))
-            if exec_row:
-                row.Devedor = exec_row.Executivo
+        await _contas_pagar_apply(tdb, row, payload, {"tenant_id": target_tenant_id, "tenant_name": tenant_name})
 
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("ContasPagar", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao atualizar conta a pagar")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _as_out(row)
 
 
 @app.delete("/api/contas-pagar/{id_contas_pagar}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_contas_pagar(
+async def delete_contas_pagar(
     id_contas_pagar: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> None:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ContasPagarModel, id_contas_pagar)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ContasPagarModel, id_contas_pagar)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta a pagar não encontrada")
-        tdb.delete(row)
-        tdb.commit()
+        await tdb.delete(row)
+        await tdb.commit()
+        _invalidate_response_cache("ContasPagar", _session_db_name(tdb))
+
+
+async def _contas_pagar_bulk_prefetch(tdb: AsyncSession, items: list[BaseModel]) -> None:
+    ids = {int(item.DevedorIdExecutivo) for item in items if getattr(item, "DevedorIdExecutivo", None)}
+    if ids:
+        await tdb.execute(select(ExecutivoModel).where(ExecutivoModel.IdExecutivo.in_(ids)))
+
+
+_BULK_RESOURCES: dict[str, dict[str, Any]] = {
+    "executivos": {
+        "model": ExecutivoModel, "pk": ExecutivoModel.IdExecutivo, "table": "Executivos",
+        "create": ExecutivoCreate, "update": ExecutivoUpdate, "new": _executivo_new, "apply": _executivo_apply,
+        "not_found": "Executivo não encontrado",
+    },
+    "ativos": {
+        "model": AtivoModel, "pk": AtivoModel.IdAtivo, "table": "Ativos",
+        "create": AtivoCreate, "update": AtivoUpdate, "new": _ativo_new, "apply": _ativo_apply,
+        "not_found": "Ativo não encontrado",
+    },
+    "centro-custos": {
+        "model": CentroCustosModel, "pk": CentroCustosModel.IdCustos, "table": "CentroCustos",
+        "create": CentroCustosCreate, "update": CentroCustosUpdate, "new": _centro_custos_new, "apply": _centro_custos_apply,
+        "not_found": "Centro de custos não encontrado",
+    },
+    "departamentos": {
+        "model": DepartamentoModel, "pk": DepartamentoModel.IdDepartamento, "table": "Departamentos",
+        "create": DepartamentoCreate, "update": DepartamentoUpdate, "new": _departamento_new, "apply": _departamento_apply,
+        "not_found": "Departamento não encontrado", "ensure_ready": True,
+    },
+    "funcoes": {
+        "model": FuncaoModel, "pk": FuncaoModel.IdFuncao, "table": "Funcoes",
+        "create": FuncaoCreate, "update": FuncaoUpdate, "new": _funcao_new, "apply": _funcao_apply,
+        "not_found": "Função não encontrada", "ensure_ready": True,
+    },
+    "colaboradores": {
+        "model": ColaboradorModel, "pk": ColaboradorModel.IdColaborador, "table": "Colaboradores",
+        "create": ColaboradorCreate, "update": ColaboradorUpdate, "new": _colaborador_new, "apply": _colaborador_apply,
+        "not_found": "Colaborador não encontrado", "ensure_ready": True,
+    },
+    "contas-pagar": {
+        "model": ContasPagarModel, "pk": ContasPagarModel.IdContasPagar, "table": "ContasPagar",
+        "create": ContasPagarCreate, "update": ContasPagarUpdate, "new": _contas_pagar_new, "apply": _contas_pagar_apply,
+        "not_found": "Conta a pagar não encontrada", "prefetch": _contas_pagar_bulk_prefetch,
+    },
+}
+
+
+def _bulk_validation_message(exc: ValidationError) -> str:
+    parts = []
+    for err in exc.errors():
+        loc = ".".join(str(p) for p in err.get("loc") or ())
+        parts.append(f"{loc}: {err.get('msg')}" if loc else str(err.get("msg")))
+    return "; ".join(parts) or "Dados inválidos"
+
+
+@app.post("/api/{resource}/bulk", response_model=BulkOut)
+async def bulk_resource(
+    resource: str,
+    payload: BulkIn,
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    db: AsyncSession = Depends(get_tenant_db),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> BulkOut:
+    spec = _BULK_RESOURCES.get(resource)
+    if spec is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurso não encontrado")
+    model = spec["model"]
+    pk = spec["pk"]
+
+    auth_tenant_id = int(auth.get("tenant_id") or 0)
+    target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_slug = (target_meta[1] if target_meta else None) or str(auth.get("tenant_slug") or "").strip().lower()
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or tenant_slug or None
+    if spec.get("ensure_ready"):
+        await _ensure_tenant_database_ready_async(tenant_id=target_tenant_id, tenant_slug=tenant_slug)
+    ctx = {
+        "tenant_id": target_tenant_id,
+        "tenant_name": tenant_name,
+        "cadastrante": str(auth.get("nome") or auth.get("usuario") or "").strip() or None,
+    }
+
+    results: list[BulkItemOut] = []
+    creates: list[tuple[BulkItemOut, BaseModel]] = []
+    updates: list[tuple[BulkItemOut, BaseModel]] = []
+    deletes: list[BulkItemOut] = []
+    seen_ids: set[int] = set()
+    for index, op in enumerate(payload.Operacoes):
+        item = BulkItemOut(Indice=index, Operacao=op.Operacao, Status=status.HTTP_200_OK, Id=op.Id)
+        results.append(item)
+        if op.Operacao != "create":
+            if op.Id is None:
+                item.Status, item.Erro = status.HTTP_422_UNPROCESSABLE_ENTITY, "Id obrigatório"
+                continue
+            if op.Id in seen_ids:
+                item.Status, item.Erro = status.HTTP_409_CONFLICT, "Registro repetido no lote"
+                continue
+            seen_ids.add(op.Id)
+        if op.Operacao == "delete":
+            item.Status = status.HTTP_204_NO_CONTENT
+            deletes.append(item)
+            continue
+        try:
+            data = spec["create" if op.Operacao == "create" else "update"].model_validate(op.Dados or {})
+        except ValidationError as exc:
+            item.Status, item.Erro = status.HTTP_422_UNPROCESSABLE_ENTITY, _bulk_validation_message(exc)
+            continue
+        if op.Operacao == "create":
+            item.Status, item.Id = status.HTTP_201_CREATED, None
+            creates.append((item, data))
+        else:
+            updates.append((item, data))
+
+    def _summary(applied: bool) -> BulkOut:
+        return BulkOut(
+            Aplicado=applied,
+            Criados=len(creates) if applied else 0,
+            Atualizados=len(updates) if applied else 0,
+            Excluidos=len(deletes) if applied else 0,
+            Erros=sum(1 for r in results if r.Erro and r.Status != status.HTTP_424_FAILED_DEPENDENCY),
+            Resultados=results,
+        )
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        found: dict[int, Any] = {}
+        if seen_ids:
+            rows = (await tdb.execute(select(model).where(pk.in_(seen_ids)).order_by(pk).with_for_update())).scalars().all()
+            found = {int(getattr(r, pk.key)): r for r in rows}
+        for item in [u[0] for u in updates] + deletes:
+            if item.Id not in found:
+                item.Status, item.Erro = status.HTTP_404_NOT_FOUND, spec["not_found"]
+        if any(r.Erro for r in results):
+            for item in results:
+                if not item.Erro:
+                    item.Status, item.Erro = status.HTTP_424_FAILED_DEPENDENCY, "Lote não aplicado"
+            await tdb.rollback()
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=_summary(False).model_dump())
+
+        try:
+            if spec.get("prefetch"):
+                await spec["prefetch"](tdb, [d for _, d in creates] + [d for _, d in updates])
+            new_rows = [await spec["new"](tdb, data, ctx) for _, data in creates]
+            tdb.add_all(new_rows)
+            for item, data in updates:
+                await spec["apply"](tdb, found[int(item.Id)], data, ctx)
+            await tdb.flush()
+            if deletes:
+                await tdb.execute(
+                    delete(model)
+                    .where(pk.in_([int(item.Id) for item in deletes]))
+                    .execution_options(synchronize_session=False)
+                )
+            await tdb.commit()
+            _invalidate_response_cache(spec["table"], _session_db_name(tdb))
+        except IntegrityError:
+            await tdb.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao processar lote")
+
+        for (item, _), row in zip(creates, new_rows):
+            item.Id = int(getattr(row, pk.key))
+        return _summary(True)
+
+
+IMPORT_CHUNK_BYTES = 1024 * 1024
+IMPORT_STAGING_TABLE = '"_Import"'
+IMPORT_VALIDATED_TABLE = '"_ImportValidado"'
+
+
+async def _contas_pagar_import_normalize(tdb: AsyncSession) -> None:
+    await tdb.execute(
+        text(
+            f"""
+            update {IMPORT_VALIDATED_TABLE} set
+                "TipoPagamento" = case
+                    when upper("TipoPagamento") in ('COTA UNICA', 'COTA_UNICA', 'COTAÚNICA', 'COTA ÚNICA') then 'COTA_UNICA'
+                    when upper("TipoPagamento") in ('PARCELAS', 'PARCELA') then 'PARCELAS'
+                    else "TipoPagamento"
+                end,
+                "Parcelas" = case
+                    when upper("TipoPagamento") in ('COTA UNICA', 'COTA_UNICA', 'COTAÚNICA', 'COTA ÚNICA') then 1
+                    else "Parcelas"
+                end
+            where "TipoPagamento" is not null
+            """
+        )
+    )
+    await tdb.execute(
+        text(
+            f"""
+            update {IMPORT_VALIDATED_TABLE} set "ValorFinal" =
+                greatest(0, "ValorOriginal" - coalesce("Desconto", 0) + coalesce("Acrescimo", 0))
+                / greatest(coalesce("Parcelas", 1), 1)
+            where "ValorFinal" is null and "ValorOriginal" is not null
+            """
+        )
+    )
+    await tdb.execute(
+        text(
+            f"""
+            update {IMPORT_VALIDATED_TABLE} i set "Devedor" = e."Executivo"
+            from "{SCHEMA_NAME}"."Executivos" e
+            where e."IdExecutivo" = i."DevedorIdExecutivo" and i."Devedor" is null
+            """
+        )
+    )
+
+
+_IMPORT_RESOURCES: dict[str, dict[str, Any]] = {
+    "contas-pagar": {
+        "model": ContasPagarModel, "schema": ContasPagarCreate, "table": "ContasPagar",
+        "normalize": _contas_pagar_import_normalize,
+    },
+    "ativos": {
+        "model": AtivoModel, "schema": AtivoCreate, "table": "Ativos",
+    },
+}
+
+
+def _import_header_key(name: Any) -> str:
+    folded = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]", "", folded.lower())
+
+
+def _import_columns(schema: type[BaseModel], header: list[Any]) -> list[str]:
+    fields = {_import_header_key(name): name for name in schema.model_fields}
+    columns: list[str] = []
+    unknown: list[str] = []
+    for raw in header:
+        name = fields.get(_import_header_key(raw))
+        if name is None:
+            unknown.append(str(raw or "").strip() or "(vazio)")
+        else:
+            columns.append(name)
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Colunas desconhecidas: {', '.join(unknown)}")
+    repeated = sorted({c for c in columns if columns.count(c) > 1})
+    if repeated:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Colunas repetidas: {', '.join(repeated)}")
+    missing = [name for name, info in schema.model_fields.items() if info.is_required() and name not in columns]
+    if missing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+    return columns
+
+
+def _import_validate_sql(model: Any, schema: type[BaseModel]) -> str:
+    texts: list[str] = []
+    flags: list[str] = []
+    values: list[str] = []
+    checks: list[str] = []
+    for name, info in schema.model_fields.items():
+        column_type = model.__table__.c[name].type
+        raw = f"nullif(btrim(\"{name}\"), '')"
+        limits = {k: getattr(m, k) for m in info.metadata for k in ("max_length", "ge", "le") if getattr(m, k, None) is not None}
+        sql_type: Optional[str] = None
+        if isinstance(column_type, Date):
+            texts.append(f"regexp_replace({raw}, '^(\\d{{1,2}})/(\\d{{1,2}})/(\\d{{4}})$', '\\3-\\2-\\1') as \"{name}\"")
+            sql_type, invalid = "date", "data inválida"
+        elif isinstance(column_type, Integer):
+            texts.append(f"{raw} as \"{name}\"")
+            sql_type, invalid = "integer", "número inteiro inválido"
+        elif isinstance(column_type, Numeric):
+            amount = f"replace(replace({raw}, 'R$', ''), ' ', '')"
+            texts.append(f"case when strpos({amount}, ',') > 0 then replace(replace({amount}, '.', ''), ',', '.') else {amount} end as \"{name}\"")
+            sql_type, invalid = f"numeric({column_type.precision}, {column_type.scale})", "número inválido"
+        else:
+            texts.append(f"{raw} as \"{name}\"")
+
+        value = f"v.\"{name}\""
+        required = f"'{name}: obrigatório'" if info.is_required() else "null"
+        case = [f"when {value} is null then {required}"]
+        if sql_type is None:
+            if "max_length" in limits:
+                size = int(limits["max_length"])
+                case.append(f"when char_length({value}) > {size} then '{name}: máximo de {size} caracteres'")
+            values.append(f"{value} as \"{name}\"")
+        else:
+            flags.append(f"\"{SCHEMA_NAME}\".\"fn_ImportValido\"(t.\"{name}\", '{sql_type}') as \"{name}__ok\"")
+            valid = f"v.\"{name}__ok\""
+            case.append(f"when not {valid} then '{name}: {invalid}'")
+            if "ge" in limits:
+                case.append(f"when {value}::{sql_type} < {limits['ge']} then '{name}: deve ser maior ou igual a {limits['ge']}'")
+            if "le" in limits:
+                case.append(f"when {value}::{sql_type} > {limits['le']} then '{name}: deve ser menor ou igual a {limits['le']}'")
+            values.append(f"case when {valid} then {value}::{sql_type} end as \"{name}\"")
+        checks.append(f"case {' '.join(case)} end")
+
+    return f"""
+        create temp table {IMPORT_VALIDATED_TABLE} on commit drop as
+        select v."Linha", {", ".join(values)}, array_remove(array[{", ".join(checks)}]::text[], null) as "Erros"
+        from (
+            select t.*{"".join(f", {flag}" for flag in flags)}
+            from (select "Linha", {", ".join(texts)} from {IMPORT_STAGING_TABLE}) t
+            offset 0
+        ) v
+    """
+
+
+def _import_cell(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+async def _import_copy_csv(cur: Any, file: UploadFile, schema: type[BaseModel], max_bytes: int) -> None:
+    buf = b""
+    while b"\n" not in buf and len(buf) <= max_bytes:
+        chunk = await file.read(IMPORT_CHUNK_BYTES)
+        if not chunk:
+            break
+        buf += chunk
+    line, _, rest = buf.partition(b"\n")
+    try:
+        header_text = line.decode("utf-8-sig").rstrip("\r")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo deve estar em UTF-8")
+    if not header_text.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo vazio")
+    delimiter = ";" if header_text.count(";") > header_text.count(",") else ","
+    columns = _import_columns(schema, next(csv.reader([header_text], delimiter=delimiter)))
+
+    total = len(buf)
+    names = ", ".join(f'"{c}"' for c in columns)
+    async with cur.copy(f"copy {IMPORT_STAGING_TABLE} ({names}) from stdin with (format csv, delimiter '{delimiter}')") as copy:
+        if rest:
+            await copy.write(rest)
+        while chunk := await file.read(IMPORT_CHUNK_BYTES):
+            total += len(chunk)
+            if total > max_bytes:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Arquivo muito grande")
+            await copy.write(chunk)
+
+
+async def _import_copy_xlsx(cur: Any, file: UploadFile, schema: type[BaseModel]) -> None:
+    try:
+        workbook = await run_in_threadpool(openpyxl.load_workbook, file.file, read_only=True, data_only=True)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Planilha inválida")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(await run_in_threadpool(next, rows, ()))
+        while header and (header[-1] is None or not str(header[-1]).strip()):
+            header.pop()
+        if not header:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo vazio")
+        columns = _import_columns(schema, header)
+        width = len(columns)
+
+        names = ", ".join(f'"{c}"' for c in columns)
+        line = 1
+        async with cur.copy(f'copy {IMPORT_STAGING_TABLE} ("Linha", {names}) from stdin') as copy:
+            while batch := await run_in_threadpool(lambda: list(islice(rows, 1000))):
+                for values in batch:
+                    line += 1
+                    cells = [_import_cell(v) for v in values[:width]]
+                    if not any(c is not None and c.strip() for c in cells):
+                        continue
+                    await copy.write_row([line, *cells, *([None] * (width - len(cells)))])
+    finally:
+        workbook.close()
+
+
+@app.post("/api/{resource}/import", response_model=ImportOut)
+async def import_resource(
+    resource: str,
+    file: UploadFile = File(...),
+    parcial: bool = Query(False),
+    tenant_id: Optional[int] = Query(None, alias="tenant_id"),
+    db: AsyncSession = Depends(get_tenant_db),
+    auth: dict[str, Any] = Depends(_require_auth),
+) -> ImportOut:
+    spec = _IMPORT_RESOURCES.get(resource)
+    if spec is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurso não encontrado")
+    model = spec["model"]
+    schema = spec["schema"]
+    max_bytes = max(1, _env_int("IMPORT_MAX_BYTES", 100 * 1024 * 1024))
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Arquivo muito grande")
+
+    auth_tenant_id = int(auth.get("tenant_id") or 0)
+    target_tenant_id = int(tenant_id) if (tenant_id is not None and (_is_superadmin(auth) or _is_executive_tenant(auth))) else auth_tenant_id
+    target_meta = await _tenant_meta_from_id_async(target_tenant_id) if target_tenant_id > 0 else None
+    tenant_name = (target_meta[2] if target_meta else None) or await _tenant_name_from_id_async(auth_tenant_id) or str(auth.get("tenant_slug") or "").strip() or None
+
+    is_xlsx = (await file.read(4)) == b"PK\x03\x04"
+    await file.seek(0)
+
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        staging_columns = ", ".join(f'"{name}" text' for name in schema.model_fields)
+        await tdb.execute(
+            text(
+                f"""
+                create temp table {IMPORT_STAGING_TABLE} (
+                    "Linha" bigint generated by default as identity (start with 2),
+                    {staging_columns}
+                ) on commit drop
+                """
+            )
+        )
+        raw = (await (await tdb.connection()).get_raw_connection()).driver_connection
+        try:
+            async with raw.cursor() as cur:
+                if is_xlsx:
+                    await _import_copy_xlsx(cur, file, schema)
+                else:
+                    await _import_copy_csv(cur, file, schema, max_bytes)
+        except psycopg.Error as exc:
+            await tdb.rollback()
+            detail = getattr(exc.diag, "message_primary", None) or str(exc)
+            context = getattr(exc.diag, "context", None)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Arquivo inválido: {detail}" + (f" ({context})" if context else ""))
+
+        await tdb.execute(text(_import_validate_sql(model, schema)))
+        if spec.get("normalize"):
+            await spec["normalize"](tdb)
+
+        total, rejected = (
+            await tdb.execute(text(f'select count(*), count(*) filter (where cardinality("Erros") > 0) from {IMPORT_VALIDATED_TABLE}'))
+        ).one()
+        report = [
+            ImportErroOut(Linha=int(line), Erros=list(errors))
+            for line, errors in await tdb.execute(
+                text(f'select "Linha", "Erros" from {IMPORT_VALIDATED_TABLE} where cardinality("Erros") > 0 order by "Linha" limit :n'),
+                {"n": max(0, _env_int("IMPORT_MAX_ERRORS", 1000))},
+            )
+        ]
+        if rejected and not parcial:
+            await tdb.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=ImportOut(Aplicado=False, Linhas=int(total), Importados=0, Rejeitados=int(rejected), Relatorio=report).model_dump(),
+            )
+
+        names = ", ".join(f'"{name}"' for name in schema.model_fields)
+        try:
+            result = await tdb.execute(
+                text(
+                    f"""
+                    insert into "{SCHEMA_NAME}"."{model.__tablename__}" ({names}, "TenantId", "Tenant")
+                    select {names}, :tenant_id, :tenant_name from {IMPORT_VALIDATED_TABLE}
+                    where cardinality("Erros") = 0
+                    order by "Linha"
+                    """
+                ),
+                {"tenant_id": target_tenant_id if target_tenant_id > 0 else None, "tenant_name": tenant_name},
+            )
+            await tdb.commit()
+            _invalidate_response_cache(spec["table"], _session_db_name(tdb))
+        except IntegrityError:
+            await tdb.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao importar arquivo")
+        return ImportOut(Aplicado=True, Linhas=int(total), Importados=int(result.rowcount or 0), Rejeitados=int(rejected), Relatorio=report)
 
 
 @app.post("/api/contas-pagar/{id_contas_pagar}/documento", response_model=ContasPagarOut)
@@ -3553,40 +6331,43 @@ async def upload_documento(
     id_contas_pagar: int,
     file: UploadFile = File(...),
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ContasPagarOut:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ContasPagarModel, id_contas_pagar)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ContasPagarModel, id_contas_pagar)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta a pagar não encontrada")
 
         original_name = file.filename or "documento"
-        content = await file.read()
-        if len(content) > 100 * 1024 * 1024:
-            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Arquivo muito grande")
         safe_name = _sanitize_segment(Path(original_name).name).replace(" ", "_") or "documento"
-        media_id = _nestjs_upload_media(filename=safe_name, content_type=file.content_type, content=content)
+        media_id = await _nestjs_upload_media(
+            filename=safe_name,
+            content_type=file.content_type,
+            chunks=_upload_file_chunks(file),
+            size=file.size,
+        )
 
         row.DocumentoPath = f"media:{media_id}"
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("ContasPagar", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao salvar documento")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _as_out(row)
 
 
 @app.post("/api/contas-pagar/{id_contas_pagar}/documento/baixar-url", response_model=ContasPagarOut)
-def baixar_documento_url(
+async def baixar_documento_url(
     id_contas_pagar: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ) -> ContasPagarOut:
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ContasPagarModel, id_contas_pagar)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ContasPagarModel, id_contas_pagar)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta a pagar não encontrada")
         url = (row.URLCobranca or "").strip()
@@ -3598,34 +6379,42 @@ def baixar_documento_url(
         safe_name = _sanitize_segment(parsed_name).replace(" ", "_")
 
         try:
-            with urllib.request.urlopen(url, timeout=30) as resp:
-                content = resp.read()
+            source = await _media_get(url, timeout=_media_timeout("MEDIA_FETCH_TIMEOUT_SECONDS", 30), follow_redirects=True)
+            try:
+                source.raise_for_status()
+                media_id = await _nestjs_upload_media(
+                    filename=safe_name or "documento",
+                    content_type=None,
+                    chunks=source.aiter_raw(MEDIA_CHUNK_BYTES),
+                )
+            finally:
+                await source.aclose()
+        except HTTPException:
+            raise
         except Exception:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao baixar documento do URLCobranca")
 
-        if len(content) > 100 * 1024 * 1024:
-            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Arquivo muito grande")
-        media_id = _nestjs_upload_media(filename=safe_name or "documento", content_type=None, content=content)
-
         row.DocumentoPath = f"media:{media_id}"
         try:
-            tdb.commit()
+            await tdb.commit()
+            _invalidate_response_cache("ContasPagar", _session_db_name(tdb))
         except IntegrityError:
-            tdb.rollback()
+            await tdb.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao salvar documento")
-        tdb.refresh(row)
+        await tdb.refresh(row)
         return _as_out(row)
 
 
 @app.get("/api/contas-pagar/{id_contas_pagar}/documento")
-def download_documento(
+async def download_documento(
+    request: Request,
     id_contas_pagar: int,
     tenant_id: Optional[int] = Query(None, alias="tenant_id"),
-    db: Session = Depends(get_tenant_db),
+    db: AsyncSession = Depends(get_tenant_db),
     auth: dict[str, Any] = Depends(_require_auth),
 ):
-    with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
-        row = tdb.get(ContasPagarModel, id_contas_pagar)
+    async with _target_tenant_session(db=db, auth=auth, tenant_id=tenant_id) as tdb:
+        row = await tdb.get(ContasPagarModel, id_contas_pagar)
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta a pagar não encontrada")
         if not row.DocumentoPath:
@@ -3634,17 +6423,46 @@ def download_documento(
         doc_ref = str(row.DocumentoPath).strip()
         if _is_media_ref(doc_ref):
             media_id = _media_id_from_ref(doc_ref)
+            cache_key = media_id.lower()
+            headers: dict[str, str] = {"ETag": _media_etag(cache_key), "Cache-Control": MEDIA_CACHE_CONTROL}
+            if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            cached = await run_in_threadpool(_media_cache_lookup, cache_key)
+            if cached is not None:
+                fh, meta, st = cached
+                if meta.get("disposition"):
+                    headers["Content-Disposition"] = str(meta["disposition"])
+                return _file_range_response(request, fh, st, media_type=str(meta["content_type"]), headers=headers)
+
+            headers["Accept-Ranges"] = "bytes"
+            range_header = request.headers.get("range")
+            if not _if_range_matches(request.headers.get("if-range"), headers["ETag"]):
+                range_header = None
             url = _nestjs_media_url(urllib.parse.quote(media_id))
             try:
-                resp = urllib.request.urlopen(url, timeout=60)
-            except urllib.error.HTTPError as e:
-                if e.code == 404:
-                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento não encontrado")
-                raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Falha ao buscar documento no NestJS")
+                resp = await _media_get(
+                    url,
+                    timeout=_media_timeout("MEDIA_DOWNLOAD_TIMEOUT_SECONDS", 60),
+                    headers={"Range": range_header} if range_header else None,
+                )
+            except HTTPException:
+                raise
             except Exception:
                 raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Falha ao buscar documento no NestJS")
+            if resp.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE:
+                await resp.aclose()
+                content_range = resp.headers.get("Content-Range")
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Intervalo solicitado inválido",
+                    headers={"Content-Range": content_range} if content_range else None,
+                )
+            if resp.status_code >= 400:
+                await resp.aclose()
+                if resp.status_code == 404:
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento não encontrado")
+                raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Falha ao buscar documento no NestJS")
 
-            headers: dict[str, str] = {}
             content_type = resp.headers.get("Content-Type") or "application/octet-stream"
             disp = resp.headers.get("Content-Disposition")
             if disp:
@@ -3652,9 +6470,82 @@ def download_documento(
             length = resp.headers.get("Content-Length")
             if length:
                 headers["Content-Length"] = length
-            return StreamingResponse(_stream_urlopen_response(resp), media_type=content_type, headers=headers)
+            if resp.status_code == status.HTTP_206_PARTIAL_CONTENT:
+                content_range = resp.headers.get("Content-Range")
+                if content_range:
+                    headers["Content-Range"] = content_range
+                    _media_cache_warm_start(cache_key, url, content_range.rpartition("/")[2])
+                return StreamingResponse(
+                    _media_body(resp),
+                    status_code=status.HTTP_206_PARTIAL_CONTENT,
+                    media_type=content_type,
+                    headers=headers,
+                )
+            max_bytes = _media_cache_max_bytes()
+            if MEDIA_ID_PATTERN.fullmatch(cache_key) and max_bytes and (not length or int(length) <= max_bytes):
+                body = _media_cache_fill(cache_key, resp, {"content_type": content_type, "disposition": disp})
+            else:
+                body = _media_body(resp)
+            return StreamingResponse(body, media_type=content_type, headers=headers)
 
         target_path = _resolve_document_path(doc_ref)
-        if not target_path.exists():
+        try:
+            fh = await run_in_threadpool(open, target_path, "rb")
+        except OSError:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento não encontrado")
-        return FileResponse(path=str(target_path), filename=target_path.name)
+        st = os.fstat(fh.fileno())
+        etag = '"' + hashlib.md5(f"{st.st_mtime}-{st.st_size}".encode(), usedforsecurity=False).hexdigest() + '"'
+        last_modified = formatdate(st.st_mtime, usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            fh.close()
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        headers["Content-Disposition"] = _attachment_disposition(target_path.name)
+        return _file_range_response(
+            request,
+            fh,
+            st,
+            media_type=mimetypes.guess_type(target_path.name)[0] or "application/octet-stream",
+            headers=headers,
+            last_modified=last_modified,
+        )
+
+
+def _cli(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python main.py", description="Executive API")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="Aplica as migrações pendentes no banco principal e nos bancos dos tenants")
+    migrate.add_argument("--database", action="append", default=None, help="Restringe a execução a um banco (pode repetir)")
+    migrate.add_argument("--workers", type=int, default=None, help="Quantidade de bancos de tenants migrados em paralelo")
+    migrate.add_argument("--status", action="store_true", help="Somente exibe a versão atual de cada banco")
+    args = parser.parse_args(argv)
+
+    databases = {_sanitize_db_name(d) for d in args.database} if args.database else None
+
+    if args.status:
+        targets: list[tuple[str, Optional[tuple[int, str, str]]]] = [(_sanitize_db_name(_DEFAULT_DATABASE_NAME), None)]
+        try:
+            targets.extend(_migration_targets())
+        except Exception as e:
+            print(f"Falha ao listar tenants: {_error_message(e)}")
+        for db_name, tenant in targets:
+            if databases and db_name not in databases:
+                continue
+            engine_to_use = engine if tenant is None else _tenant_engine(db_name=db_name)
+            version = _schema_version_in_engine(engine_to_use=engine_to_use, component=MIGRATIONS_COMPONENT)
+            print(f"{db_name}: {version}/{LATEST_MIGRATION_VERSION}")
+        return 0
+
+    results = _migrate_all_databases(databases=databases, workers=args.workers)
+    failed = False
+    for db_name, result in results.items():
+        if isinstance(result, Exception):
+            failed = True
+            print(f"{db_name}: falhou ({_error_message(result)})")
+        else:
+            print(f"{db_name}: versão {result}/{LATEST_MIGRATION_VERSION}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
@@ -0,0 +1,78 @@
+import os
+import time
+from uuid import uuid4
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not str(os.getenv("DATABASE_URL") or "").startswith("postgresql"),
+    reason="requer PostgreSQL em DATABASE_URL",
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    from fastapi.testclient import TestClient
+
+    with TestClient(main.app) as c:
+        deadline = time.time() + 120
+        while c.get("/ready").status_code != 200:
+            assert time.time() < deadline, c.get("/ready").json()
+            time.sleep(0.1)
+        yield c
+
+
+@pytest.fixture(scope="module")
+def superadmin(client):
+    r = client.post("/api/login", json={"Usuario": "administrador", "Senha": "admin"})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['token']}"}
+
+
+@pytest.fixture(scope="module")
+def two_tenants(client, superadmin):
+    created = []
+    for _ in range(2):
+        slug = f"pg{uuid4().hex[:10]}"
+        r = client.post("/api/tenants", headers=superadmin, json={"Tenant": slug.upper(), "Slug": slug})
+        assert r.status_code == 201, r.text
+        created.append(int(r.json()["IdTenant"]))
+    yield created
+    for tid in created:
+        client.delete(f"/api/tenants/{tid}?delete_db=true", headers=superadmin)
+
+
+def test_fan_out_text_sort_pages_in_code_point_order(client, superadmin, two_tenants):
+    tag = uuid4().hex[:6]
+    names = {
+        two_tenants[0]: ["b", "B", "a", "Á", "_", "z"],
+        two_tenants[1]: ["A", "a", "Z", "ä", "1", "b"],
+    }
+    expected = set()
+    for tid, values in names.items():
+        for value in values:
+            r = client.post(f"/api/departamentos?tenant_id={tid}", headers=superadmin, json={"Departamento": f"{value}{tag}"})
+            assert r.status_code == 201, r.text
+            expected.add(f"{tid}:{r.json()['IdDepartamento']}")
+
+    for sort in ("Departamento", "-Departamento"):
+        rows = []
+        cursor = None
+        while True:
+            url = f"/api/departamentos?sort={sort}&limit=2" + (f"&cursor={cursor}" if cursor else "")
+            r = client.get(url, headers=superadmin)
+            assert r.status_code == 200, r.text
+            rows.extend(r.json())
+            cursor = r.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        keys = [row["Chave"] for row in rows]
+        assert len(keys) == len(set(keys))
+        assert expected <= set(keys)
+        order = [
+            (row["Departamento"], int(row["Chave"].split(":")[0]), int(row["IdDepartamento"]))
+            for row in rows
+        ]
+        assert order == sorted(order, reverse=sort.startswith("-"))
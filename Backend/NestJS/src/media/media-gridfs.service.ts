@@ -63,8 +63,9 @@ export class MediaGridFsService implements OnModuleInit, OnModuleDestroy {
     };
   }
 
-  openDownloadStream(fileId: string) {
-    return this.bucket.openDownloadStream(new ObjectId(fileId));
+  openDownloadStream(fileId: string, range?: { start: number; end: number }) {
+    const options = range ? { start: range.start, end: range.end + 1 } : undefined;
+    return this.bucket.openDownloadStream(new ObjectId(fileId), options);
   }
 
   async deleteFile(fileId: string): Promise<void> {
@@ -4,6 +4,7 @@ import {
   Controller,
   Delete,
   Get,
+  Headers,
   Param,
   Post,
   Res,
@@ -90,18 +91,32 @@ export class MediaController {
   }
 
   @Get(':id')
-  async download(@Param('id') id: string, @Res() res: any) {
+  async download(@Param('id') id: string, @Headers('range') rangeHeader: string | undefined, @Res() res: any) {
     const info = await this.mediaGridFsService.findFileInfo(id);
     if (!info) {
       res.status(404).send('Not found');
       return;
     }
 
+    const range = this.parseRange(rangeHeader, info.length);
+    res.setHeader('Accept-Ranges', 'bytes');
+    if (range === 'unsatisfiable') {
+      res.setHeader('Content-Range', `bytes */${info.length}`);
+      res.status(416).end();
+      return;
+    }
+
     res.setHeader('Content-Type', info.mimeType || 'application/octet-stream');
     res.setHeader('Content-Disposition', `inline; filename="${info.filename}"`);
-    res.setHeader('Content-Length', String(info.length));
+    if (range) {
+      res.status(206);
+      res.setHeader('Content-Range', `bytes ${range.start}-${range.end}/${info.length}`);
+      res.setHeader('Content-Length', String(range.end - range.start + 1));
+    } else {
+      res.setHeader('Content-Length', String(info.length));
+    }
 
-    const stream = this.mediaGridFsService.openDownloadStream(id);
+    const stream = this.mediaGridFsService.openDownloadStream(id, range || undefined);
     stream.on('error', () => {
       if (!res.headersSent) res.status(404).send('Not found');
       else res.end();
@@ -115,6 +130,21 @@ export class MediaController {
     return { ok: true };
   }
 
+  private parseRange(header: string | undefined, size: number): { start: number; end: number } | 'unsatisfiable' | null {
+    const match = /^bytes=(\d*)-(\d*)$/.exec(String(header || '').trim());
+    if (!match || (!match[1] && !match[2])) return null;
+    if (!match[1]) {
+      const suffix = Number(match[2]);
+      if (suffix === 0 || size === 0) return 'unsatisfiable';
+      return { start: Math.max(0, size - suffix), end: size - 1 };
+    }
+    const start = Number(match[1]);
+    const end = match[2] ? Number(match[2]) : size - 1;
+    if (match[2] && end < start) return null;
+    if (start >= size) return 'unsatisfiable';
+    return { start, end: Math.min(end, size - 1) };
+  }
+
   private guessFilenameFromUrl(url: string) {
     try {
       const u = new URL(url);
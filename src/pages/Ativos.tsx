@@ -17,6 +17,7 @@ export type Ativo = {
   Responsavel?: string;
   Atribuido?: string;
   Empresa?: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -188,7 +189,7 @@ const Ativos: React.FC = () => {
       </Space>
 
       <ListGrid<Ativo>
-        rowKey="IdAtivo"
+        rowKey={(r) => r.Chave ?? String(r.IdAtivo)}
         dataSource={filteredData}
         pagination={{ pageSize: 10 }}
         loading={loading}
@@ -15,6 +15,7 @@ export type CentroCusto = {
   Empresa: string;
   Departamento?: string;
   Responsavel?: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -178,7 +179,7 @@ const CentroCustos: React.FC = () => {
       </Space>
 
       <ListGrid<CentroCusto>
-        rowKey="IdCustos"
+        rowKey={(r) => r.Chave ?? String(r.IdCustos)}
         dataSource={filteredData}
         pagination={{ pageSize: 10 }}
         loading={loading}
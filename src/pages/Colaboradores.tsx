@@ -14,6 +14,7 @@ export type Colaborador = {
   Tenant?: string;
   DataCadastro?: string;
   Cadastrante?: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -172,7 +173,7 @@ const ColaboradoresPage: React.FC = () => {
       </Space>
 
       <ListGrid<Colaborador>
-        rowKey="IdColaborador"
+        rowKey={(r) => r.Chave ?? String(r.IdColaborador)}
         dataSource={filteredData}
         pagination={{ pageSize: 10 }}
         loading={loading}
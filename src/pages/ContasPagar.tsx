@@ -29,6 +29,7 @@ export type ContaPagar = {
   Usuario?: string;
   Senha?: string;
   Empresa?: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -221,7 +222,7 @@ const ContasPagar: React.FC = () => {
       </Space>
 
       <ListGrid<ContaPagar>
-        rowKey="IdContasPagar"
+        rowKey={(r) => r.Chave ?? String(r.IdContasPagar)}
         dataSource={filteredData}
         pagination={{ pageSize: 10 }}
         loading={loading}
@@ -13,6 +13,7 @@ export type Departamento = {
   Tenant?: string;
   DataCadastro?: string;
   Cadastrante?: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -169,7 +170,7 @@ const DepartamentosPage: React.FC = () => {
       </Space>
 
       <ListGrid<Departamento>
-        rowKey="IdDepartamento"
+        rowKey={(r) => r.Chave ?? String(r.IdDepartamento)}
         dataSource={filteredData}
         pagination={{ pageSize: 10 }}
         loading={loading}
@@ -10,6 +10,7 @@ export type Executivo = {
   Funcao: string;
   Perfil: string;
   Empresa: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -169,7 +170,7 @@ const ExecutivosPage: React.FC = () => {
 
       <Card variant="borderless">
         <Table<Executivo>
-          rowKey="IdExecutivo"
+          rowKey={(r) => r.Chave ?? String(r.IdExecutivo)}
           loading={loading}
           dataSource={filtered}
           pagination={{ pageSize: 10 }}
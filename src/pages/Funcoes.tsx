@@ -14,6 +14,7 @@ export type Funcao = {
   Tenant?: string;
   DataCadastro?: string;
   Cadastrante?: string;
+  Chave?: string;
 };
 
 const apiBaseUrl = () => {
@@ -170,7 +171,7 @@ const FuncoesPage: React.FC = () => {
       </Space>
 
       <ListGrid<Funcao>
-        rowKey="IdFuncao"
+        rowKey={(r) => r.Chave ?? String(r.IdFuncao)}
         dataSource={filteredData}
         pagination={{ pageSize: 10 }}
         loading={loading}